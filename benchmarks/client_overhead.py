@@ -0,0 +1,78 @@
+"""Measures client overhead without network.
+
+Requests are served by InProcessTransport from pre-encoded payloads, so
+the timings cover URL building, HTTPClient request pipeline, JSON
+decoding and Resource hydration only.
+
+    python -m benchmarks.client_overhead --items 1000 --repeat 20
+"""
+
+import argparse
+import json
+import timeit
+
+from klabclient.api import client
+from klabclient.api import transport
+
+
+def make_app(i):
+    return {
+        'Name': 'app-%d' % i,
+        'DisplayName': 'App %d' % i,
+        'Description': 'Benchmark application',
+        'Environment': 'master',
+        'ClusterName': 'cluster',
+        'Enabled': True,
+        'WorkspaceName': 'ws',
+        'WorkspaceDisplayName': 'Workspace',
+        'ProjectName': 'project',
+        'ProjectDisplayName': 'Project',
+    }
+
+
+def make_client(items):
+    payloads = {
+        '/workspace/ws/application': json.dumps(
+            [make_app(i) for i in range(items)]
+        ).encode('utf-8'),
+        '/workspace/ws/application/app-0': json.dumps(
+            make_app(0)
+        ).encode('utf-8'),
+    }
+
+    def handler(request):
+        path = request.path_url[len('/api/v0.2'):]
+        return 200, payloads[path], {'Content-Type': 'application/json'}
+
+    return client.Client(
+        kuberlab_url='http://bench/api/v0.2',
+        transport=transport.InProcessTransport(handler),
+    )
+
+
+def run(items, repeat):
+    c = make_client(items)
+
+    get = min(timeit.repeat(
+        lambda: c.apps.get('ws', 'app-0'), number=1, repeat=repeat
+    ))
+    print('%-10s %10.3f ms' % ('apps.get', get * 1000))
+
+    lst = min(timeit.repeat(
+        lambda: c.apps.list('ws'), number=1, repeat=repeat
+    ))
+    print('%-10s %10.3f ms (%.3f us per item)'
+          % ('apps.list', lst * 1000, lst * 1e6 / items))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--items', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    run(args.items, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
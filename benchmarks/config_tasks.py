@@ -0,0 +1,90 @@
+"""Measures config task lookups of an app with many tasks.
+
+The former implementation, serializing the full app config into every
+task of the list built on each lookup, is measured for comparison.
+
+    python -m benchmarks.config_tasks --tasks 200 --lookups 3
+"""
+
+import argparse
+import time
+
+import mock
+import yaml
+
+from klabclient.api import apps
+
+
+def make_app(tasks):
+    spec = {
+        'tasks': [
+            {
+                'name': 'task-%d' % i,
+                'resources': [{
+                    'name': 'worker',
+                    'replicas': 1,
+                    'command': 'python train.py --step %d' % i,
+                    'images': {'cpu': 'tensorflow/tensorflow:1.9.0'},
+                    'volumes': [{'name': 'data'}, {'name': 'training'}],
+                }],
+            }
+            for i in range(tasks)
+        ],
+        'volumes': [{'name': 'data', 'clusterStorage': 'default'}],
+    }
+    return apps.App(mock.Mock(), {
+        'Name': 'bench',
+        'WorkspaceName': 'ws',
+        'Configuration': {'spec': spec},
+    })
+
+
+def former_get_config_task(app, name):
+    tasks = []
+    for t in app.config['spec']['tasks']:
+        tasks.append({
+            'config': yaml.safe_dump(t, default_flow_style=False),
+            'app_config': yaml.safe_dump(
+                app.full_config, default_flow_style=False
+            ),
+            'name': t.get('name'),
+        })
+
+    for t in tasks:
+        if t['name'] == name:
+            return t
+
+
+def timed(func, app, names):
+    start = time.time()
+    for name in names:
+        task = func(app, name)
+    assert task['app_config']
+
+    return time.time() - start
+
+
+def run(tasks, lookups):
+    names = ['task-%d' % (i * 7 % tasks) for i in range(lookups)]
+
+    def current(app, name):
+        return app.get_config_task(name).to_dict()
+
+    for label, func in (('former', former_get_config_task),
+                        ('indexed', current)):
+        elapsed = timed(func, make_app(tasks), names)
+        print('%-8s %8.3f s (%.2f ms per lookup)'
+              % (label, elapsed, elapsed * 1000.0 / lookups))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--tasks', type=int, default=200)
+    parser.add_argument('--lookups', type=int, default=3)
+    args = parser.parse_args()
+
+    run(args.tasks, args.lookups)
+
+
+if __name__ == '__main__':
+    main()
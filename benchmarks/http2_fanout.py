@@ -0,0 +1,63 @@
+"""Compares pooled HTTP/1.1 and HTTP/2 transports on a fan-out workload.
+
+Issues --requests GET calls with --concurrency threads against a real
+API endpoint with each transport and prints throughput. HTTP/2 needs an
+https URL and 'httpx[http2]' installed.
+
+    python -m benchmarks.http2_fanout --url https://go.kuberlab.io/api/v0.2 \\
+        --token $KUBERLAB_TOKEN --path /workspace --concurrency 50
+"""
+
+import argparse
+from concurrent import futures
+import time
+
+from klabclient.api import httpclient
+
+
+def run(name, client, path, count, concurrency):
+    with futures.ThreadPoolExecutor(concurrency) as pool:
+        # Warm up connections before measuring.
+        list(pool.map(lambda _: client.get(path), range(concurrency)))
+
+        start = time.time()
+        statuses = list(pool.map(lambda _: client.get(path).status_code,
+                                 range(count)))
+        elapsed = time.time() - start
+
+    errors = len([s for s in statuses if s >= 400])
+    print('%-10s %8.2f s %10.1f req/s  errors=%d  pool=%s'
+          % (name, elapsed, count / elapsed, errors, client.pool_stats()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--url', required=True)
+    parser.add_argument('--token')
+    parser.add_argument('--path', default='/workspace')
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--insecure', action='store_true')
+    args = parser.parse_args()
+
+    headers = {}
+    if args.token:
+        headers['Authorization'] = 'Bearer %s' % args.token
+
+    for name, http2 in (('HTTP/1.1', False), ('HTTP/2', True)):
+        client = httpclient.HTTPClient(
+            args.url,
+            http2=http2,
+            insecure=args.insecure,
+            pool_maxsize=args.concurrency,
+            coalesce_requests=False,
+            headers=headers,
+        )
+        try:
+            run(name, client, args.path, args.requests, args.concurrency)
+        finally:
+            client.close()
+
+
+if __name__ == '__main__':
+    main()
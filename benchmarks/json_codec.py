@@ -0,0 +1,75 @@
+"""Compares installed JSON codecs on representative API payloads.
+
+    python -m benchmarks.json_codec --repeat 20
+"""
+
+import argparse
+import timeit
+
+from benchmarks import client_overhead
+from klabclient.api import base
+
+
+def make_app_config(tasks=50):
+    return {
+        'Name': 'app',
+        'WorkspaceName': 'ws',
+        'Configuration': {
+            'spec': {
+                'tasks': [{
+                    'name': 'task-%d' % i,
+                    'resources': [{
+                        'name': 'worker',
+                        'replicas': 1,
+                        'command': 'python train.py --steps 1000',
+                        'images': {'cpu': 'tensorflow:1.9', 'gpu': ''},
+                        'resources': {
+                            'requests': {'cpu': '100m', 'memory': '1Gi'},
+                            'limits': {'cpu': 1.5, 'memory': '8Gi'},
+                        },
+                        'volumes': [{'name': 'data'}, {'name': 'lib'}],
+                    }],
+                } for i in range(tasks)],
+                'volumes': [{
+                    'name': 'data',
+                    'subPath': 'data',
+                    'clusterStorage': 'storage',
+                    'mountPath': '/notebooks/data',
+                } for _ in range(10)],
+            },
+        },
+    }
+
+
+PAYLOADS = {
+    'catalog': [client_overhead.make_app(i) for i in range(1000)],
+    'app_config': make_app_config(),
+}
+
+
+def run(repeat):
+    for payload_name, payload in sorted(PAYLOADS.items()):
+        encoded = base.JSON_CODECS['json'].dumps(payload).encode('utf-8')
+        print('%s (%d bytes)' % (payload_name, len(encoded)))
+
+        for name, codec in base.JSON_CODECS.items():
+            dumps = min(timeit.repeat(
+                lambda: codec.dumps(payload), number=1, repeat=repeat
+            ))
+            loads = min(timeit.repeat(
+                lambda: codec.loads(encoded), number=1, repeat=repeat
+            ))
+            print('  %-10s dumps %8.3f ms   loads %8.3f ms'
+                  % (name, dumps * 1000, loads * 1000))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    run(args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""Measures hydration of a large listing into resources.
+
+Every resource is created and all its fields are read once, as the CLI
+formatters do. Time and memory per resource are reported for the
+original Resource (defaults and a setattr loop) and the current one,
+which reads fields straight from the shared data.
+
+    python -m benchmarks.resource_hydration --items 50000
+"""
+
+import argparse
+
+from benchmarks import client_overhead
+from benchmarks import resource_memory
+from klabclient.api import base
+
+
+class PlainResource(base.Resource):
+    resource_name = 'App'
+    __slots__ = ()
+
+
+def run(items, repeat):
+    payload = [client_overhead.make_app(i) for i in range(items)]
+
+    results = []
+    for label, cls in (('original', resource_memory.DictResource),
+                       ('plain', PlainResource)):
+        elapsed = min(
+            resource_memory.timed(cls, payload) for _ in range(repeat)
+        )
+        results.append((label, elapsed, resource_memory.measure(cls, payload)))
+
+    original = results[0][1]
+    for label, elapsed, size in results:
+        print('%-9s %8.3f s (%.2f us per item, x%.2f vs original) '
+              '%.0f bytes per item'
+              % (label, elapsed, elapsed * 1e6 / items, original / elapsed,
+                 float(size) / items))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--items', type=int, default=50000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    run(args.items, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""Measures memory held by Resource objects of a large listing.
+
+The JSON payload is decoded up front, so only the memory allocated by
+hydrating resources is reported. Hydrating the listing and reading every
+field of every resource, as the CLI formatters do, is timed as well. The
+original representation, copying every field onto the instance
+__dict__, is measured for comparison.
+
+    python -m benchmarks.resource_memory --items 50000
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+from benchmarks import client_overhead
+from klabclient.api import apps
+
+
+class DictResource(object):
+    """Original Resource layout: fields stored in _data and __dict__."""
+
+    defaults = {}
+
+    def __init__(self, manager, data):
+        self.manager = manager
+        self._data = data
+        for k, v in self.defaults.items():
+            if k not in data:
+                data[k] = v
+        for k, v in data.items():
+            try:
+                setattr(self, k, v)
+            except AttributeError:
+                pass
+
+
+def measure(resource_class, payload):
+    gc.collect()
+    tracemalloc.start()
+    resources = [resource_class(None, d) for d in payload]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # Touch a field, so lazy resolution is not free of charge.
+    assert resources[-1].Name == payload[-1]['Name']
+
+    return size
+
+
+def timed(resource_class, payload):
+    names = list(payload[0])
+
+    start = time.time()
+    for data in payload:
+        r = resource_class(None, data)
+        for name in names:
+            getattr(r, name)
+
+    return time.time() - start
+
+
+def run(items, repeat):
+    payload = [client_overhead.make_app(i) for i in range(items)]
+
+    for name, cls in (('dict', DictResource), ('current', apps.App)):
+        size = measure(cls, payload)
+        elapsed = min(timed(cls, payload) for _ in range(repeat))
+        print('%-8s %8.1f MiB (%.0f bytes per item) %8.3f s '
+              '(%.2f us per item)'
+              % (name, size / 1048576.0, float(size) / items,
+                 elapsed, elapsed * 1e6 / items))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--items', type=int, default=50000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    run(args.items, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""Compares peak memory of list() and the streaming iter_list().
+
+The encoded listing is held by InProcessTransport, so the peak covers
+decoding and hydration only. Items are consumed one by one and dropped,
+as an exporter would do.
+
+    python -m benchmarks.stream_list --items 50000
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+from benchmarks import client_overhead
+
+
+def measure(func):
+    gc.collect()
+    tracemalloc.start()
+    start = time.time()
+    count = 0
+    for _ in func():
+        count += 1
+    elapsed = time.time() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return count, peak, elapsed
+
+
+def run(items):
+    c = client_overhead.make_client(items)
+
+    for name, func in (('list', lambda: c.apps.list('ws')),
+                       ('iter_list', lambda: c.apps.iter_list('ws'))):
+        count, peak, elapsed = measure(func)
+        print('%-10s %6d items %10.1f MiB peak %10.1f ms'
+              % (name, count, peak / 1048576.0, elapsed * 1000))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--items', type=int, default=50000)
+    args = parser.parse_args()
+
+    run(args.items)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,7 @@
+import copy
 import time
-import yaml
+
+import six
 
 from klabclient.api import base
 from klabclient import exceptions
@@ -16,6 +18,7 @@ def build_aware(func):
 
 class AppTaskPod(base.Resource):
     resource_name = 'AppTaskPod'
+    __slots__ = ()
 
     def __str__(self):
         return (
@@ -29,6 +32,7 @@ class AppTaskPod(base.Resource):
 
 class AppTask(base.Resource):
     resource_name = 'AppTask'
+    __slots__ = ('_config', '_app_config', '_source_app', 'workspace')
 
     # "app": "21-styles-set",
     # "build": "7",
@@ -42,16 +46,103 @@ class AppTask(base.Resource):
     # "exitError": "",
     def __init__(self, manager, data):
         super(AppTask, self).__init__(manager, data)
-        if hasattr(self, 'config'):
-            self.config_raw = self.config
-            self.config = yaml.safe_load(self.config_raw)
-        if hasattr(self, 'app_config'):
-            self.app_config_raw = self.app_config
-            self.app_config = yaml.safe_load(self.app_config_raw)
 
         if not hasattr(self, 'status'):
             self.status = 'undefined'
 
+    @classmethod
+    def from_app(cls, manager, app, task_config, source=None):
+        """Builds a config task of the App.
+
+        The app config is taken from the app when needed instead of being
+        serialized into every task (see App.config_yaml()).
+
+        :param source: object providing full_config and config_yaml()
+            in place of the app, e.g. shared by tasks built together.
+        """
+        task = cls(manager, {
+            'app': app.Name,
+            'config': utils.yaml_dump(task_config, default_flow_style=False),
+            'name': task_config.get('name'),
+            'workspace': app.WorkspaceName
+        })
+        task._source_app = source or app
+
+        return task
+
+    def _get_source_app(self):
+        try:
+            return self._source_app
+        except AttributeError:
+            return None
+
+    def to_dict(self):
+        """Returns a deep copy of the data, with the app config.
+
+        Unlike view() and str(), which leave out the app config of a
+        config task (see from_app()) rather than serializing it.
+        """
+        data = super(AppTask, self).to_dict()
+        if 'app_config' not in data and self._get_source_app() is not None:
+            data['app_config'] = self.app_config_raw
+
+        return data
+
+    def _raw(self, key):
+        try:
+            return self._data[key]
+        except KeyError:
+            raise AttributeError(key)
+
+    def _parse(self, key):
+        raw = self._raw(key)
+        if isinstance(raw, six.string_types):
+            return utils.yaml_load(raw)
+
+        return raw
+
+    # YAML of the task and app configs is parsed on first access only.
+
+    @property
+    def config_raw(self):
+        return self._raw('config')
+
+    @property
+    def config(self):
+        try:
+            return self._config
+        except AttributeError:
+            self._config = self._parse('config')
+            return self._config
+
+    @config.setter
+    def config(self, value):
+        self._config = value
+
+    @property
+    def app_config_raw(self):
+        app = self._get_source_app()
+        if app is not None and 'app_config' not in self._data:
+            return app.config_yaml()
+
+        return self._raw('app_config')
+
+    @property
+    def app_config(self):
+        try:
+            return self._app_config
+        except AttributeError:
+            app = self._get_source_app()
+            if app is not None and 'app_config' not in self._data:
+                self._app_config = copy.deepcopy(app.full_config)
+            else:
+                self._app_config = self._parse('app_config')
+            return self._app_config
+
+    @app_config.setter
+    def app_config(self, value):
+        self._app_config = value
+
     def __str__(self):
         if not hasattr(self, 'build'):
             build = None
@@ -93,6 +184,7 @@ class AppTask(base.Resource):
         @utils.timeout(seconds=timeout)
         @build_aware
         def _wait(self):
+            delay = 3
             while not self.completed:
                 if tick_callback:
                     try:
@@ -100,8 +192,15 @@ class AppTask(base.Resource):
                     except Exception:
                         pass
 
-                time.sleep(3)
-                self.refresh()
+                time.sleep(delay)
+                try:
+                    self.refresh()
+                except exceptions.CircuitOpenException as e:
+                    # API endpoint is failing, wait until the breaker
+                    # lets a trial request through.
+                    delay = max(3, e.retry_after or 0)
+                else:
+                    delay = 3
             return self
 
         return _wait(self)
@@ -141,12 +240,26 @@ class AppTaskManager(base.ResourceManager):
         )
         return self._create(url, body)
 
-    def list(self, workspace, app_name):
+    def list(self, workspace, app_name, columnar=False):
+        """Returns builds of the app tasks.
+
+        :param columnar: return resourcelist.ResourceList for analytics
+            over long task histories.
+        """
         url = '/workspace/%s/application/%s/tasks' % (workspace, app_name)
-        tasks = self._list(url, response_key=None)
 
-        [setattr(t, 'workspace', workspace) for t in tasks]
-        return tasks
+        return self._list(
+            url, response_key=None, columnar=columnar,
+            row_attrs={'workspace': workspace}
+        )
+
+    def iter_list(self, workspace, app_name):
+        """Like list(), yields tasks while the response is downloaded."""
+        url = '/workspace/%s/application/%s/tasks' % (workspace, app_name)
+
+        for task in self._iter_list(url):
+            task.workspace = workspace
+            yield task
 
     def get(self, workspace, app_name, task, build):
         url = (
@@ -170,11 +283,7 @@ class AppTaskManager(base.ResourceManager):
             workspace=workspace, app=app_name, task=task, build=build
         )
 
-        resp = self.http_client.get(url)
-        if resp.status_code >= 400:
-            self._raise_api_exception(resp)
-
-        return [AppTaskPod(self, p) for p in base.extract_json(resp, None)]
+        return self._list_as(url, AppTaskPod)
 
     def get_pod_logs(self, workspace, app_name, task, build, pod):
         url = (
@@ -185,11 +294,7 @@ class AppTaskManager(base.ResourceManager):
             workspace=workspace, app=app_name, task=task, build=build, pod=pod
         )
 
-        resp = self.http_client.get(url)
-        if resp.status_code >= 400:
-            self._raise_api_exception(resp)
-
-        log = base.extract_json(resp, None)
+        log = self._get_json(url)
 
         return log.get('output')
 
@@ -1,4 +1,8 @@
-import json
+try:
+    from collections import abc as collections_abc
+except ImportError:  # Python 2
+    import collections as collections_abc
+
 import yaml
 
 import six
@@ -7,10 +11,12 @@ from klabclient.api import app_tasks
 from klabclient.api import base
 from klabclient.api import charts
 from klabclient import exceptions
+from klabclient import utils
 
 
 class App(base.Resource):
     resource_name = 'App'
+    __slots__ = ('config', 'full_config', '_config_tasks')
 
     # "Name": "styles-set",
     # "DisplayName": "styles-set",
@@ -25,11 +31,12 @@ class App(base.Resource):
     # "Configuration": {"spec": {...}}
     def __init__(self, manager, data):
         super(App, self).__init__(manager, data)
-        self.config = None
+        # Slots are set bypassing Resource.__setattr__, listings are long.
+        _set_config(self, data.get('Configuration'))
+        _set_config_tasks(self, None)
 
-        if hasattr(self, 'Configuration'):
-            self.config = self.Configuration
-            self.full_config = data
+        if 'Configuration' in data:
+            _set_full_config(self, data)
 
     def get_sources(self):
         if not self.config:
@@ -41,34 +48,32 @@ class App(base.Resource):
 
         return sources
 
+    def config_yaml(self):
+        """Returns the full app config as YAML.
+
+        Config tasks built together share a single dump of it, made on
+        first use (see ConfigTasks).
+        """
+        return utils.yaml_dump(self.full_config, default_flow_style=False)
+
+    @property
+    def config_tasks(self):
+        """Name-indexed view of the config tasks, see ConfigTasks."""
+        if self._config_tasks is None:
+            self._config_tasks = ConfigTasks(self)
+
+        return self._config_tasks
+
     def get_config_tasks(self):
-        m = app_tasks.AppTaskManager(self.manager.http_client)
-        tasks = []
-        for t in self.config['spec']['tasks']:
-            task_dict = {
-                'app': self.Name,
-                'config': yaml.safe_dump(t, default_flow_style=False),
-                'app_config': yaml.safe_dump(
-                    self.full_config,
-                    default_flow_style=False
-                ),
-                'name': t.get('name'),
-                'workspace': self.WorkspaceName
-            }
-            task = app_tasks.AppTask(m, task_dict)
-            tasks.append(task)
-
-        return tasks
+        return self.config_tasks.build_all()
 
     def get_config_task(self, name):
-        tasks = self.get_config_tasks()
-        for t in tasks:
-            if t.name == name:
-                return t
-
-        raise exceptions.KuberlabClientException(
-            'App task [name=%s] not found.' % name
-        )
+        try:
+            return self.config_tasks[name]
+        except KeyError:
+            raise exceptions.KuberlabClientException(
+                'App task [name=%s] not found.' % name
+            )
 
     def set_config_task(self, task_config):
         if not isinstance(task_config, dict):
@@ -81,17 +86,15 @@ class App(base.Resource):
             raise exceptions.KuberlabClientException(
                 'App task config name required, missing "name" key.'
             )
-        # Check if task exists
-        try:
-            self.get_config_task(name)
-        except exceptions.KuberlabClientException:
+
+        tasks = self.config['spec']['tasks']
+        if name not in self.config_tasks:
             # Task doesn't exist. Add a new task.
-            self.config['spec']['tasks'].append(task_config)
+            tasks.append(task_config)
         else:
             # Replace task.
-            tasks = self.config['spec']['tasks']
             self.config['spec']['tasks'] = [
-                task_config if x['name'] == name else x for x in tasks
+                task_config if x.get('name') == name else x for x in tasks
             ]
 
         return self.update_with_config(self.config)
@@ -143,20 +146,117 @@ class App(base.Resource):
         return resp.text
 
 
+_set_config = App.config.__set__
+_set_config_tasks = App._config_tasks.__set__
+_set_full_config = App.full_config.__set__
+
+
+class _SharedConfig(object):
+    """App config shared by a batch of config tasks.
+
+    The YAML is dumped on first use only, for all the tasks.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._yaml = None
+
+    @property
+    def full_config(self):
+        return self.app.full_config
+
+    def config_yaml(self):
+        if self._yaml is None:
+            self._yaml = self.app.config_yaml()
+
+        return self._yaml
+
+
+class ConfigTasks(collections_abc.Mapping):
+    """Read-only mapping of task name to AppTask of the App config.
+
+    Looking a task up doesn't build the other tasks. AppTasks are built
+    on access, each access returns a new one. The name index follows
+    changes of the app config, even made directly.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.manager = app_tasks.AppTaskManager(app.manager.http_client)
+        self._names = None
+        self._index = {}
+
+    @property
+    def specs(self):
+        """Task config dicts of the app, not copies."""
+        config = self.app.config or {}
+        specs = config.get('spec', {}).get('tasks') or []
+
+        names = tuple(spec.get('name') for spec in specs)
+        if names != self._names:
+            self._names = names
+            self._index = {}
+            for n, name in enumerate(names):
+                self._index.setdefault(name, n)
+
+        return specs
+
+    def spec(self, name):
+        """Returns the task config dict, not a copy."""
+        specs = self.specs
+        return specs[self._index[name]]
+
+    def build(self, spec, shared=None):
+        """Builds AppTask from the task config dict.
+
+        :param shared: _SharedConfig of tasks built together.
+        """
+        return app_tasks.AppTask.from_app(
+            self.manager, self.app, spec, shared or _SharedConfig(self.app)
+        )
+
+    def build_all(self):
+        """Builds AppTasks of all task configs, sharing the app YAML."""
+        shared = _SharedConfig(self.app)
+        return [self.build(spec, shared) for spec in self.specs]
+
+    def __getitem__(self, name):
+        return self.build(self.spec(name))
+
+    def __contains__(self, name):
+        self.specs
+        return name in self._index
+
+    def __iter__(self):
+        self.specs
+        return (
+            name for n, name in enumerate(self._names)
+            if self._index[name] == n
+        )
+
+    def __len__(self):
+        self.specs
+        return len(self._index)
+
+
 class AppSource(base.Resource):
     resource_name = 'AppSource'
+    __slots__ = ()
 
 
 class AppDestination(base.Resource):
     resource_name = 'AppDestination'
+    __slots__ = ()
 
 
 class AppStatus(base.Resource):
     resource_name = 'AppStatus'
+    __slots__ = ()
 
 
 class AppPackage(base.Resource):
     resource_name = 'AppPackage'
+    __slots__ = ()
 
 
 class AppManager(base.ResourceManager):
@@ -165,10 +265,27 @@ class AppManager(base.ResourceManager):
     def catalog(self, search=None, page=None, limit=None):
         return self._catalog('/catalog/chart-mlapp-v2', search, page, limit)
 
+    def iter_catalog(self, search=None, limit=None, prefetch=1):
+        """Yields apps of all catalog pages, see _iter_catalog()."""
+        return self._iter_catalog(
+            '/catalog/chart-mlapp-v2', search, limit, prefetch
+        )
+
+    def catalog_columns(self, search=None, limit=None, prefetch=1):
+        """Returns all catalog pages as resourcelist.ResourceList."""
+        return self._catalog_columns(
+            '/catalog/chart-mlapp-v2', search, limit, prefetch
+        )
+
     def list(self, workspace):
         url = '/workspace/%s/application' % workspace
         return self._list(url, response_key=None)
 
+    def iter_list(self, workspace):
+        """Like list(), yields apps while the response is downloaded."""
+        url = '/workspace/%s/application' % workspace
+        return self._iter_list(url)
+
     def get(self, workspace, name):
         self._ensure_not_empty(workspace=workspace, name=name)
 
@@ -178,11 +295,7 @@ class AppManager(base.ResourceManager):
         self._ensure_not_empty(workspace=workspace, name=name)
 
         url = '/workspace/%s/application/%s/status' % (workspace, name)
-        resp = self.http_client.get(url)
-        if resp.status_code >= 400:
-            self._raise_api_exception(resp)
-
-        return AppStatus(self, base.extract_json(resp, None))
+        return self._get_as(url, AppStatus)
 
     def packages_list(self, workspace, name, all=False):
         self._ensure_not_empty(workspace=workspace, name=name)
@@ -191,13 +304,7 @@ class AppManager(base.ResourceManager):
             '/workspace/%s/application/%s/packages?all=%s'
             % (workspace, name, all)
         )
-        resp = self.http_client.get(url)
-        if resp.status_code >= 400:
-            self._raise_api_exception(resp)
-
-        return [
-            AppPackage(self, d) for d in base.extract_json(resp, None)
-        ]
+        return self._list_as(url, AppPackage)
 
     def packages_install(self, workspace, name, manager, packages):
         self._ensure_not_empty(workspace=workspace, name=name)
@@ -209,12 +316,7 @@ class AppManager(base.ResourceManager):
             'packages': packages
         }
 
-        resp = self.http_client.crud_provider.post(
-            self.http_client.base_url + url,
-            data=json.dumps(body),
-            headers={'Content-Type': 'application/json'},
-            stream=True,
-        )
+        resp = self.http_client.post_stream(url, base.json_dumps(body))
         if resp.status_code >= 400:
             self._raise_api_exception(resp)
 
@@ -224,7 +326,7 @@ class AppManager(base.ResourceManager):
     def delete(self, workspace, name, force=False):
         self._ensure_not_empty(workspace=workspace, name=name)
 
-        self._delete(
+        return self._delete(
             '/workspace/%s/application/%s?%s' % (workspace, name, force)
         )
 
@@ -251,13 +353,7 @@ class AppManager(base.ResourceManager):
         self._ensure_not_empty(workspace=workspace)
 
         url = '/workspace/%s/appdestinations' % workspace
-        resp = self.http_client.get(url)
-        if resp.status_code >= 400:
-            self._raise_api_exception(resp)
-
-        return [
-            AppDestination(self, d) for d in base.extract_json(resp, None)
-        ]
+        return self._list_as(url, AppDestination)
 
     def get_yaml(self, workspace, chart_name, version=None):
         url = '/workspace/%s/chart-mlapp-v2/%s' % (workspace, chart_name)
@@ -267,11 +363,7 @@ class AppManager(base.ResourceManager):
 
         url += '/versions/%s/yaml' % version
 
-        resp = self.http_client.get(url)
-        if resp.status_code >= 400:
-            self._raise_api_exception(resp)
-
-        return resp.text
+        return self._get_text(url)
 
     def list_versions(self, workspace, chart_name):
         url = (
@@ -279,25 +371,14 @@ class AppManager(base.ResourceManager):
             % (workspace, chart_name)
         )
 
-        resp = self.http_client.get(url)
-        if resp.status_code >= 400:
-            self._raise_api_exception(resp)
-
-        return [
-            charts.ChartVersion(self, v)
-            for v in base.extract_json(resp, None)
-        ]
+        return self._list_as(url, charts.ChartVersion)
 
     def get_values(self, workspace, chart_name, version='latest'):
         url = '/workspace/%s/chart-mlapp-v2/%s/versions/%s/values/yaml' % (
             (workspace, chart_name, version)
         )
 
-        resp = self.http_client.get(url)
-        if resp.status_code >= 400:
-            self._raise_api_exception(resp)
-
-        return resp.text
+        return self._get_text(url)
 
     def install(self, from_workspace, to_workspace, chart_name,
                 app_name, values, project=None, version='latest',
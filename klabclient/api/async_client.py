@@ -0,0 +1,397 @@
+import asyncio
+import collections
+
+import six
+
+from klabclient.api import app_tasks
+from klabclient.api import apps
+from klabclient.api import async_httpclient
+from klabclient.api import base
+from klabclient.api import charts
+from klabclient.api import client
+from klabclient.api import clusters
+from klabclient.api import datasets
+from klabclient.api import jsonstream
+from klabclient.api import models
+from klabclient.api import organizations
+from klabclient.api import projects
+from klabclient.api import query
+from klabclient.api import resourcelist
+from klabclient.api import sharedclusters
+from klabclient.api import storage
+from klabclient.api import workspaces
+from klabclient import exceptions
+from klabclient import utils
+
+
+class AsyncManagerMixin(object):
+    """Turns a ResourceManager into its asyncio counterpart.
+
+    Overrides the request primitives of base.ResourceManager with
+    coroutines, so manager methods which only build a URL and return a
+    primitive call become awaitable as is. Methods post-processing the
+    result are overridden in the async manager classes below.
+    """
+
+    async def _fetch(self, url):
+        cache = self.http_client.resource_cache
+        if not cache:
+            return await self.http_client.get(url)
+
+        resp = cache.get(url)
+        if resp is None:
+            # See base.ResourceManager._fetch().
+            generation = cache.generation()
+            resp = await self.http_client.get(url)
+            if resp.status_code == 200:
+                cache.put(url, resp, generation)
+
+        return resp
+
+    async def _get_json(self, url, response_key=None):
+        resp = await self._fetch(url)
+
+        if resp.status_code >= 400:
+            self._raise_api_exception(resp)
+
+        return base.extract_json(resp, response_key)
+
+    async def _get_text(self, url):
+        resp = await self._fetch(url)
+
+        if resp.status_code >= 400:
+            self._raise_api_exception(resp)
+
+        return resp.text
+
+    async def _get_as(self, url, resource_class, response_key=None):
+        return resource_class(self, await self._get_json(url, response_key))
+
+    async def _list_as(self, url, resource_class, response_key=None):
+        return [
+            resource_class(self, d)
+            for d in await self._get_json(url, response_key)
+        ]
+
+    async def _create(self, url, data, response_key=None, dump_json=True):
+        if dump_json:
+            data = base.json_dumps(data)
+
+        resp = await self.http_client.post(url, data)
+        self._invalidate_queries()
+
+        if resp.status_code >= 400:
+            self._raise_api_exception(resp)
+
+        return self.resource_class(self, base.extract_json(resp, response_key))
+
+    async def _update(self, url, data, response_key=None, dump_json=True):
+        if dump_json:
+            data = base.json_dumps(data)
+
+        resp = await self.http_client.put(url, data)
+        self._invalidate_queries()
+
+        if resp.status_code != 200:
+            self._raise_api_exception(resp)
+
+        return self.resource_class(self, base.extract_json(resp, response_key))
+
+    async def _list(self, url, response_key=None, columnar=False,
+                    row_attrs=None):
+        resp = await self._fetch(url)
+
+        if resp.status_code != 200:
+            self._raise_api_exception(resp)
+
+        records = base.extract_json(resp, response_key)
+        if columnar:
+            return resourcelist.ResourceList(
+                self, records, row_attrs=row_attrs
+            )
+
+        resources = [self.resource_class(self, resource_data)
+                     for resource_data in records]
+        for name, value in (row_attrs or {}).items():
+            for resource in resources:
+                setattr(resource, name, value)
+
+        return resources
+
+    async def _iter_list(self, url, response_key=None):
+        if response_key is not None:
+            for resource in await self._list(url, response_key):
+                yield resource
+            return
+
+        resp = await self.http_client.get_stream(url)
+        try:
+            if resp.status_code != 200:
+                await self._raise_stream_exception(resp)
+
+            decoder = jsonstream.ArrayDecoder()
+            async for chunk in resp.iter_chunked(base.STREAM_CHUNK_SIZE):
+                for resource_data in decoder.feed(chunk):
+                    yield self.resource_class(self, resource_data)
+
+            for resource_data in decoder.close():
+                yield self.resource_class(self, resource_data)
+        finally:
+            resp.close()
+
+    async def _raise_stream_exception(self, resp):
+        await resp.read()
+        self._raise_api_exception(resp)
+
+    async def _get(self, url, response_key=None):
+        resp = await self._fetch(url)
+
+        if resp.status_code == 200:
+            return self.resource_class(
+                self, base.extract_json(resp, response_key)
+            )
+        else:
+            self._raise_api_exception(resp)
+
+    async def _delete(self, url):
+        resp = await self.http_client.delete(url)
+        self._invalidate_queries()
+
+        if resp.status_code >= 400:
+            self._raise_api_exception(resp)
+
+    async def _iter_catalog(self, url, search=None, limit=None, prefetch=1):
+        limit = limit or base.CATALOG_PAGE_SIZE
+        pending = collections.deque()
+        page = 1
+        previous = None
+
+        try:
+            while True:
+                while len(pending) <= prefetch:
+                    pending.append(asyncio.ensure_future(
+                        self._catalog(url, search, page, limit)
+                    ))
+                    page += 1
+
+                items = await pending.popleft()
+                if not items or items[0]._data == previous:
+                    return
+                previous = items[0]._data
+
+                for item in items:
+                    yield item
+
+                if len(items) < limit:
+                    return
+        finally:
+            for future in pending:
+                future.cancel()
+
+    async def _catalog_columns(self, url, search=None, limit=None,
+                               prefetch=1):
+        records = []
+        async for item in self._iter_catalog(url, search, limit, prefetch):
+            records.append(item._data)
+
+        return resourcelist.ResourceList(self, records)
+
+    async def query(self, *scope, refresh=False):
+        q = self._cached_query(scope, refresh)
+        if q is None:
+            q = query.Query(await self.list(*scope))
+            if self.query_ttl:
+                self._queries[scope] = q
+
+        return q
+
+    async def find(self, *scope, **kwargs):
+        return (await self.query(*scope)).filter(**kwargs)
+
+
+class AsyncAppManager(AsyncManagerMixin, apps.AppManager):
+    async def packages_install(self, workspace, name, manager, packages):
+        """Installs packages, yields output lines as they arrive."""
+        self._ensure_not_empty(workspace=workspace, name=name)
+
+        url = '/workspace/%s/application/%s/packages' % (workspace, name)
+        body = {
+            'manager': manager,
+            'packages': packages
+        }
+
+        resp = await self.http_client.post_stream(
+            url, base.json_dumps(body)
+        )
+        try:
+            if resp.status_code >= 400:
+                await self._raise_stream_exception(resp)
+
+            async for line in resp.iter_lines():
+                yield line.rstrip(b'\r\n')
+        finally:
+            resp.close()
+
+
+class AsyncAppTaskManager(AsyncManagerMixin, app_tasks.AppTaskManager):
+    async def list(self, workspace, app_name, columnar=False):
+        url = '/workspace/%s/application/%s/tasks' % (workspace, app_name)
+
+        return await self._list(
+            url, response_key=None, columnar=columnar,
+            row_attrs={'workspace': workspace}
+        )
+
+    async def iter_list(self, workspace, app_name):
+        url = '/workspace/%s/application/%s/tasks' % (workspace, app_name)
+
+        async for task in self._iter_list(url):
+            task.workspace = workspace
+            yield task
+
+    async def get(self, workspace, app_name, task, build):
+        url = (
+            '/workspace/%s/application/%s/tasks/%s/build/%s'
+            % (workspace, app_name, task, build)
+        )
+        self._ensure_not_empty(
+            workspace=workspace, app=app_name, task=task, build=build
+        )
+
+        task = await self._get(url)
+        task.workspace = workspace
+        return task
+
+    async def get_pod_logs(self, workspace, app_name, task, build, pod):
+        url = (
+            '/workspace/%s/application/%s/tasks/%s/build/%s/pods/%s/log'
+            % (workspace, app_name, task, build, pod)
+        )
+        self._ensure_not_empty(
+            workspace=workspace, app=app_name, task=task, build=build, pod=pod
+        )
+
+        log = await self._get_json(url)
+
+        return log.get('output')
+
+
+class AsyncChartManager(AsyncManagerMixin, charts.ChartManager):
+    pass
+
+
+class AsyncClusterManager(AsyncManagerMixin, clusters.ClusterManager):
+    pass
+
+
+class AsyncDatasetManager(AsyncManagerMixin, datasets.DatasetManager):
+    pass
+
+
+class AsyncModelManager(AsyncManagerMixin, models.ModelManager):
+    async def upload(self, workspace, name, version, path):
+        url = '/workspace/%s/mlmodel/%s/versions/%s/upload' % (
+            workspace, name, version
+        )
+
+        stream = utils.stream_targz(path)
+        try:
+            resp = await self.http_client.post_file(
+                url, None, '%s.tar.gz' % name, stream, field='model'
+            )
+        finally:
+            stream.close()
+
+        if resp.status_code >= 400:
+            self._raise_api_exception(resp)
+
+        return self.resource_class(
+            self, base.extract_json(resp, response_key=None)
+        )
+
+
+class AsyncOrganizationManager(AsyncManagerMixin,
+                               organizations.OrganizationManager):
+    pass
+
+
+class AsyncProjectManager(AsyncManagerMixin, projects.ProjectManager):
+    pass
+
+
+class AsyncSharedClusterManager(AsyncManagerMixin,
+                                sharedclusters.SharedClusterManager):
+    pass
+
+
+class AsyncStorageManager(AsyncManagerMixin, storage.StorageManager):
+    pass
+
+
+class AsyncWorkspaceManager(AsyncManagerMixin, workspaces.WorkspaceManager):
+    pass
+
+
+class AsyncClient(object):
+    """asyncio client with the same managers as Client.
+
+    Manager methods are coroutines returning the same resource classes:
+
+        async with AsyncClient(token=token) as c:
+            statuses = await asyncio.gather(
+                *[c.apps.status(ws, name) for name in names]
+            )
+
+    Resource helper methods which issue requests themselves (e.g.
+    App.update_with_config, AppTask.wait) are available on resources
+    fetched with the synchronous Client only.
+
+    Requires Python 3.6+ and aiohttp (the 'async' extra), unlike the
+    rest of the package this module can't be imported on Python 2.
+    """
+
+    def __init__(self, **kwargs):
+        kuberlab_url = kwargs.pop('kuberlab_url', None)
+
+        if kuberlab_url and not isinstance(kuberlab_url, six.string_types):
+            raise RuntimeError('Kuberlab url should be a string.')
+
+        if not kuberlab_url:
+            kuberlab_url = client._DEFAULT_KUBERLAB_URL
+
+        http_client = async_httpclient.AsyncHTTPClient(
+            kuberlab_url, **kwargs
+        )
+        self.http_client = http_client
+
+        self.apps = AsyncAppManager(http_client)
+        self.app_tasks = AsyncAppTaskManager(http_client)
+        self.charts = AsyncChartManager(http_client)
+        self.clusters = AsyncClusterManager(http_client)
+        self.datasets = AsyncDatasetManager(http_client)
+        self.models = AsyncModelManager(http_client)
+        self.organizations = AsyncOrganizationManager(http_client)
+        self.projects = AsyncProjectManager(http_client)
+        self.sharedclusters = AsyncSharedClusterManager(http_client)
+        self.storage = AsyncStorageManager(http_client)
+        self.workspaces = AsyncWorkspaceManager(http_client)
+
+    async def login(self, username, password):
+        """Authenticates the session with username and password."""
+        resp = await self.http_client.post(
+            '/auth/login',
+            base.json_dumps({'LoginOrEmail': username, 'Password': password})
+        )
+        if resp.status_code != 200:
+            raise exceptions.KuberlabClientException(
+                'Invalid auth: %s.' % resp.content
+            )
+
+    async def close(self):
+        await self.http_client.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
@@ -0,0 +1,406 @@
+import asyncio
+import copy
+import json
+import logging
+import ssl
+import time
+
+from oslo_utils import importutils
+import six
+
+from klabclient.api import deadline
+from klabclient.api import httpclient
+from klabclient.api import metrics
+from klabclient.api import singleflight
+
+
+aiohttp = importutils.try_import('aiohttp')
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_ASYNC_POOL_MAXSIZE = 100
+
+
+class AsyncRequest(object):
+    def __init__(self, method, body):
+        self.method = method.upper()
+        self.body = body
+
+
+class AsyncResponse(object):
+    """Fully read response with the subset of requests.Response API
+    used by resource managers.
+    """
+
+    _content_consumed = True
+    raw = None
+
+    def __init__(self, status_code, headers, content, url, request,
+                 encoding=None):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.url = url
+        self.request = request
+        self.encoding = encoding or 'utf-8'
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding, 'replace')
+
+    def json(self):
+        return json.loads(self.text)
+
+    def close(self):
+        pass
+
+
+class AsyncStreamResponse(object):
+    """Response with the body not read yet, see AsyncHTTPClient.get_stream.
+
+    The caller must close it to release the connection.
+    """
+
+    _content_consumed = False
+
+    def __init__(self, resp, request):
+        self._resp = resp
+        self.status_code = resp.status
+        self.headers = resp.headers
+        self.url = str(resp.url)
+        self.request = request
+
+    async def read(self):
+        """Reads the whole body, available as content afterwards."""
+        self.content = await self._resp.read()
+        self._content_consumed = True
+
+        return self.content
+
+    def iter_chunked(self, size):
+        """Returns async iterator of body chunks."""
+        return self._resp.content.iter_chunked(size)
+
+    def iter_lines(self):
+        """Returns async iterator of body lines."""
+        return self._resp.content
+
+    def close(self):
+        self._resp.release()
+
+
+def _copy_response(resp):
+    if isinstance(resp, AsyncResponse):
+        return copy.copy(resp)
+
+    # Served from the HTTP cache.
+    return httpclient._copy_response(resp)
+
+
+class AsyncSingleFlight(object):
+    """asyncio counterpart of singleflight.SingleFlight.
+
+    Coroutines of the same event loop awaiting a call with the same key
+    while it is in flight share its result. Cancelling a caller doesn't
+    cancel the shared call. Failures caused by the leader's deadline
+    are handled as in SingleFlight.
+    """
+
+    def __init__(self):
+        self.counters = metrics.Counters('calls', 'collapsed')
+        self._calls = {}
+
+    async def do(self, key, func):
+        """Runs coroutine function func once per in-flight key.
+
+        :return: tuple (result, shared), shared is True for followers.
+        """
+        self.counters.incr('calls')
+
+        while True:
+            call = self._calls.get(key)
+            if call is None:
+                break
+
+            future, leader_deadline = call
+            self.counters.incr('collapsed')
+            while not future.done():
+                await asyncio.wait([future], timeout=deadline.remaining())
+                if not future.done():
+                    deadline.current().check()
+
+            error = future.exception()
+            if error is None:
+                return future.result(), True
+            if not singleflight.leader_timed_out(leader_deadline):
+                raise singleflight.copy_error(error) from error
+
+            # The leader's cleanup may not have run yet.
+            if self._calls.get(key) is call:
+                del self._calls[key]
+
+        future = asyncio.ensure_future(func())
+        call = self._calls[key] = (future, deadline.current())
+        try:
+            return await asyncio.shield(future), False
+        finally:
+            if self._calls.get(key) is call:
+                del self._calls[key]
+
+    def stats(self):
+        return self.counters.as_dict()
+
+
+def _transport_errors():
+    errors = (asyncio.TimeoutError,)
+    if aiohttp:
+        errors += (aiohttp.ClientConnectionError,)
+
+    return errors
+
+
+class AsyncHTTPClient(httpclient.HTTPClient):
+    """Non-blocking counterpart of HTTPClient based on aiohttp.
+
+    Accepts the same options (SSL, timeouts, retry policies, rate limiter,
+    circuit breakers, compression, HTTP cache, GET coalescing) and
+    additionally 'token' and 'headers' to authenticate requests. The
+    aiohttp session is created on first request, inside the running
+    event loop.
+    """
+
+    def __init__(self, base_url, **kwargs):
+        kwargs.pop('session', None)
+        # Connections are opened lazily within the event loop.
+        kwargs.pop(httpclient.PREWARM, None)
+        self.headers = dict(kwargs.pop('headers', None) or {})
+        token = kwargs.pop('token', None)
+        if token:
+            self.headers['Authorization'] = 'Bearer %s' % token
+        self.pool_maxsize = (
+            kwargs.get(httpclient.POOL_MAXSIZE) or DEFAULT_ASYNC_POOL_MAXSIZE
+        )
+
+        super(AsyncHTTPClient, self).__init__(base_url, **kwargs)
+
+        if self.single_flight:
+            self.single_flight = AsyncSingleFlight()
+
+    def _create_transport(self, **kwargs):
+        # aiohttp session must be created within the event loop.
+        return None
+
+    def _ssl_context(self):
+        if not self.ssl_options:
+            return True
+
+        verify = self.ssl_options.get('verify', True)
+        if verify is False:
+            return False
+
+        context = ssl.create_default_context(
+            cafile=verify if isinstance(verify, six.string_types) else None
+        )
+        cert_file, key_file = self.ssl_options.get('cert', (None, None))
+        if cert_file:
+            context.load_cert_chain(cert_file, key_file)
+
+        return context
+
+    def _get_session(self):
+        if self.crud_provider is None or self.crud_provider.closed:
+            if not aiohttp:
+                raise RuntimeError(
+                    'aiohttp is required for AsyncClient, install it with '
+                    '"pip install aiohttp".'
+                )
+
+            connector = aiohttp.TCPConnector(
+                limit=0,
+                limit_per_host=self.pool_maxsize,
+                ssl=self._ssl_context(),
+            )
+            self.crud_provider = aiohttp.ClientSession(
+                connector=connector, headers=self.headers
+            )
+
+        return self.crud_provider
+
+    async def _send(self, method, url, headers=None, data=None,
+                    stream=False, read_timeout=None):
+        connect, read = self.get_timeout(read_timeout)
+        timeout = aiohttp.ClientTimeout(sock_connect=connect, sock_read=read)
+
+        r = await self._get_session().request(
+            method.upper(), self.base_url + url, headers=headers,
+            data=data, timeout=timeout
+        )
+        request = AsyncRequest(method, data)
+        if stream:
+            return AsyncStreamResponse(r, request)
+
+        try:
+            content = await r.read()
+        finally:
+            r.release()
+
+        return AsyncResponse(
+            r.status, r.headers, content, str(r.url), request, r.charset
+        )
+
+    async def _request(self, method, url, options, data=None, stream=False,
+                       read_timeout=None):
+        headers = dict(options.get('headers') or {})
+        if data is not None:
+            data = self._compress_body(data, headers)
+        # Only streamed responses are passed on before the body is read.
+        send_kwargs = {'stream': True} if stream else {}
+        if read_timeout is not None:
+            send_kwargs['read_timeout'] = read_timeout
+
+        policy = self._start_request(method, headers)
+        start = time.time()
+
+        attempt = 0
+        while True:
+            breaker = None
+            if self.circuit_breakers:
+                breaker = self.circuit_breakers.before_request(url)
+
+            try:
+                if self.rate_limiter:
+                    delay = self.rate_limiter.reserve(url)
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+
+                resp = await self._send(
+                    method, url, headers, data, **send_kwargs
+                )
+            except _transport_errors() as e:
+                delay = self._on_error(breaker, policy, attempt)
+                if delay is None:
+                    raise
+                reason = str(e) or e.__class__.__name__
+            except BaseException as e:
+                # E.g. cancelled or deadline exceeded.
+                self._on_abort(breaker, e)
+                raise
+            else:
+                delay = self._on_response(breaker, policy, attempt, resp)
+                if delay is None:
+                    if self.wire_logger.should_log():
+                        self.wire_logger.log(resp, time.time() - start)
+                    return resp
+                reason = 'HTTP %s' % resp.status_code
+                # Release the connection of a discarded streamed response.
+                resp.close()
+
+            attempt += 1
+            self._on_retry(method, url, policy, attempt, delay, reason)
+            await asyncio.sleep(delay)
+
+    async def _write(self, method, url, options, **kwargs):
+        # See HTTPClient._write().
+        self._invalidate_cache(url)
+        try:
+            return await self._request(method, url, options, **kwargs)
+        finally:
+            self._invalidate_cache(url)
+
+    async def get(self, url, headers=None):
+        options = self._get_request_options('get', headers)
+
+        if not self.single_flight:
+            return await self._get(url, options)
+
+        key = (
+            url,
+            tuple(sorted(options['headers'].items())),
+            self._write_generation
+        )
+        resp, shared = await self.single_flight.do(
+            key, lambda: self._get(url, options)
+        )
+
+        # Every caller gets its own response object to parse.
+        return _copy_response(resp) if shared else resp
+
+    async def _get(self, url, options):
+        if not self.http_cache:
+            return await self._request('get', url, options)
+
+        entry = self.http_cache.lookup(url)
+        resp = self.http_cache.fresh_response(entry)
+        if resp is not None:
+            return resp
+
+        if entry is not None and entry.has_validators:
+            options['headers'] = dict(
+                options['headers'], **entry.conditional_headers()
+            )
+
+        generation = self.http_cache.generation()
+        resp = await self._request('get', url, options)
+
+        return self.http_cache.update(url, resp, entry, generation)
+
+    async def get_stream(self, url, headers=None):
+        """GET returning AsyncStreamResponse, the body is not read.
+
+        Bypasses the HTTP cache and request coalescing. The caller must
+        close the response.
+        """
+        options = self._get_request_options('get', headers)
+
+        return await self._request('get', url, options, stream=True)
+
+    async def post_stream(self, url, body, headers=None):
+        """POST returning AsyncStreamResponse, see get_stream().
+
+        See HTTPClient.post_stream() for the read timeout.
+        """
+        options = self._get_request_options('post', headers)
+
+        return await self._write(
+            'post', url, options, data=body, stream=True,
+            read_timeout=self.stream_read_timeout
+        )
+
+    async def post(self, url, body, headers=None):
+        options = self._get_request_options('post', headers)
+
+        return await self._write('post', url, options, data=body)
+
+    async def put(self, url, body, headers=None):
+        options = self._get_request_options('put', headers)
+
+        return await self._write('put', url, options, data=body)
+
+    async def delete(self, url, headers=None):
+        options = self._get_request_options('delete', headers)
+
+        return await self._write('delete', url, options)
+
+    async def post_file(self, url, form_data, filename, file_or_data,
+                        field='file'):
+        if not aiohttp:
+            raise RuntimeError('aiohttp is required for AsyncClient.')
+
+        data = aiohttp.FormData()
+        for k, v in (form_data or {}).items():
+            data.add_field(k, v)
+        data.add_field(field, file_or_data, filename=filename)
+
+        options = self._get_request_options('post', None)
+        # Set by aiohttp, along with the multipart boundary.
+        del options['headers']['content-type']
+
+        return await self._write(
+            'post', url, options, data=data,
+            read_timeout=self.stream_read_timeout
+        )
+
+    async def close(self):
+        if self.crud_provider is not None:
+            await self.crud_provider.close()
+            self.crud_provider = None
@@ -1,50 +1,242 @@
 
+import collections
 import copy
 import json
+import logging
+import os
+import time
 
+from oslo_utils import importutils
 import six
 
+from klabclient.api import jsonstream
+from klabclient.api import pagination
+from klabclient.api import query
+from klabclient.api import resourcelist
+from klabclient.api import views
+
+
+LOG = logging.getLogger(__name__)
+
+orjson = importutils.try_import('orjson')
+rapidjson = importutils.try_import('rapidjson')
+ujson = importutils.try_import('ujson')
 
 urlparse = six.moves.urllib.parse
 
+STREAM_CHUNK_SIZE = 64 * 1024
+CATALOG_PAGE_SIZE = 50
+
+
+class JSONCodec(object):
+    """JSON encoder/decoder pair used for API payloads.
+
+    Fast libraries don't cover everything the stdlib json does (e.g.
+    integers over 64 bits, non-string keys), such values are passed to
+    the stdlib json. Results are the same whichever codec is used, except
+    that orjson encodes NaN and infinity as null where the stdlib json
+    writes NaN and Infinity (which are not valid JSON).
+
+    :param name: codec name.
+    :param dumps: callable returning JSON as bytes or text.
+    :param loads: callable accepting JSON bytes.
+    :param errors: exceptions of dumps/loads to fall back on.
+    """
+
+    def __init__(self, name, dumps=json.dumps, loads=json.loads,
+                 errors=(TypeError, ValueError, OverflowError)):
+        self.name = name
+        self._dumps = dumps
+        self._loads = loads
+        self._errors = errors
+
+    def dumps(self, obj):
+        try:
+            return self._dumps(obj)
+        except self._errors:
+            return json.dumps(obj)
+
+    def loads(self, data):
+        try:
+            return self._loads(data)
+        except self._errors:
+            return json.loads(data)
+
+    def __repr__(self):
+        return '<JSONCodec %s>' % self.name
+
+
+def _json_codecs():
+    codecs = collections.OrderedDict()
+
+    if orjson:
+        codecs['orjson'] = JSONCodec('orjson', orjson.dumps, orjson.loads)
+    if ujson:
+        codecs['ujson'] = JSONCodec(
+            'ujson',
+            lambda obj: ujson.dumps(obj, escape_forward_slashes=False),
+            ujson.loads
+        )
+    if rapidjson:
+        codecs['rapidjson'] = JSONCodec(
+            'rapidjson', rapidjson.dumps, rapidjson.loads
+        )
+
+    codecs['json'] = JSONCodec('json')
+
+    return codecs
+
+
+JSON_CODECS = _json_codecs()
+
+
+def _default_json_codec():
+    default = next(iter(JSON_CODECS))
+    name = os.environ.get('KUBERLAB_JSON_CODEC') or default
+
+    if name not in JSON_CODECS:
+        LOG.warning(
+            "JSON codec %s set by KUBERLAB_JSON_CODEC is not available, "
+            "using %s.", name, default
+        )
+        name = default
+
+    return JSON_CODECS[name]
+
+
+_json_codec = _default_json_codec()
+
+
+def get_json_codec():
+    return _json_codec
+
+
+def set_json_codec(codec):
+    """Sets codec used for API payloads.
+
+    :param codec: JSONCodec or name of an installed one
+        (see JSON_CODECS), fastest installed is used by default.
+    """
+    global _json_codec
+
+    if isinstance(codec, six.string_types):
+        if codec not in JSON_CODECS:
+            raise ValueError(
+                'JSON codec %s is not available, choose from: %s'
+                % (codec, ', '.join(JSON_CODECS))
+            )
+        codec = JSON_CODECS[codec]
+
+    _json_codec = codec
+
+
+def json_dumps(obj):
+    return _json_codec.dumps(obj)
+
+
+def json_loads(data):
+    return _json_codec.loads(data)
+
 
 class Resource(object):
+    """API object backed by the JSON dict it was created from.
+
+    The dict itself serves as the instance __dict__, so fields are read
+    as plain attributes without being copied onto each instance. The
+    first attribute assigned afterwards makes the instance stop sharing
+    the dict: assigned attributes don't modify the original data, and
+    changes of the data made later aren't visible anymore. As with any
+    instance __dict__, a field named like a method hides the method.
+
+    Subclasses declare ``__slots__`` (at least an empty one) to stay
+    compact.
+    """
+
+    __slots__ = ('manager', '_data', '__dict__')
+
     resource_name = 'Something'
     defaults = {}
 
     def __init__(self, manager, data):
-        self.manager = manager
-        self._data = data
-        self._set_defaults()
-        self._set_attributes()
-
-    def _set_defaults(self):
-        for k, v in self.defaults.items():
-            if k not in self._data:
-                self._data[k] = v
-
-    def _set_attributes(self):
-        for k, v in self._data.items():
-            try:
-                setattr(self, k, v)
-            except AttributeError:
-                # In this case we already defined the attribute on the class
-                pass
+        _set_manager(self, manager)
+        _set_data(self, data)
+        _set_dict(self, data)
+
+    def __getattr__(self, name):
+        # Only called when regular lookup fails: for defaults, and for
+        # fields hidden by an unset slot of the same name.
+        if name.startswith('__') or name in Resource.__slots__:
+            raise AttributeError(name)
+
+        try:
+            return self._data[name]
+        except KeyError:
+            pass
+
+        try:
+            return self.defaults[name]
+        except KeyError:
+            raise AttributeError(
+                "'%s' object has no attribute '%s'"
+                % (self.__class__.__name__, name)
+            )
+
+    def __setattr__(self, name, value):
+        # Slots and properties of the class are set as usual.
+        if hasattr(getattr(type(self), name, None), '__set__'):
+            object.__setattr__(self, name, value)
+            return
+
+        attrs = self.__dict__
+        if attrs is self._data:
+            attrs = dict(attrs)
+            _set_dict(self, attrs)
+        attrs[name] = value
+
+    def __delattr__(self, name):
+        if hasattr(getattr(type(self), name, None), '__delete__'):
+            object.__delattr__(self, name)
+            return
+
+        # Only assigned attributes are deleted, restoring the data value.
+        attrs = self.__dict__
+        if attrs is self._data or name not in attrs:
+            raise AttributeError(name)
+        if name in self._data:
+            attrs[name] = self._data[name]
+        else:
+            del attrs[name]
+
+    def _full_data(self):
+        """Returns the data with defaults applied, not a copy."""
+        if not self.defaults:
+            return self._data
+
+        data = dict(self.defaults)
+        data.update(self._data)
+        return data
 
     def to_dict(self):
-        return copy.deepcopy(self._data)
+        """Returns a deep copy of the resource data."""
+        return copy.deepcopy(self._full_data())
+
+    def view(self):
+        """Returns a copy-on-write view of the resource data.
+
+        Reading is free of copying, modifications of the view don't
+        affect the resource (see klabclient.api.views).
+        """
+        return views.DictView(self._full_data())
 
     def __str__(self):
         vals = ", ".join(["%s='%s'" % (n, v)
-                          for n, v in self._data.items()])
+                          for n, v in self._full_data().items()])
         return "%s [%s]" % (self.resource_name, vals)
 
 
-def _check_items(obj, searches):
-    try:
-        return all(getattr(obj, attr) == value for (attr, value) in searches)
-    except AttributeError:
-        return False
+_set_manager = Resource.manager.__set__
+_set_data = Resource._data.__set__
+_set_dict = Resource.__dict__['__dict__'].__set__
 
 
 def extract_json(response, response_key):
@@ -56,11 +248,52 @@ def extract_json(response, response_key):
 
 class ResourceManager(object):
     resource_class = None
+    # Seconds a listing is reused by query() and find(), 0 disables it.
+    # Reuse is opt-in: a reused listing doesn't see writes made through
+    # other managers, and callers share its resource objects.
+    query_ttl = 0
 
     def __init__(self, http_client):
         self.http_client = http_client
+        self._queries = {}
 
-    def _catalog(self, url, search=None, page=None, limit=None):
+    def _catalog(self, url, search=None, page=None, limit=None,
+                 columnar=False):
+        return self._list(
+            self._catalog_url(url, search, page, limit), response_key=None,
+            columnar=columnar
+        )
+
+    def _iter_catalog(self, url, search=None, limit=None, prefetch=1):
+        """Yields items of all catalog pages.
+
+        :param limit: page size.
+        :param prefetch: number of next pages fetched in background while
+            the current one is consumed, 0 disables prefetching.
+        """
+        return pagination.iter_pages(
+            lambda page, page_size: self._catalog(
+                url, search, page, page_size
+            ),
+            limit or CATALOG_PAGE_SIZE,
+            prefetch
+        )
+
+    def _catalog_columns(self, url, search=None, limit=None, prefetch=1):
+        """Returns resourcelist.ResourceList of all catalog pages.
+
+        Pages are fetched as in _iter_catalog(), no resources are built.
+        """
+        records = pagination.iter_pages(
+            lambda page, page_size: self._get_json(
+                self._catalog_url(url, search, page, page_size)
+            ),
+            limit or CATALOG_PAGE_SIZE,
+            prefetch
+        )
+        return resourcelist.ResourceList(self, records)
+
+    def _catalog_url(self, url, search=None, page=None, limit=None):
         qparams = {}
 
         if search:
@@ -77,12 +310,45 @@ class ResourceManager(object):
             if qparams else ""
         )
 
-        return self._list(
-            '%s%s' % (url, query_string), response_key=None
-        )
+        return '%s%s' % (url, query_string)
+
+    def query(self, *scope, **kwargs):
+        """Returns indexed query.Query over list(*scope).
+
+        The listing is fetched on every call, unless ``query_ttl`` is
+        set: then it is reused for ``query_ttl`` seconds or until a
+        resource is created, updated or deleted with this manager.
 
-    def find(self, **kwargs):
-        return [i for i in self.list() if _check_items(i, kwargs.items())]
+        :param scope: arguments of list(), e.g. workspace.
+        :param refresh: fetch the listing even if it is cached.
+        """
+        q = self._cached_query(scope, kwargs.get('refresh'))
+        if q is None:
+            q = query.Query(self.list(*scope))
+            if self.query_ttl:
+                self._queries[scope] = q
+
+        return q
+
+    def _cached_query(self, scope, refresh=False):
+        if not self.query_ttl or refresh:
+            return None
+
+        q = self._queries.get(scope)
+        if q is None or time.time() - q.created_at > self.query_ttl:
+            return None
+
+        return q
+
+    def find(self, *scope, **kwargs):
+        """Returns resources of list(*scope) with given attribute values.
+
+            client.apps.find('my-workspace', Name='styles-set')
+        """
+        return self.query(*scope).filter(**kwargs)
+
+    def _invalidate_queries(self):
+        self._queries.clear()
 
     def _ensure_not_empty(self, **kwargs):
         for name, value in kwargs.items():
@@ -100,9 +366,10 @@ class ResourceManager(object):
 
     def _create(self, url, data, response_key=None, dump_json=True):
         if dump_json:
-            data = json.dumps(data)
+            data = json_dumps(data)
 
         resp = self.http_client.post(url, data)
+        self._invalidate_queries()
 
         if resp.status_code >= 400:
             self._raise_api_exception(resp)
@@ -111,34 +378,115 @@ class ResourceManager(object):
 
     def _update(self, url, data, response_key=None, dump_json=True):
         if dump_json:
-            data = json.dumps(data)
+            data = json_dumps(data)
 
         resp = self.http_client.put(url, data)
+        self._invalidate_queries()
 
         if resp.status_code != 200:
             self._raise_api_exception(resp)
 
         return self.resource_class(self, extract_json(resp, response_key))
 
-    def _list(self, url, response_key=None):
-        resp = self.http_client.get(url)
+    def _list(self, url, response_key=None, columnar=False, row_attrs=None):
+        """Returns list of resources.
+
+        :param columnar: return resourcelist.ResourceList instead.
+        :param row_attrs: attributes set on every resource.
+        """
+        resp = self._fetch(url)
 
         if resp.status_code != 200:
             self._raise_api_exception(resp)
 
-        return [self.resource_class(self, resource_data)
-                for resource_data in extract_json(resp, response_key)]
+        records = extract_json(resp, response_key)
+        if columnar:
+            return resourcelist.ResourceList(
+                self, records, row_attrs=row_attrs
+            )
+
+        resources = [self.resource_class(self, resource_data)
+                     for resource_data in records]
+        for name, value in (row_attrs or {}).items():
+            for resource in resources:
+                setattr(resource, name, value)
+
+        return resources
+
+    def _fetch(self, url):
+        """GETs the URL, through the client's resource cache if enabled."""
+        cache = getattr(self.http_client, 'resource_cache', None)
+        if not cache:
+            return self.http_client.get(url)
+
+        resp = cache.get(url)
+        if resp is None:
+            # Taken first, so that a write meanwhile discards the response.
+            generation = cache.generation()
+            resp = self.http_client.get(url)
+            if resp.status_code == 200:
+                cache.put(url, resp, generation)
+
+        return resp
+
+    def _iter_list(self, url, response_key=None):
+        """Yields resources of a list response as they are decoded.
+
+        The body is parsed incrementally while it is downloaded, so memory
+        doesn't grow with the response size.
+        """
+        if response_key is not None:
+            for resource in self._list(url, response_key):
+                yield resource
+            return
+
+        resp = self.http_client.get_stream(url)
+        try:
+            if resp.status_code != 200:
+                self._raise_api_exception(resp)
+
+            chunks = resp.iter_content(STREAM_CHUNK_SIZE)
+            for resource_data in jsonstream.iter_array(chunks):
+                yield self.resource_class(self, resource_data)
+        finally:
+            resp.close()
 
     def _get(self, url, response_key=None):
-        resp = self.http_client.get(url)
+        resp = self._fetch(url)
 
         if resp.status_code == 200:
             return self.resource_class(self, extract_json(resp, response_key))
         else:
             self._raise_api_exception(resp)
 
+    def _get_as(self, url, resource_class, response_key=None):
+        return resource_class(self, self._get_json(url, response_key))
+
+    def _list_as(self, url, resource_class, response_key=None):
+        return [
+            resource_class(self, d)
+            for d in self._get_json(url, response_key)
+        ]
+
+    def _get_json(self, url, response_key=None):
+        resp = self._fetch(url)
+
+        if resp.status_code >= 400:
+            self._raise_api_exception(resp)
+
+        return extract_json(resp, response_key)
+
+    def _get_text(self, url):
+        resp = self._fetch(url)
+
+        if resp.status_code >= 400:
+            self._raise_api_exception(resp)
+
+        return resp.text
+
     def _delete(self, url):
         resp = self.http_client.delete(url)
+        self._invalidate_queries()
 
         if resp.status_code >= 400:
             self._raise_api_exception(resp)
@@ -158,9 +506,14 @@ class ResourceManager(object):
 def get_json(response):
     """Gets JSON representation of response.
 
-    This method provided backward compatibility with old versions
-    of requests library.
+    The body is decoded with the configured JSON codec. Falls back to
+    response.json() for responses without bytes content, which also
+    provides backward compatibility with old versions of requests library.
     """
+    content = getattr(response, 'content', None)
+    if isinstance(content, six.binary_type):
+        return json_loads(content)
+
     json_field_or_function = getattr(response, 'json', None)
 
     if callable(json_field_or_function):
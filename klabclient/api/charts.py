@@ -9,10 +9,12 @@ urlparse = six.moves.urllib.parse
 
 class CatalogChart(base.Resource):
     resource_name = 'CatalogChart'
+    __slots__ = ()
 
 
 class ChartVersion(base.Resource):
     resource_name = 'ChartVersion'
+    __slots__ = ()
 
 
 class ChartManager(base.ResourceManager):
@@ -21,11 +23,29 @@ class ChartManager(base.ResourceManager):
     def catalog(self, search=None, page=None, limit=None):
         return self._catalog('/catalog/chart-app', search, page, limit)
 
+    def iter_catalog(self, search=None, limit=None, prefetch=1):
+        """Yields charts of all catalog pages, see _iter_catalog()."""
+        return self._iter_catalog(
+            '/catalog/chart-app', search, limit, prefetch
+        )
+
+    def catalog_columns(self, search=None, limit=None, prefetch=1):
+        """Returns all catalog pages as resourcelist.ResourceList."""
+        return self._catalog_columns(
+            '/catalog/chart-app', search, limit, prefetch
+        )
+
     def list(self, workspace, search=None, page=None, limit=None):
         url = '/workspace/%s/chart-app' % workspace
 
         return self._catalog(url, search, page, limit)
 
+    def iter_list(self, workspace, search=None, limit=None, prefetch=1):
+        """Yields charts of all workspace pages, see _iter_catalog()."""
+        url = '/workspace/%s/chart-app' % workspace
+
+        return self._iter_catalog(url, search, limit, prefetch)
+
     def get(self, workspace, chart_name, version=None):
         url = '/workspace/%s/chart-app/%s' % (workspace, chart_name)
 
@@ -42,11 +62,7 @@ class ChartManager(base.ResourceManager):
 
         url += '/versions/%s/yaml' % version
 
-        resp = self.http_client.get(url)
-        if resp.status_code >= 400:
-            self._raise_api_exception(resp)
-
-        return resp.text
+        return self._get_text(url)
 
     def delete(self, workspace, chart_name):
         url = '/workspace/%s/chart-app/%s' % (workspace, chart_name)
@@ -97,19 +113,11 @@ class ChartManager(base.ResourceManager):
     def list_versions(self, workspace, chart_name):
         url = '/workspace/%s/chart-app/%s/versions' % (workspace, chart_name)
 
-        resp = self.http_client.get(url)
-        if resp.status_code >= 400:
-            self._raise_api_exception(resp)
-
-        return [ChartVersion(self, v) for v in base.extract_json(resp, None)]
+        return self._list_as(url, ChartVersion)
 
     def get_values(self, workspace, chart_name, version='latest'):
         url = '/workspace/%s/chart-app/%s/versions/%s/values/yaml' % (
             (workspace, chart_name, version)
         )
 
-        resp = self.http_client.get(url)
-        if resp.status_code >= 400:
-            self._raise_api_exception(resp)
-
-        return resp.text
+        return self._get_text(url)
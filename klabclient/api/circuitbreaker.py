@@ -0,0 +1,169 @@
+import threading
+import time
+
+from klabclient import exceptions
+
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+# Static path segments of the Kuberlab API, everything else is treated as
+# an identifier when building URL templates.
+STATIC_SEGMENTS = frozenset([
+    'api', 'appdestinations', 'application', 'auth', 'available', 'build',
+    'catalog', 'chart', 'chart-app', 'chart-mlapp-v2', 'clusters',
+    'dataset', 'disable', 'enable', 'install', 'log', 'login', 'mlmodel',
+    'org', 'own', 'packages', 'pods', 'projects', 'share', 'sharedclusters',
+    'status', 'storage', 'tasks', 'upload', 'values', 'versions',
+    'workspace', 'yaml',
+])
+
+
+def url_template(url):
+    """Converts request URL to a template.
+
+    '/workspace/ws/application/app/status?x=1' becomes
+    '/workspace/{}/application/{}/status'.
+    """
+    path = url.split('?', 1)[0]
+
+    return '/'.join(
+        s if not s or s in STATIC_SEGMENTS else '{}'
+        for s in path.split('/')
+    )
+
+
+class CircuitBreaker(object):
+    """Circuit breaker for a single endpoint.
+
+    Opens after ``failure_threshold`` consecutive failures. After
+    ``recovery_timeout`` seconds it becomes half-open and lets a single
+    trial request through: success closes it, failure opens it again.
+    """
+
+    def __init__(self, failure_threshold=5, recovery_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_progress = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state(time.time())
+
+    def _state(self, now):
+        if self.opened_at is None:
+            return CLOSED
+
+        if now - self.opened_at >= self.recovery_timeout:
+            return HALF_OPEN
+
+        return OPEN
+
+    def retry_after(self):
+        """Seconds left until the breaker lets a trial request through."""
+        with self._lock:
+            if self.opened_at is None:
+                return 0.0
+
+            return max(
+                0.0, self.opened_at + self.recovery_timeout - time.time()
+            )
+
+    def allow_request(self):
+        with self._lock:
+            state = self._state(time.time())
+
+            if state == CLOSED:
+                return True
+
+            if state == HALF_OPEN and not self._trial_in_progress:
+                self._trial_in_progress = True
+                return True
+
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_progress = False
+
+    def release(self):
+        """Ends a request without an outcome of the endpoint.
+
+        E.g. the caller's deadline was exceeded before the request was
+        sent. A half-open breaker lets the next request through as the
+        trial.
+        """
+        with self._lock:
+            self._trial_in_progress = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            now = time.time()
+
+            if (self._trial_in_progress or
+                    self.failures >= self.failure_threshold):
+                self.opened_at = now
+            self._trial_in_progress = False
+
+
+class CircuitBreakerRegistry(object):
+    """Keeps a circuit breaker per URL template.
+
+    :param failure_threshold: consecutive failures which open a breaker.
+    :param recovery_timeout: seconds a breaker stays open.
+    :param key_func: callable mapping request URL to breaker key.
+    """
+
+    def __init__(self, failure_threshold=5, recovery_timeout=30.0,
+                 key_func=url_template):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.key_func = key_func
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def get(self, url):
+        key = self.key_func(url)
+
+        with self._lock:
+            breaker = self._breakers.get(key)
+            if breaker is None:
+                breaker = CircuitBreaker(
+                    self.failure_threshold, self.recovery_timeout
+                )
+                self._breakers[key] = breaker
+
+            return breaker
+
+    def state(self, url):
+        return self.get(url).state
+
+    def before_request(self, url):
+        breaker = self.get(url)
+
+        if not breaker.allow_request():
+            retry_after = breaker.retry_after()
+            raise exceptions.CircuitOpenException(
+                'Circuit breaker for %s is open, retry in %.1fs.'
+                % (self.key_func(url), retry_after),
+                retry_after=retry_after
+            )
+
+        return breaker
+
+    def stats(self):
+        with self._lock:
+            breakers = list(self._breakers.items())
+
+        return dict(
+            (key, {'state': b.state, 'failures': b.failures})
+            for key, b in breakers
+        )
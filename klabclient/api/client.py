@@ -19,12 +19,34 @@ from klabclient import exceptions
 parse = six.moves.urllib.parse
 _DEFAULT_KUBERLAB_URL = "https://go.kuberlab.io/api/v0.2"
 
+# Object-valued HTTPClient options passed as is, not deep-copied.
+_SHARED_OPTIONS = (
+    httpclient.HTTP_CACHE,
+    httpclient.RESOURCE_CACHE,
+    httpclient.RATE_LIMITER,
+    httpclient.RETRY_BUDGET,
+    httpclient.CIRCUIT_BREAKER,
+)
+
 
 class Client(object):
+    """Kuberlab API client.
+
+    Pass prewarm=True to open the API connection in a background thread
+    while the caller is still preparing its first request.
+    """
+
     def __init__(self, session=requests, **kwargs):
-        # We get the session at this point, as some instances of session
-        # objects might have mutexes that can't be deep-copied.
+        # We get the session, transport and other shared objects (caches,
+        # limiters, breakers) at this point, as they might have mutexes
+        # that can't be deep-copied.
+        transport = kwargs.pop('transport', None)
+        shared = dict(
+            (name, kwargs.pop(name)) for name in _SHARED_OPTIONS
+            if name in kwargs
+        )
         req = copy.deepcopy(kwargs)
+        req.update(shared)
         kuberlab_url = req.get('kuberlab_url')
 
         if kuberlab_url and not isinstance(kuberlab_url, six.string_types):
@@ -36,9 +58,12 @@ class Client(object):
         http_client = httpclient.HTTPClient(
             kuberlab_url,
             session=session,
+            transport=transport,
             **req
         )
 
+        self.http_client = http_client
+
         # Create all resource managers.
 
         self.apps = apps.AppManager(http_client)
@@ -61,13 +86,15 @@ def create_session(base_url=_DEFAULT_KUBERLAB_URL, **kwargs):
     :param username: username
     :param password: password
     :param token: API token created via API
+    :param pool_connections: number of per-host connection pools to cache.
+    :param pool_maxsize: max number of keep-alive connections per host.
     :return: request.Session object.
     """
     username = kwargs.get('username')
     password = kwargs.get('password')
     token = kwargs.get('token')
 
-    ses = requests.Session()
+    ses = httpclient.mount_pooled_adapter(requests.Session(), **kwargs)
     insecure = kwargs.pop('insecure')
 
     if insecure is not None:
@@ -4,6 +4,7 @@ from klabclient.api import base
 
 class Cluster(base.Resource):
     resource_name = 'Cluster'
+    __slots__ = ()
 
 
 class ClusterManager(base.ResourceManager):
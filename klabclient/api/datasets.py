@@ -4,6 +4,7 @@ from klabclient.api import base
 
 class Dataset(base.Resource):
     resource_name = 'Dataset'
+    __slots__ = ()
 
 
 class DatasetManager(base.ResourceManager):
@@ -50,6 +51,18 @@ class DatasetManager(base.ResourceManager):
     def catalog(self, search=None, page=None, limit=None):
         return self._catalog('/catalog/dataset', search, page, limit)
 
+    def iter_catalog(self, search=None, limit=None, prefetch=1):
+        """Yields datasets of all catalog pages, see _iter_catalog()."""
+        return self._iter_catalog(
+            '/catalog/dataset', search, limit, prefetch
+        )
+
+    def catalog_columns(self, search=None, limit=None, prefetch=1):
+        """Returns all catalog pages as resourcelist.ResourceList."""
+        return self._catalog_columns(
+            '/catalog/dataset', search, limit, prefetch
+        )
+
     def list(self, workspace):
         return self._list(
             '/workspace/%s/dataset' % workspace, response_key=None
@@ -69,4 +82,4 @@ class DatasetManager(base.ResourceManager):
         if confirm:
             url += '?confirm=%s' % confirm
 
-        self._delete(url)
+        return self._delete(url)
@@ -0,0 +1,90 @@
+import threading
+import time
+
+from oslo_utils import importutils
+
+from klabclient import exceptions
+
+
+contextvars = importutils.try_import('contextvars')
+
+if contextvars:
+    # Context variables follow asyncio tasks as well as threads.
+    _stack_var = contextvars.ContextVar('klab_deadlines', default=())
+
+    def _get_stack():
+        return _stack_var.get()
+
+    def _set_stack(stack):
+        _stack_var.set(stack)
+else:
+    _local = threading.local()
+
+    def _get_stack():
+        return getattr(_local, 'stack', ())
+
+    def _set_stack(stack):
+        _local.stack = stack
+
+
+def current():
+    """Returns the innermost active deadline of this context or None."""
+    stack = _get_stack()
+
+    return stack[-1] if stack else None
+
+
+def remaining():
+    """Returns seconds left before the current deadline or None."""
+    d = current()
+
+    return d.remaining() if d else None
+
+
+class Deadline(object):
+    """Time budget shared by all requests issued within the context.
+
+    The active deadline is tracked per thread and per asyncio task.
+
+    Deadlines nest: an inner deadline never outlives the outer one.
+
+        with deadline.Deadline(30):
+            apps = client.apps.list(ws)
+            statuses = [client.apps.status(ws, a.Name) for a in apps]
+
+    :param timeout: budget in seconds, None means unlimited.
+    """
+
+    def __init__(self, timeout):
+        self.timeout = timeout
+        self.expires_at = None if timeout is None else time.time() + timeout
+
+    def remaining(self):
+        if self.expires_at is None:
+            return None
+
+        return max(0.0, self.expires_at - time.time())
+
+    def expired(self):
+        return self.expires_at is not None and time.time() >= self.expires_at
+
+    def check(self):
+        if self.expired():
+            raise exceptions.DeadlineExceeded(
+                'Operation did not complete within %ss.' % self.timeout
+            )
+
+    def __enter__(self):
+        outer = current()
+
+        if outer is not None and outer.expires_at is not None:
+            if self.expires_at is None or outer.expires_at < self.expires_at:
+                self.expires_at = outer.expires_at
+                self.timeout = outer.timeout
+
+        _set_stack(_get_stack() + (self,))
+
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        _set_stack(tuple(d for d in _get_stack() if d is not self))
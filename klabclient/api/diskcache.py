@@ -0,0 +1,206 @@
+import fnmatch
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+import requests
+
+from klabclient.api import httpcache
+from klabclient.api import metrics
+from klabclient.api import transport
+
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_PATH = os.path.join('~', '.kuberlab', 'cache.sqlite')
+
+# Cached URL patterns (fnmatch, first match wins) and their TTLs in
+# seconds. Responses of other URLs are not stored.
+DEFAULT_TTLS = (
+    ('/workspace', 300),
+    ('/workspace/*/clusters', 300),
+    ('/workspace/*/clusters/*/storage', 300),
+    ('/workspace/*/appdestinations', 300),
+    ('/workspace/*/chart-app/*/versions', 600),
+    ('/workspace/*/chart-mlapp-v2/*/versions', 600),
+)
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS entries (
+    namespace TEXT NOT NULL,
+    url TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    response_url TEXT,
+    headers TEXT,
+    encoding TEXT,
+    content BLOB,
+    PRIMARY KEY (namespace, url)
+)
+'''
+
+
+class DiskCache(object):
+    """Persistent resource cache shared by processes, backed by sqlite.
+
+    Drop-in for rescache.ResourceCache (HTTPClient 'resource_cache'),
+    intended for metadata which rarely changes, so that consecutive
+    klab invocations don't refetch it. Writes through the client remove
+    overlapping entries for all processes, responses of GETs started
+    before a write of this process are not stored. Any sqlite error
+    makes the cache behave as empty rather than failing the request.
+
+    :param path: database file, created with its directory if missing.
+    :param namespace: separates entries of different API endpoints and
+        credentials sharing the file.
+    :param ttls: sequence of (URL pattern, TTL seconds), DEFAULT_TTLS by
+        default.
+    :param refresh: don't serve cached entries, only store fresh ones.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, namespace='', ttls=None,
+                 refresh=False):
+        self.path = os.path.expanduser(path)
+        self.namespace = namespace
+        self.ttls = list(DEFAULT_TTLS if ttls is None else ttls)
+        self.refresh = refresh
+        self.counters = metrics.Counters(
+            'hits', 'misses', 'invalidations', 'errors'
+        )
+        self._conn = None
+        self._invalidations = httpcache.InvalidationLog()
+        # Reentrant: put() and invalidate() hold it around _execute().
+        self._lock = threading.RLock()
+
+    def _connect(self):
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory and not os.path.isdir(directory):
+                os.makedirs(directory, 0o700)
+
+            # Created before sqlite does: it gives -wal and -shm files
+            # the mode of the database. Those of older versions fixed up.
+            os.close(os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600))
+            for path in (self.path, self.path + '-wal', self.path + '-shm'):
+                if os.path.exists(path):
+                    os.chmod(path, 0o600)
+
+            conn = sqlite3.connect(
+                self.path, timeout=5, check_same_thread=False
+            )
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(_SCHEMA)
+            conn.commit()
+            self._conn = conn
+
+        return self._conn
+
+    def _execute(self, sql, params=(), fetch=False):
+        with self._lock:
+            try:
+                conn = self._connect()
+                with conn:
+                    cursor = conn.execute(sql, params)
+                    return cursor.fetchall() if fetch else None
+            except (sqlite3.Error, OSError) as e:
+                LOG.debug("Disk cache %s failed: %s", self.path, e)
+                self.counters.incr('errors')
+                return [] if fetch else None
+
+    def ttl(self, url):
+        """Returns TTL of the URL or None if it's not cached."""
+        path = url.split('?', 1)[0].rstrip('/')
+        for pattern, ttl in self.ttls:
+            if fnmatch.fnmatchcase(path, pattern):
+                return ttl
+
+        return None
+
+    def generation(self):
+        """Returns the token to pass to put() for a new request."""
+        with self._lock:
+            return self._invalidations.generation()
+
+    def get(self, url):
+        if self.refresh or self.ttl(url) is None:
+            return None
+
+        rows = self._execute(
+            'SELECT response_url, headers, encoding, content FROM entries '
+            'WHERE namespace = ? AND url = ? AND expires_at > ?',
+            (self.namespace, url, time.time()),
+            fetch=True
+        )
+        if not rows:
+            self.counters.incr('misses')
+            return None
+
+        response_url, headers, encoding, content = rows[0]
+        request = requests.Request('GET', response_url).prepare()
+        resp = transport.make_response(
+            request, 200, bytes(content), json.loads(headers)
+        )
+        resp.encoding = encoding
+        resp.from_cache = True
+        self.counters.incr('hits')
+
+        return resp
+
+    def put(self, url, resp, generation=None):
+        ttl = self.ttl(url)
+        if not ttl:
+            return
+
+        now = time.time()
+        with self._lock:
+            if self._invalidations.modified_since(url, generation):
+                return
+
+            self._execute(
+                'INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (self.namespace, url, now + ttl, resp.url,
+                 json.dumps(dict(resp.headers)), resp.encoding,
+                 sqlite3.Binary(resp.content))
+            )
+        self._execute('DELETE FROM entries WHERE expires_at <= ?', (now,))
+
+    def invalidate(self, url):
+        with self._lock:
+            self._invalidations.record(url)
+            rows = self._execute(
+                'SELECT url FROM entries WHERE namespace = ?',
+                (self.namespace,), fetch=True
+            )
+            for (key,) in rows:
+                if httpcache.overlaps(key, url):
+                    self._execute(
+                        'DELETE FROM entries WHERE namespace = ? AND url = ?',
+                        (self.namespace, key)
+                    )
+                    self.counters.incr('invalidations')
+
+    def clear(self):
+        self._execute(
+            'DELETE FROM entries WHERE namespace = ?', (self.namespace,)
+        )
+
+    def stats(self):
+        result = self.counters.as_dict()
+        total = result['hits'] + result['misses']
+
+        rows = self._execute(
+            'SELECT COUNT(*) FROM entries WHERE namespace = ?',
+            (self.namespace,), fetch=True
+        )
+        result['entries'] = rows[0][0] if rows else 0
+        result['hit_ratio'] = float(result['hits']) / total if total else 0.0
+
+        return result
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,98 @@
+import ssl
+
+from oslo_utils import importutils
+import requests
+import six
+
+from klabclient.api import transport
+
+
+httpx = importutils.try_import('httpx')
+
+# Hop-by-hop and encoding headers which don't apply to the decoded body.
+_SKIP_HEADERS = frozenset(['content-encoding', 'content-length',
+                           'transfer-encoding', 'connection'])
+
+
+def ssl_context(insecure=False, cacert=None, cert_file=None, key_file=None):
+    if insecure:
+        return False
+
+    context = ssl.create_default_context(cafile=cacert)
+    if cert_file:
+        context.load_cert_chain(cert_file, key_file)
+
+    return context
+
+
+class HTTP2Transport(transport.Transport):
+    """HTTP/2 transport based on httpx (requires 'httpx[http2]').
+
+    Concurrent requests from any number of threads are multiplexed as
+    streams over a single connection per host.
+
+    :param verify: False, or ssl.SSLContext (see ssl_context()).
+    :param max_connections: max connections in the httpx pool.
+    """
+
+    def __init__(self, verify=True, max_connections=10):
+        if not httpx:
+            raise RuntimeError(
+                'httpx is required for HTTP/2 transport, install it with '
+                '"pip install httpx[http2]".'
+            )
+
+        self.client = httpx.Client(
+            http2=True,
+            verify=verify,
+            limits=httpx.Limits(max_connections=max_connections),
+        )
+
+    def request(self, method, url, **kwargs):
+        options = {
+            'headers': kwargs.get('headers'),
+            'files': kwargs.get('files'),
+            'json': kwargs.get('json'),
+        }
+
+        data = kwargs.get('data')
+        if isinstance(data, (six.binary_type, six.text_type)):
+            options['content'] = data
+        elif data is not None:
+            options['data'] = data
+
+        timeout = kwargs.get('timeout')
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            options['timeout'] = httpx.Timeout(read, connect=connect)
+        elif timeout is not None:
+            options['timeout'] = timeout
+
+        try:
+            r = self.client.request(method.upper(), url, **options)
+        except httpx.TimeoutException as e:
+            if isinstance(e, httpx.ConnectTimeout):
+                raise requests.ConnectTimeout(str(e))
+            raise requests.Timeout(str(e))
+        except httpx.TransportError as e:
+            raise requests.ConnectionError(str(e))
+
+        request = requests.Request(
+            method=method.upper(), url=url, headers=kwargs.get('headers')
+        ).prepare()
+        request.body = options.get('content')
+
+        resp = transport.make_response(
+            request,
+            r.status_code,
+            r.content,
+            [(k, v) for k, v in r.headers.items()
+             if k.lower() not in _SKIP_HEADERS]
+        )
+        resp.reason = r.reason_phrase
+        resp.http_version = r.http_version
+
+        return resp
+
+    def close(self):
+        self.client.close()
@@ -0,0 +1,250 @@
+import collections
+import threading
+import time
+
+from requests import models
+from requests import structures
+
+from klabclient.api import metrics
+
+
+class CacheEntry(object):
+    def __init__(self, resp, expires_at=None):
+        self.etag = resp.headers.get('ETag')
+        self.last_modified = resp.headers.get('Last-Modified')
+        self.content = resp.content
+        self.headers = dict(resp.headers)
+        self.encoding = resp.encoding
+        self.url = resp.url
+        self.request = resp.request
+        self.expires_at = expires_at
+
+    @property
+    def has_validators(self):
+        return bool(self.etag or self.last_modified)
+
+    def is_fresh(self):
+        return self.expires_at is not None and time.time() < self.expires_at
+
+    def conditional_headers(self):
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+
+        return headers
+
+    def to_response(self, request=None):
+        resp = models.Response()
+        resp.status_code = 200
+        resp.reason = 'OK'
+        resp._content = self.content
+        resp._content_consumed = True
+        resp.headers = structures.CaseInsensitiveDict(self.headers)
+        resp.encoding = self.encoding
+        resp.url = self.url
+        resp.request = request or self.request
+        resp.from_cache = True
+
+        return resp
+
+
+def _path(url):
+    return url.split('?', 1)[0].rstrip('/')
+
+
+# Sub-resources which are actions on their parent resource: writing to
+# them changes other sub-resources of the parent, e.g. POST
+# .../application/<app>/build/<task> adds to .../application/<app>/tasks
+# and .../application/<app>/disable changes .../application/<app>/status.
+ACTION_SEGMENTS = frozenset(['build', 'disable', 'enable'])
+
+
+def _scope(path):
+    """Returns the path under which a write to path may change data."""
+    parts = path.split('/')
+    # An action needs a resource to act on, e.g. not /build.
+    for i, part in enumerate(parts[2:], 2):
+        if part in ACTION_SEGMENTS:
+            return '/'.join(parts[:i])
+
+    return path
+
+
+def overlaps(url, modified_url):
+    """Whether a modification of modified_url may change url.
+
+    True for the URL itself, its sub-resources and parent collections.
+    For actions (see ACTION_SEGMENTS), true for all sub-resources of the
+    resource they act on.
+    """
+    path = _path(url)
+    modified = _path(modified_url)
+    scope = _scope(modified)
+
+    return (path == modified or
+            path == scope or
+            path.startswith(scope + '/') or
+            modified.startswith(path + '/'))
+
+
+class InvalidationLog(object):
+    """Recent invalidations of a cache, not thread safe.
+
+    A GET takes the generation() before sending. A response is stale
+    if a write to an overlapping URL invalidated the cache meanwhile,
+    as it may have been produced before the write; storing it would
+    bring back the evicted state.
+
+    :param size: number of remembered invalidations, a response older
+        than all of them is considered stale.
+    """
+
+    def __init__(self, size=256):
+        self._generation = 0
+        self._entries = collections.deque(maxlen=size)
+
+    def generation(self):
+        return self._generation
+
+    def record(self, url):
+        self._generation += 1
+        self._entries.append((self._generation, url))
+
+    def modified_since(self, url, generation):
+        """Whether url may have changed since the given generation."""
+        if generation is None or generation >= self._generation:
+            return False
+
+        if self._entries[0][0] > generation + 1:
+            # Invalidations in between were forgotten.
+            return True
+
+        for entry_generation, modified_url in reversed(self._entries):
+            if entry_generation <= generation:
+                break
+            if overlaps(url, modified_url):
+                return True
+
+        return False
+
+
+class HTTPCache(object):
+    """Conditional GET cache.
+
+    Responses with ETag/Last-Modified are stored and revalidated with
+    If-None-Match/If-Modified-Since, a 304 is served from the stored
+    body. Responses without validators are served from the cache for
+    ``default_ttl`` seconds (0 disables it). A response isn't stored if
+    an overlapping URL was invalidated after its request started (see
+    InvalidationLog).
+
+    :param max_entries: max number of cached URLs (LRU eviction).
+    :param default_ttl: TTL for responses without validators.
+    """
+
+    def __init__(self, max_entries=256, default_ttl=5.0):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.counters = metrics.Counters(
+            'hits', 'revalidated', 'misses', 'bytes_saved'
+        )
+        self._entries = collections.OrderedDict()
+        self._invalidations = InvalidationLog()
+        self._lock = threading.Lock()
+
+    def generation(self):
+        """Returns the token to pass to update() for a new request."""
+        with self._lock:
+            return self._invalidations.generation()
+
+    def lookup(self, url):
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                self._entries.pop(url)
+                self._entries[url] = entry
+
+            return entry
+
+    def fresh_response(self, entry):
+        """Returns a response for an entry valid by TTL, or None."""
+        if entry is None or not entry.is_fresh():
+            return None
+
+        self.counters.incr('hits')
+        self.counters.incr('bytes_saved', len(entry.content))
+
+        return entry.to_response()
+
+    def update(self, url, resp, entry=None, generation=None):
+        """Stores the response, resolves 304 against the stored entry.
+
+        :param generation: generation() taken before sending the request.
+        :return: response to hand over to the caller.
+        """
+        if resp.status_code == 304 and entry is not None:
+            self.counters.incr('revalidated')
+            self.counters.incr('bytes_saved', len(entry.content))
+
+            return entry.to_response(resp.request)
+
+        self.counters.incr('misses')
+
+        if resp.status_code != 200:
+            return resp
+
+        cache_control = resp.headers.get('Cache-Control', '').lower()
+        if 'no-store' in cache_control:
+            self.discard(url)
+            return resp
+
+        new_entry = CacheEntry(resp)
+        if not new_entry.has_validators:
+            if not self.default_ttl:
+                self.discard(url)
+                return resp
+            new_entry.expires_at = time.time() + self.default_ttl
+
+        with self._lock:
+            if self._invalidations.modified_since(url, generation):
+                return resp
+
+            self._entries.pop(url, None)
+            self._entries[url] = new_entry
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+        return resp
+
+    def discard(self, url):
+        with self._lock:
+            self._entries.pop(url, None)
+
+    def invalidate(self, url):
+        """Drops entries overlapping with a modified URL.
+
+        Entries for the URL itself, its sub-resources and its parent
+        collections are removed.
+        """
+        with self._lock:
+            self._invalidations.record(url)
+            for key in list(self._entries):
+                if overlaps(key, url):
+                    self._entries.pop(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        result = self.counters.as_dict()
+        served = result['hits'] + result['revalidated']
+        total = served + result['misses']
+
+        result['entries'] = len(self._entries)
+        result['hit_ratio'] = float(served) / total if total else 0.0
+
+        return result
@@ -1,46 +1,510 @@
 
+import collections
 import copy
+import email.utils
+import gzip
+import io
+import itertools
 import os
+import random
+import threading
+import time
 
 from oslo_utils import importutils
 import requests
+from requests import adapters
+import six
+from urllib3 import connectionpool
+from urllib3 import util as urllib3_util
 
 import logging
 
+from klabclient.api import circuitbreaker
+from klabclient.api import deadline
+from klabclient.api import http2
+from klabclient.api import httpcache
+from klabclient.api import metrics
+from klabclient.api import ratelimit
+from klabclient.api import rescache
+from klabclient.api import singleflight
+
 
 CACERT = 'cacert'
 CERT_FILE = 'cert'
 CERT_KEY = 'key'
 INSECURE = 'insecure'
+POOL_CONNECTIONS = 'pool_connections'
+POOL_MAXSIZE = 'pool_maxsize'
+POOL_BLOCK = 'pool_block'
+
+RETRY_POLICIES = 'retry_policies'
+RETRY_BUDGET = 'retry_budget'
+RATE_LIMIT = 'rate_limit'
+RATE_LIMIT_BURST = 'rate_limit_burst'
+RATE_LIMITS = 'rate_limits'
+RATE_LIMITER = 'rate_limiter'
+CIRCUIT_BREAKER = 'circuit_breaker'
+CONNECT_TIMEOUT = 'connect_timeout'
+READ_TIMEOUT = 'read_timeout'
+STREAM_READ_TIMEOUT = 'stream_read_timeout'
+COMPRESS_THRESHOLD = 'compress_threshold'
+HTTP_CACHE = 'http_cache'
+COALESCE_REQUESTS = 'coalesce_requests'
+TRANSPORT = 'transport'
+HTTP2 = 'http2'
+HEADERS = 'headers'
+PREWARM = 'prewarm'
+HTTP_CACHE_TTL = 'http_cache_ttl'
+RESOURCE_CACHE = 'resource_cache'
+RESOURCE_CACHE_TTL = 'resource_cache_ttl'
+RESOURCE_CACHE_SIZE = 'resource_cache_size'
+WIRE_LOG_MAX_BODY = 'wire_log_max_body'
+WIRE_LOG_SAMPLE_RATE = 'wire_log_sample_rate'
+
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
+DEFAULT_CONNECT_TIMEOUT = 10
+DEFAULT_READ_TIMEOUT = 120
+# Streamed output, e.g. of pip, may pause for long.
+DEFAULT_STREAM_READ_TIMEOUT = 600
+
+IDEMPOTENCY_KEY_HEADER = 'Idempotency-Key'
+
+# gzip and deflate, plus br and zstd when urllib3 is able to decode them.
+ACCEPT_ENCODING = urllib3_util.make_headers(
+    accept_encoding=True)['accept-encoding']
 
 osprofiler_web = importutils.try_import("osprofiler.web")
 
 LOG = logging.getLogger(__name__)
 
 
+class WireLogger(object):
+    """Logs HTTP exchanges at the given level.
+
+    Does no work unless the logger is enabled for the level. Only a
+    ``sample_rate`` share of requests is logged and bodies are truncated
+    to ``max_body`` bytes. Each record carries an ``http`` attribute with
+    method, url, status, elapsed time (seconds) and body size.
+    """
+
+    def __init__(self, logger=LOG, level=logging.DEBUG, max_body=1024,
+                 sample_rate=1.0):
+        self.logger = logger
+        self.level = level
+        self.max_body = max_body
+        self.sample_rate = sample_rate
+
+    def should_log(self):
+        if not self.logger.isEnabledFor(self.level):
+            return False
+
+        return self.sample_rate >= 1 or random.random() < self.sample_rate
+
+    def _body(self, content):
+        if not content or not self.max_body:
+            return ''
+
+        body = content[:self.max_body]
+        if not isinstance(body, six.text_type):
+            body = body.decode('utf-8', 'replace')
+
+        if len(content) > self.max_body:
+            body += '... (%d bytes total)' % len(content)
+
+        return body
+
+    def log(self, resp, elapsed):
+        request = resp.request
+        # Streamed responses must not be read here.
+        content = (
+            resp.content if getattr(resp, '_content_consumed', False)
+            else None
+        )
+        info = {
+            'method': request.method,
+            'url': resp.url,
+            'status': resp.status_code,
+            'elapsed': elapsed,
+            'size': len(content) if content is not None else None,
+            'wire_size': getattr(resp, 'klab_wire_size', None),
+        }
+
+        self.logger.log(
+            self.level, "HTTP %s %s %d %.1fms", request.method, resp.url,
+            resp.status_code, elapsed * 1000, extra={'http': info}
+        )
+        if request.body and isinstance(
+                request.body, (six.binary_type, six.text_type)):
+            self.logger.log(
+                self.level, "REQ BODY %s", self._body(request.body),
+                extra={'http': info}
+            )
+        if content:
+            self.logger.log(
+                self.level, "RESP BODY %s", self._body(content),
+                extra={'http': info}
+            )
+
+
+def gzip_body(body):
+    if isinstance(body, six.text_type):
+        body = body.encode('utf-8')
+
+    buf = io.BytesIO()
+    with gzip.GzipFile(fileobj=buf, mode='wb') as f:
+        f.write(body)
+
+    return buf.getvalue()
+
+
+def _wire_size(resp):
+    """Returns number of bytes read from the socket for the response."""
+    try:
+        return resp.raw.tell()
+    except Exception:
+        return None
+
+
+def _copy_response(resp):
+    copied = requests.Response()
+    copied.__dict__.update(resp.__dict__)
+    copied.headers = requests.structures.CaseInsensitiveDict(resp.headers)
+
+    return copied
+
+
 def log_request(func):
     def decorator(self, *args, **kwargs):
+        wire_logger = self.wire_logger
+        if not wire_logger.should_log():
+            return func(self, *args, **kwargs)
+
+        start = time.time()
         resp = func(self, *args, **kwargs)
-        LOG.debug(
-            "HTTP %s %s %d", resp.request.method, resp.url, resp.status_code
-        )
-        LOG.debug("RESP BODY %s", resp.text)
+        wire_logger.log(resp, time.time() - start)
+
         return resp
     return decorator
 
 
+def _counting_pool_class(pool_class, counters):
+    class CountingConnectionPool(pool_class):
+        def _new_conn(self):
+            counters.incr('opened')
+            return super(CountingConnectionPool, self)._new_conn()
+
+        def _get_conn(self, timeout=None):
+            conn = super(CountingConnectionPool, self)._get_conn(timeout)
+
+            if getattr(conn, '_klab_used', False):
+                if getattr(conn, 'sock', None) is None:
+                    # Peer closed the connection while it was idle in
+                    # the pool, it is going to be reconnected.
+                    counters.incr('dropped')
+                    counters.incr('opened')
+                else:
+                    counters.incr('reused')
+            conn._klab_used = True
+
+            return conn
+
+        def _put_conn(self, conn):
+            if conn is not None and self.pool is not None and self.pool.full():
+                counters.incr('dropped')
+
+            return super(CountingConnectionPool, self)._put_conn(conn)
+
+    # Keep the original name in urllib3 error messages.
+    CountingConnectionPool.__name__ = pool_class.__name__
+
+    return CountingConnectionPool
+
+
+class PooledHTTPAdapter(adapters.HTTPAdapter):
+    """HTTP adapter keeping per-host keep-alive pools with statistics.
+
+    Counts connections opened, reused from the pool and dropped (either
+    closed by the server while idle or discarded because the pool was full).
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.counters = metrics.Counters('opened', 'reused', 'dropped')
+        super(PooledHTTPAdapter, self).__init__(*args, **kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super(PooledHTTPAdapter, self).init_poolmanager(*args, **kwargs)
+
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _counting_pool_class(
+                connectionpool.HTTPConnectionPool, self.counters
+            ),
+            'https': _counting_pool_class(
+                connectionpool.HTTPSConnectionPool, self.counters
+            ),
+        }
+
+    def __setstate__(self, state):
+        self.counters = metrics.Counters('opened', 'reused', 'dropped')
+        super(PooledHTTPAdapter, self).__setstate__(state)
+
+
+def mount_pooled_adapter(session, **kwargs):
+    """Mounts PooledHTTPAdapter for http and https on the given session."""
+    adapter = PooledHTTPAdapter(
+        pool_connections=kwargs.get(
+            POOL_CONNECTIONS) or DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize=kwargs.get(POOL_MAXSIZE) or DEFAULT_POOL_MAXSIZE,
+        pool_block=bool(kwargs.get(POOL_BLOCK, False)),
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
+    return session
+
+
+class RetryPolicy(object):
+    """Describes how requests of one HTTP method are retried.
+
+    :param max_retries: max number of retries after the first attempt.
+    :param backoff_factor: base of the exponential backoff, in seconds.
+    :param max_backoff: upper bound for a single sleep, in seconds.
+    :param jitter: use full jitter (random sleep in [0, backoff]).
+    :param status_forcelist: response codes which trigger a retry.
+    :param respect_retry_after: honor Retry-After header of the response.
+    :param require_idempotency_key: retry only requests carrying
+        Idempotency-Key header (used for POST).
+    """
+
+    def __init__(self, max_retries=3, backoff_factor=0.5, max_backoff=30,
+                 jitter=True, status_forcelist=(429, 502, 503, 504),
+                 respect_retry_after=True, require_idempotency_key=False):
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.status_forcelist = frozenset(status_forcelist)
+        self.respect_retry_after = respect_retry_after
+        self.require_idempotency_key = require_idempotency_key
+
+    def is_applicable(self, headers):
+        if not self.require_idempotency_key:
+            return True
+
+        return any(
+            k.lower() == IDEMPOTENCY_KEY_HEADER.lower() and v
+            for k, v in (headers or {}).items()
+        )
+
+    def is_retryable_response(self, resp):
+        return resp.status_code in self.status_forcelist
+
+    def get_backoff(self, attempt, resp=None):
+        if resp is not None and self.respect_retry_after:
+            retry_after = parse_retry_after(resp.headers.get('Retry-After'))
+            if retry_after is not None:
+                return min(retry_after, self.max_backoff)
+
+        backoff = min(self.max_backoff, self.backoff_factor * (2 ** attempt))
+        if self.jitter:
+            return random.uniform(0, backoff)
+
+        return backoff
+
+
+def default_retry_policies():
+    return {
+        'get': RetryPolicy(),
+        'put': RetryPolicy(),
+        'delete': RetryPolicy(),
+        'post': RetryPolicy(require_idempotency_key=True),
+    }
+
+
+def parse_retry_after(value):
+    """Parses Retry-After header value (seconds or HTTP-date)."""
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    parsed = email.utils.parsedate_tz(value)
+    if parsed is None:
+        return None
+
+    return max(0.0, email.utils.mktime_tz(parsed) - time.time())
+
+
+class RetryBudget(object):
+    """Limits the total amount of retries issued by one client.
+
+    Within a sliding window of ``ttl`` seconds a client may retry at most
+    ``min_retries + ratio * <requests in the window>`` times, so a
+    degraded API doesn't get multiplied load from retries.
+    """
+
+    def __init__(self, ratio=0.2, min_retries=10, ttl=10.0):
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.ttl = ttl
+        self._requests = collections.deque()
+        self._retries = collections.deque()
+        self._lock = threading.Lock()
+
+    def _expire(self, now):
+        for q in (self._requests, self._retries):
+            while q and q[0] <= now - self.ttl:
+                q.popleft()
+
+    def deposit(self):
+        with self._lock:
+            now = time.time()
+            self._expire(now)
+            self._requests.append(now)
+
+    def try_withdraw(self):
+        with self._lock:
+            now = time.time()
+            self._expire(now)
+
+            allowed = self.min_retries + self.ratio * len(self._requests)
+            if len(self._retries) >= allowed:
+                return False
+
+            self._retries.append(now)
+            return True
+
+
+class ConnectionPrewarmer(object):
+    """Opens a keep-alive connection to the API in a background thread.
+
+    A HEAD request to the base URL makes the transport resolve the host
+    and complete TCP/TLS handshakes, so the first API call reuses a ready
+    connection from the pool.
+    """
+
+    def __init__(self, http_client):
+        self.http_client = http_client
+        self.elapsed = None
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _run(self):
+        client = self.http_client
+        start = time.time()
+        try:
+            client.crud_provider.request(
+                'HEAD',
+                client.base_url,
+                timeout=(client.connect_timeout, client.read_timeout),
+                allow_redirects=False,
+                **client.ssl_options
+            )
+        except Exception as e:
+            LOG.debug("Connection pre-warm to %s failed: %s",
+                      client.base_url, e)
+        finally:
+            self.elapsed = time.time() - start
+
+    def wait(self):
+        """Waits for the pre-warm to finish and reports time saved."""
+        start = time.time()
+        self._thread.join(self.http_client.connect_timeout)
+        waited = time.time() - start
+
+        if self.elapsed is not None:
+            LOG.debug(
+                "Connection pre-warm to %s took %.1fms, first request "
+                "waited %.1fms (saved %.1fms)",
+                self.http_client.base_url, self.elapsed * 1000,
+                waited * 1000, max(0.0, self.elapsed - waited) * 1000
+            )
+
+
 class HTTPClient(object):
     def __init__(self, base_url, **kwargs):
         self.base_url = base_url
         self.session = kwargs.pop('session', None)
+        transport = kwargs.pop(TRANSPORT, None)
+        if transport is not None:
+            # Any object implementing transport.Transport interface.
+            self.session = transport
         self.cacert = kwargs.get(CACERT)
         self.insecure = kwargs.get(INSECURE, False)
         self.ssl_options = {}
+        self.default_headers = dict(kwargs.get(HEADERS) or {})
+        self.connect_timeout = kwargs.get(
+            CONNECT_TIMEOUT, DEFAULT_CONNECT_TIMEOUT
+        )
+        self.read_timeout = kwargs.get(READ_TIMEOUT, DEFAULT_READ_TIMEOUT)
+        self.stream_read_timeout = kwargs.get(
+            STREAM_READ_TIMEOUT, DEFAULT_STREAM_READ_TIMEOUT
+        )
 
-        if self.session:
-            self.crud_provider = self.session
-        else:
-            self.crud_provider = requests
+        self.compress_threshold = kwargs.get(COMPRESS_THRESHOLD)
+        self.transfer_counters = metrics.Counters(
+            'request_bytes', 'request_wire_bytes',
+            'response_bytes', 'response_wire_bytes'
+        )
+
+        self.http_cache = kwargs.get(HTTP_CACHE)
+        if self.http_cache is True:
+            self.http_cache = httpcache.HTTPCache(
+                default_ttl=kwargs.get(HTTP_CACHE_TTL, 5.0)
+            )
+
+        self.resource_cache = kwargs.get(RESOURCE_CACHE)
+        if self.resource_cache is True:
+            self.resource_cache = rescache.ResourceCache(
+                max_entries=kwargs.get(RESOURCE_CACHE_SIZE, 1024),
+                ttl=kwargs.get(RESOURCE_CACHE_TTL, 10.0)
+            )
+
+        self.single_flight = None
+        if kwargs.get(COALESCE_REQUESTS, True):
+            self.single_flight = singleflight.SingleFlight()
+        # Part of the coalescing key, changed by every write so that
+        # a GET issued after it doesn't join a flight started before.
+        self._writes = itertools.count(1)
+        self._write_generation = 0
+
+        self.wire_logger = WireLogger(
+            max_body=kwargs.get(WIRE_LOG_MAX_BODY, 1024),
+            sample_rate=kwargs.get(WIRE_LOG_SAMPLE_RATE, 1.0),
+        )
+
+        self.retry_policies = kwargs.get(RETRY_POLICIES)
+        if self.retry_policies is None:
+            self.retry_policies = default_retry_policies()
+        self.retry_budget = kwargs.get(RETRY_BUDGET) or RetryBudget()
+        self.retry_counters = metrics.Counters(
+            'requests', 'retries', 'exhausted', 'budget_exhausted'
+        )
+
+        self.rate_limiter = kwargs.get(RATE_LIMITER)
+        if not self.rate_limiter and (kwargs.get(RATE_LIMIT) or
+                                      kwargs.get(RATE_LIMITS)):
+            self.rate_limiter = ratelimit.RateLimiter(
+                rate=kwargs.get(RATE_LIMIT),
+                burst=kwargs.get(RATE_LIMIT_BURST),
+                families=kwargs.get(RATE_LIMITS),
+            )
+
+        self.circuit_breakers = kwargs.get(CIRCUIT_BREAKER)
+        if self.circuit_breakers is None:
+            self.circuit_breakers = circuitbreaker.CircuitBreakerRegistry()
+
+        if self.session is requests:
+            # The bare requests module opens a new connection per call,
+            # use an own pooled keep-alive session instead.
+            self.session = None
 
         if self.base_url.startswith('https'):
             if self.cacert and not os.path.exists(self.cacert):
@@ -66,40 +530,442 @@ class HTTPClient(object):
                     kwargs.get(CERT_KEY)
                 )
 
+        if self.session:
+            self.crud_provider = self.session
+        else:
+            self.crud_provider = self._create_transport(**kwargs)
+
+        self._prewarmer = None
+        if kwargs.get(PREWARM):
+            self._prewarmer = ConnectionPrewarmer(self).start()
+
+    def _create_transport(self, **kwargs):
+        if kwargs.get(HTTP2):
+            # HTTP/2 is negotiated via ALPN, plain http stays on HTTP/1.1.
+            verify = http2.ssl_context(
+                insecure=kwargs.get(INSECURE, False),
+                cacert=kwargs.get(CACERT),
+                cert_file=kwargs.get(CERT_FILE),
+                key_file=kwargs.get(CERT_KEY),
+            )
+            return http2.HTTP2Transport(
+                verify=verify,
+                max_connections=(
+                    kwargs.get(POOL_MAXSIZE) or DEFAULT_POOL_MAXSIZE
+                ),
+            )
+
+        return mount_pooled_adapter(requests.Session(), **kwargs)
+
     @log_request
     def get(self, url, headers=None):
         options = self._get_request_options('get', headers)
 
-        return self.crud_provider.get(self.base_url + url, **options)
+        if not self.single_flight:
+            return self._get(url, options)
+
+        key = (
+            url,
+            tuple(sorted(options['headers'].items())),
+            self._write_generation
+        )
+        resp, shared = self.single_flight.do(
+            key, lambda: self._get(url, options)
+        )
+
+        # Every caller gets its own response object to parse.
+        return _copy_response(resp) if shared else resp
+
+    def _get(self, url, options):
+        if not self.http_cache:
+            return self._request('get', url, options)
+
+        entry = self.http_cache.lookup(url)
+        resp = self.http_cache.fresh_response(entry)
+        if resp is not None:
+            return resp
+
+        if entry is not None and entry.has_validators:
+            options['headers'] = dict(
+                options['headers'], **entry.conditional_headers()
+            )
+
+        generation = self.http_cache.generation()
+        resp = self._request('get', url, options)
+
+        return self.http_cache.update(url, resp, entry, generation)
+
+    def get_stream(self, url, headers=None):
+        """GET without reading the body, to be consumed with iter_content().
+
+        Bypasses the HTTP cache and request coalescing. The caller must
+        close the response.
+        """
+        options = self._get_request_options('get', headers)
+
+        return self._request('get', url, options, stream=True)
 
     @log_request
     def post(self, url, body, headers=None):
         options = self._get_request_options('post', headers)
 
-        return self.crud_provider.post(self.base_url + url,
-                                       data=body, **options)
+        return self._write('post', url, options, data=body)
 
     @log_request
-    def post_file(self, url, form_data, filename, file_or_data):
-        return self.crud_provider.post(
-            self.base_url + url,
-            data=form_data,
-            files={'file': (filename, file_or_data)}
+    def post_stream(self, url, body, headers=None):
+        """POST without reading the body, see get_stream().
+
+        The response is awaited for up to 'stream_read_timeout' seconds
+        between chunks.
+        """
+        options = self._get_request_options('post', headers)
+
+        return self._write(
+            'post', url, options, data=body, stream=True,
+            read_timeout=self.stream_read_timeout
+        )
+
+    @log_request
+    def post_file(self, url, form_data, filename, file_or_data,
+                  field='file'):
+        """Multipart POST of a file, e.g. an upload to be processed.
+
+        The response is awaited for up to 'stream_read_timeout' seconds.
+        """
+        options = self._get_request_options('post', None)
+        # Set by requests, along with the multipart boundary.
+        del options['headers']['content-type']
+
+        return self._write(
+            'post', url, options, data=form_data,
+            files={field: (filename, file_or_data)},
+            read_timeout=self.stream_read_timeout
         )
 
     @log_request
     def put(self, url, body, headers=None):
         options = self._get_request_options('put', headers)
 
-        return self.crud_provider.put(self.base_url + url,
-                                      data=body, **options)
+        return self._write('put', url, options, data=body)
 
     @log_request
     def delete(self, url, headers=None):
         options = self._get_request_options('delete', headers)
 
-        return self.crud_provider.delete(self.base_url + url,
-                                         **options)
+        return self._write('delete', url, options)
+
+    def _write(self, method, url, options, **kwargs):
+        """Sends a modifying request, evicting overlapping cached URLs.
+
+        They are evicted before sending and again once the response has
+        arrived, as a GET completed in the meantime may have cached the
+        state before the write.
+        """
+        self._invalidate_cache(url)
+        try:
+            return self._request(method, url, options, **kwargs)
+        finally:
+            self._invalidate_cache(url)
+
+    def _invalidate_cache(self, url):
+        self._write_generation = next(self._writes)
+        if self.http_cache:
+            self.http_cache.invalidate(url)
+        if self.resource_cache:
+            self.resource_cache.invalidate(url)
+
+    def _request(self, method, url, options, read_timeout=None, **kwargs):
+        send = getattr(self.crud_provider, method)
+
+        headers = dict(options.get('headers') or {})
+        if not any(k.lower() == 'accept-encoding' for k in headers):
+            headers['Accept-Encoding'] = ACCEPT_ENCODING
+        options = dict(options, headers=headers)
+
+        if kwargs.get('data') is not None:
+            kwargs['data'] = self._compress_body(kwargs['data'], headers)
+
+        policy = self._start_request(method, headers)
+
+        prewarmer, self._prewarmer = self._prewarmer, None
+        if prewarmer:
+            prewarmer.wait()
+
+        attempt = 0
+        while True:
+            breaker = None
+            if self.circuit_breakers:
+                breaker = self.circuit_breakers.before_request(url)
+
+            try:
+                if self.rate_limiter:
+                    self.rate_limiter.acquire(url)
+
+                resp = send(
+                    self.base_url + url,
+                    timeout=self.get_timeout(read_timeout),
+                    **dict(options, **kwargs)
+                )
+            except (requests.ConnectionError, requests.Timeout) as e:
+                delay = self._on_error(breaker, policy, attempt)
+                if delay is None:
+                    raise
+                reason = str(e)
+            except BaseException as e:
+                self._on_abort(breaker, e)
+                raise
+            else:
+                delay = self._on_response(breaker, policy, attempt, resp)
+                if delay is None:
+                    return resp
+                reason = 'HTTP %s' % resp.status_code
+                # Release the connection of a discarded streamed response.
+                resp.close()
+
+            attempt += 1
+            self._on_retry(method, url, policy, attempt, delay, reason)
+            time.sleep(delay)
+
+    def _start_request(self, method, headers):
+        """Accounts a new request and returns its retry policy or None."""
+        policy = self.retry_policies.get(method)
+        if policy and not policy.is_applicable(headers):
+            policy = None
+
+        self.retry_counters.incr('requests')
+        self.retry_budget.deposit()
+
+        return policy
+
+    def _on_error(self, breaker, policy, attempt):
+        """Handles a transport error, returns retry delay or None."""
+        if breaker:
+            breaker.record_failure()
+
+        return self._retry_delay(policy, attempt)
+
+    def _on_abort(self, breaker, error):
+        """Handles other errors, which are not retried."""
+        if not breaker:
+            return
+
+        # Broken responses count as failures, errors of the caller
+        # (deadline exceeded, interrupted) only end a half-open trial.
+        if isinstance(error, requests.RequestException):
+            breaker.record_failure()
+        else:
+            breaker.release()
+
+    def _on_response(self, breaker, policy, attempt, resp):
+        """Handles a response, returns retry delay or None."""
+        self._count_response(resp)
+
+        if breaker:
+            if resp.status_code >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+
+        if not policy or not policy.is_retryable_response(resp):
+            return None
+
+        return self._retry_delay(policy, attempt, resp)
+
+    def _on_retry(self, method, url, policy, attempt, delay, reason):
+        self.retry_counters.incr('retries')
+        LOG.debug(
+            "Retrying %s %s in %.2fs (attempt %d/%d): %s",
+            method.upper(), url, delay, attempt, policy.max_retries,
+            reason
+        )
+
+    def _compress_body(self, body, headers):
+        if not isinstance(body, (six.binary_type, six.text_type)):
+            return body
+
+        size = len(body)
+        self.transfer_counters.incr('request_bytes', size)
+
+        if self.compress_threshold is None or size < self.compress_threshold:
+            self.transfer_counters.incr('request_wire_bytes', size)
+            return body
+
+        compressed = gzip_body(body)
+        headers['Content-Encoding'] = 'gzip'
+        self.transfer_counters.incr('request_wire_bytes', len(compressed))
+        LOG.debug("Request body compressed %d -> %d bytes",
+                  size, len(compressed))
+
+        return compressed
+
+    def _count_response(self, resp):
+        if not getattr(resp, '_content_consumed', False):
+            # Streamed, don't read the body here.
+            return
+
+        size = len(resp.content or b'')
+        wire_size = _wire_size(resp)
+        if wire_size is None:
+            wire_size = size
+
+        resp.klab_wire_size = wire_size
+        self.transfer_counters.incr('response_bytes', size)
+        self.transfer_counters.incr('response_wire_bytes', wire_size)
+
+    def transfer_stats(self):
+        """Returns cumulative byte counters of request and response bodies.
+
+        '*_bytes' are sizes before compression (or after decompression),
+        '*_wire_bytes' are sizes actually transferred.
+        """
+        return self.transfer_counters.as_dict()
+
+    def _retry_delay(self, policy, attempt, resp=None):
+        """Returns seconds to sleep before the next attempt.
+
+        None means the request must not be retried.
+        """
+        if not policy:
+            return None
+
+        if attempt >= policy.max_retries:
+            self.retry_counters.incr('exhausted')
+            return None
+
+        delay = policy.get_backoff(attempt, resp)
+        left = deadline.remaining()
+        if left is not None and delay >= left:
+            # No time left for another attempt.
+            self.retry_counters.incr('exhausted')
+            return None
+
+        if not self.retry_budget.try_withdraw():
+            self.retry_counters.incr('budget_exhausted')
+            return None
+
+        return delay
+
+    def get_timeout(self, read_timeout=None):
+        """Returns (connect, read) timeout for the next request.
+
+        Both values are capped by the time left before the current
+        deadline (see klabclient.api.deadline).
+
+        :param read_timeout: used instead of the client's read timeout.
+        """
+        connect = self.connect_timeout
+        read = self.read_timeout if read_timeout is None else read_timeout
+
+        current = deadline.current()
+        if current is None:
+            return connect, read
+
+        current.check()
+        left = current.remaining()
+        if left is None:
+            return connect, read
+
+        return (
+            left if connect is None else min(connect, left),
+            left if read is None else min(read, left),
+        )
+
+    def retry_stats(self):
+        """Returns retry statistics.
+
+        :return: dict with 'requests', 'retries', 'exhausted' (max retries
+            reached) and 'budget_exhausted' (client retry budget spent)
+            counters.
+        """
+        return self.retry_counters.as_dict()
+
+    def pool_stats(self):
+        """Returns connection pool statistics of the transport.
+
+        Only adapters of type PooledHTTPAdapter are taken into account.
+        :return: dict with 'opened', 'reused' and 'dropped' counters.
+        """
+        result = {'opened': 0, 'reused': 0, 'dropped': 0}
+        adapters_map = getattr(self.crud_provider, 'adapters', {})
+
+        seen = set()
+        for adapter in adapters_map.values():
+            if not isinstance(adapter, PooledHTTPAdapter):
+                continue
+            if id(adapter) in seen:
+                continue
+            seen.add(id(adapter))
+
+            for k, v in adapter.counters.as_dict().items():
+                result[k] += v
+
+        return result
+
+    def rate_limit_stats(self):
+        """Returns rate limiter statistics or None if it's not configured.
+
+        :return: dict with 'requests', 'throttled' counters and 'waited'
+            (total seconds spent waiting for a token).
+        """
+        if not self.rate_limiter:
+            return None
+
+        return self.rate_limiter.stats()
+
+    def cache_stats(self):
+        """Returns HTTP cache statistics or None if it's disabled.
+
+        :return: dict with 'hits' (served by TTL), 'revalidated' (304),
+            'misses', 'bytes_saved', 'entries' and 'hit_ratio'.
+        """
+        if not self.http_cache:
+            return None
+
+        return self.http_cache.stats()
+
+    def resource_cache_stats(self):
+        """Returns resource cache statistics or None if it's disabled.
+
+        :return: dict with 'hits', 'misses', 'evictions' (LRU),
+            'invalidations' (by writes), 'entries', 'max_entries' and
+            'hit_ratio'.
+        """
+        if not self.resource_cache:
+            return None
+
+        return self.resource_cache.stats()
+
+    def coalesce_stats(self):
+        """Returns GET coalescing statistics.
+
+        :return: dict with 'calls' and 'collapsed' (requests which shared
+            an identical in-flight request instead of sending their own).
+        """
+        if not self.single_flight:
+            return {'calls': 0, 'collapsed': 0}
+
+        return self.single_flight.stats()
+
+    def circuit_state(self, url):
+        """Returns circuit breaker state for the given URL.
+
+        :return: one of 'closed', 'open', 'half-open'.
+        """
+        if not self.circuit_breakers:
+            return circuitbreaker.CLOSED
+
+        return self.circuit_breakers.state(url)
+
+    def circuit_stats(self):
+        """Returns state and failure count per URL template."""
+        if not self.circuit_breakers:
+            return {}
+
+        return self.circuit_breakers.stats()
+
+    def close(self):
+        if not self.session:
+            self.crud_provider.close()
 
     def _get_request_options(self, method, headers):
         headers = self._update_headers(headers)
@@ -117,4 +983,7 @@ class HTTPClient(object):
         if not headers:
             headers = {}
 
+        for k, v in self.default_headers.items():
+            headers.setdefault(k, v)
+
         return headers
@@ -0,0 +1,221 @@
+import codecs
+import json
+import re
+
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+# Ends a number or a literal (true, false, null).
+_TOKEN_END = re.compile(r'[^\w.+\-]')
+# Rest of a string up to its closing quote (or an escape cut by the end
+# of a chunk), and text of a container up to a bracket or an unclosed
+# string. Complete strings are skipped within a single match.
+_STRING_REST = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*', re.DOTALL)
+_CONTAINER_REST = re.compile(
+    r'[^"\[\]{}]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^"\[\]{}]*)*', re.DOTALL
+)
+
+_decoder = json.JSONDecoder()
+
+
+class ArrayDecoder(object):
+    """Incremental decoder of a JSON array.
+
+    Bytes are fed as they arrive, complete items are returned as soon as
+    they are decoded. Only the text of the current item is buffered.
+
+    An item split between chunks is parsed only once it is complete: its
+    nesting depth and string state are kept while the following chunks
+    are scanned, so decoding is linear in the input size however large
+    the items are.
+    """
+
+    def __init__(self):
+        self._text_decoder = codecs.getincrementaldecoder('utf-8')()
+        # '[' is expected first, then an item or ']', then ',' or ']'.
+        self._expect = '['
+        # Current item: 'token', 'string' or 'container', its text parts
+        # and scan state.
+        self._kind = None
+        self._parts = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    @property
+    def done(self):
+        return self._expect == ']'
+
+    def feed(self, chunk):
+        """Decodes a chunk of bytes, returns list of completed items."""
+        return self._decode(self._text_decoder.decode(chunk))
+
+    def close(self):
+        """Signals end of input.
+
+        :return: list of remaining items.
+        :raises ValueError: if the array is incomplete.
+        """
+        items = self._decode(self._text_decoder.decode(b'', final=True))
+
+        # Only a number or a literal may end with the input.
+        if self._kind == 'token':
+            items.append(self._finish_item())
+
+        if not self.done:
+            raise ValueError('Unexpected end of JSON array')
+
+        return items
+
+    def _decode(self, text):
+        items = []
+        pos = 0
+
+        while not self.done:
+            if self._kind is None:
+                pos = _WHITESPACE.match(text, pos).end()
+                if pos == len(text):
+                    break
+
+                char = text[pos]
+
+                if self._expect == '[':
+                    if char != '[':
+                        raise ValueError('JSON array expected')
+                    pos += 1
+                    self._expect = 'first'
+                    continue
+
+                if char == ']' and self._expect in ('first', ','):
+                    pos += 1
+                    self._expect = ']'
+                    break
+
+                if self._expect == ',':
+                    if char != ',':
+                        raise ValueError("Expecting ',' delimiter")
+                    pos += 1
+                    self._expect = 'item'
+                    continue
+
+                # Items complete in the text are parsed right away. A
+                # failed attempt costs at most the rest of this text, the
+                # item is then scanned until its end before parsing.
+                try:
+                    item, end = _decoder.raw_decode(text, pos)
+                except ValueError:
+                    pass
+                else:
+                    # A number is complete only if followed by a char
+                    # which can't continue it, e.g. not 1 of 1.5.
+                    if char in '"[{' or _TOKEN_END.match(text, end):
+                        items.append(item)
+                        self._expect = ','
+                        pos = end
+                        continue
+
+                start = pos
+                pos = self._start_item(char, pos)
+            else:
+                start = pos
+
+            end = self._scan(text, pos)
+            if end is None:
+                self._parts.append(text[start:])
+                break
+
+            self._parts.append(text[start:end])
+            items.append(self._finish_item())
+            pos = end
+
+        return items
+
+    def _start_item(self, char, pos):
+        """Starts an item at its first char, returns position to scan."""
+        if char == '"':
+            self._kind = 'string'
+            self._in_string = True
+            return pos + 1
+
+        if char in '[{':
+            self._kind = 'container'
+            self._depth = 1
+            return pos + 1
+
+        self._kind = 'token'
+        return pos
+
+    def _scan(self, text, pos):
+        """Scans the current item, returns its end in text or None."""
+        if self._kind == 'token':
+            match = _TOKEN_END.search(text, pos)
+            return match.start() if match else None
+
+        while True:
+            if self._escape:
+                if pos == len(text):
+                    return None
+                self._escape = False
+                pos += 1
+
+            if self._in_string:
+                pos = _STRING_REST.match(text, pos).end()
+                if pos == len(text):
+                    return None
+                pos += 1
+                if text[pos - 1] == '\\':
+                    # Escaped char is in the next chunk.
+                    self._escape = True
+                    continue
+                self._in_string = False
+                if self._depth == 0:
+                    return pos
+                continue
+
+            pos = _CONTAINER_REST.match(text, pos).end()
+            if pos == len(text):
+                return None
+            char = text[pos]
+            pos += 1
+            if char == '"':
+                self._in_string = True
+            elif char in '[{':
+                self._depth += 1
+            else:
+                self._depth -= 1
+                if self._depth == 0:
+                    return pos
+
+    def _finish_item(self):
+        text = ''.join(self._parts)
+        self._parts = []
+        self._kind = None
+        self._depth = 0
+
+        item, end = _decoder.raw_decode(text)
+        if end != len(text):
+            raise ValueError('Extra data in JSON array item: %r' % text)
+
+        self._expect = ','
+        return item
+
+
+def iter_array(chunks):
+    """Yields items of a JSON array as they are decoded.
+
+    Only the current item is held in memory, so the memory used doesn't
+    depend on the size of the whole array.
+
+    :param chunks: iterable of bytes (e.g. Response.iter_content()).
+    :raises ValueError: if the document is not a valid JSON array.
+    """
+    decoder = ArrayDecoder()
+
+    for chunk in chunks:
+        for item in decoder.feed(chunk):
+            yield item
+
+        if decoder.done:
+            return
+
+    for item in decoder.close():
+        yield item
@@ -0,0 +1,26 @@
+import threading
+
+
+class Counters(object):
+    """Thread-safe named counters used by the HTTP client components."""
+
+    def __init__(self, *names):
+        self._lock = threading.Lock()
+        self._values = dict((n, 0) for n in names)
+
+    def incr(self, name, value=1):
+        with self._lock:
+            self._values[name] = self._values.get(name, 0) + value
+
+    def get(self, name):
+        with self._lock:
+            return self._values.get(name, 0)
+
+    def reset(self):
+        with self._lock:
+            for k in self._values:
+                self._values[k] = 0
+
+    def as_dict(self):
+        with self._lock:
+            return dict(self._values)
@@ -5,6 +5,7 @@ from klabclient import utils
 
 class Model(base.Resource):
     resource_name = 'Model'
+    __slots__ = ()
 
 
 class ModelManager(base.ResourceManager):
@@ -51,6 +52,18 @@ class ModelManager(base.ResourceManager):
     def catalog(self, search=None, page=None, limit=None):
         return self._catalog('/catalog/mlmodel', search, page, limit)
 
+    def iter_catalog(self, search=None, limit=None, prefetch=1):
+        """Yields models of all catalog pages, see _iter_catalog()."""
+        return self._iter_catalog(
+            '/catalog/mlmodel', search, limit, prefetch
+        )
+
+    def catalog_columns(self, search=None, limit=None, prefetch=1):
+        """Returns all catalog pages as resourcelist.ResourceList."""
+        return self._catalog_columns(
+            '/catalog/mlmodel', search, limit, prefetch
+        )
+
     def list(self, workspace):
         return self._list(
             '/workspace/%s/mlmodel' % workspace, response_key=None
@@ -70,20 +83,20 @@ class ModelManager(base.ResourceManager):
         if confirm:
             url += '?confirm=%s' % confirm
 
-        self._delete(url)
+        return self._delete(url)
 
     def upload(self, workspace, name, version, path):
-        url = '%s/workspace/%s/mlmodel/%s/versions/%s/upload' % (
-            self.http_client.base_url, workspace, name, version
+        url = '/workspace/%s/mlmodel/%s/versions/%s/upload' % (
+            workspace, name, version
         )
 
         stream = utils.stream_targz(path)
-
-        resp = self.http_client.crud_provider.post(
-            url,
-            # data=form_data,
-            files={'model': ('%s.tar.gz' % name, stream)}
-        )
+        try:
+            resp = self.http_client.post_file(
+                url, None, '%s.tar.gz' % name, stream, field='model'
+            )
+        finally:
+            stream.close()
 
         if resp.status_code >= 400:
             self._raise_api_exception(resp)
@@ -4,6 +4,7 @@ from klabclient.api import base
 
 class Organization(base.Resource):
     resource_name = 'Organization'
+    __slots__ = ()
 
 
 class OrganizationManager(base.ResourceManager):
@@ -67,4 +68,4 @@ class OrganizationManager(base.ResourceManager):
         if confirm:
             url += '?confirm=%s' % confirm
 
-        self._delete(url)
+        return self._delete(url)
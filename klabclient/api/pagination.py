@@ -0,0 +1,83 @@
+import collections
+import threading
+
+from klabclient.api import deadline
+
+
+class Prefetch(object):
+    """Runs a function in a background thread.
+
+    The deadline active in the calling thread applies to the function.
+    """
+
+    def __init__(self, func, *args):
+        self._func = func
+        self._args = args
+        self._deadline = deadline.current()
+        self._result = None
+        self._error = None
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _run(self):
+        try:
+            if self._deadline is not None:
+                with self._deadline:
+                    self._result = self._func(*self._args)
+            else:
+                self._result = self._func(*self._args)
+        except Exception as e:
+            self._error = e
+
+    def result(self):
+        """Waits for the function, returns its result or re-raises."""
+        self._thread.join()
+
+        if self._error is not None:
+            raise self._error
+
+        return self._result
+
+
+def iter_pages(fetch_page, limit, prefetch=1, first_page=1):
+    """Yields items of all pages, fetching next pages in background.
+
+    Iteration stops at the first page shorter than ``limit``. Up to
+    ``prefetch`` pages ahead of the one being consumed are requested
+    concurrently, 0 fetches pages one by one in the calling thread.
+
+    :param fetch_page: callable(page, limit) returning a list of items.
+    """
+    pending = collections.deque()
+    page = first_page
+    previous = None
+
+    while True:
+        if prefetch:
+            while len(pending) <= prefetch:
+                pending.append(Prefetch(fetch_page, page, limit))
+                page += 1
+            items = pending.popleft().result()
+        else:
+            items = fetch_page(page, limit)
+            page += 1
+
+        if not items:
+            return
+
+        # Guard against an API ignoring the page parameter.
+        first = _item_data(items[0])
+        if previous is not None and first == previous:
+            return
+        previous = first
+
+        for item in items:
+            yield item
+
+        if len(items) < limit:
+            return
+
+
+def _item_data(item):
+    return getattr(item, '_data', item)
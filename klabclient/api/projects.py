@@ -4,6 +4,7 @@ from klabclient.api import base
 
 class Project(base.Resource):
     resource_name = 'Project'
+    __slots__ = ()
 
     # "ID": "4121",
     # "Name": "go-kuberlab",
@@ -82,4 +83,4 @@ class ProjectManager(base.ResourceManager):
     def delete(self, workspace, name):
         self._ensure_not_empty(workspace=workspace, name=name)
 
-        self._delete('/workspace/%s/projects/%s' % (workspace, name))
+        return self._delete('/workspace/%s/projects/%s' % (workspace, name))
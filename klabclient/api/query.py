@@ -0,0 +1,112 @@
+import bisect
+import time
+
+import six
+
+
+_MISSING = object()
+
+
+class Query(object):
+    """Indexed lookups over a listing of resources.
+
+    Hash indexes are built on first lookup by an attribute and reused by
+    the following ones, so repeated lookups don't rescan the listing.
+    Attributes with unhashable values (lists, dicts) are scanned.
+
+        q = client.apps.query('my-workspace')
+        app = q.get(Name='styles-set')
+        tf_apps = q.prefix('Name', 'tf-')
+    """
+
+    def __init__(self, items):
+        self.items = list(items)
+        self.created_at = time.time()
+        self._indexes = {}
+        self._sorted = {}
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def _index(self, attr):
+        index = self._indexes.get(attr)
+        if index is not None:
+            return index
+
+        index = {}
+        try:
+            for item in self.items:
+                value = getattr(item, attr, _MISSING)
+                if value is not _MISSING:
+                    index.setdefault(value, []).append(item)
+        except TypeError:
+            # Unhashable values.
+            index = False
+
+        self._indexes[attr] = index
+        return index
+
+    def _lookup(self, attr, value):
+        index = self._index(attr)
+        if index is False:
+            return [
+                i for i in self.items
+                if getattr(i, attr, _MISSING) == value
+            ]
+
+        try:
+            return index.get(value, [])
+        except TypeError:
+            return []
+
+    def filter(self, **kwargs):
+        """Returns items whose attributes equal all given values."""
+        if not kwargs:
+            return list(self.items)
+
+        candidates = None
+        for attr, value in kwargs.items():
+            matched = self._lookup(attr, value)
+            if not matched:
+                return []
+            if candidates is None or len(matched) < len(candidates):
+                candidates = matched
+
+        if len(kwargs) == 1:
+            return list(candidates)
+
+        return [
+            i for i in candidates
+            if all(getattr(i, a, _MISSING) == v for a, v in kwargs.items())
+        ]
+
+    def get(self, **kwargs):
+        """Returns the first matching item or None."""
+        found = self.filter(**kwargs)
+
+        return found[0] if found else None
+
+    def prefix(self, attr, prefix):
+        """Returns items whose string attribute starts with prefix."""
+        keys = self._sorted.get(attr)
+        if keys is None:
+            keys = sorted(
+                (value, n)
+                for n, value in enumerate(
+                    getattr(i, attr, None) for i in self.items
+                )
+                if isinstance(value, six.string_types)
+            )
+            self._sorted[attr] = keys
+
+        start = bisect.bisect_left(keys, (prefix, -1))
+        result = []
+        for value, n in keys[start:]:
+            if not value.startswith(prefix):
+                break
+            result.append(self.items[n])
+
+        return result
@@ -0,0 +1,127 @@
+import fnmatch
+import threading
+import time
+
+from klabclient.api import metrics
+
+
+class TokenBucket(object):
+    """Thread-safe token bucket.
+
+    :param rate: tokens added per second.
+    :param burst: bucket capacity, defaults to max(1, rate).
+    """
+
+    def __init__(self, rate, burst=None):
+        if rate <= 0:
+            raise ValueError('Rate must be positive, got %s.' % rate)
+
+        self.rate = float(rate)
+        self.burst = float(burst or max(1.0, self.rate))
+        self._tokens = self.burst
+        self._updated = time.time()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        elapsed = max(0.0, now - self._updated)
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def reserve(self):
+        """Takes a token and returns seconds to wait before using it.
+
+        Tokens may go negative, in which case the caller is queued behind
+        previous reservations instead of failing.
+        """
+        with self._lock:
+            self._refill(time.time())
+            self._tokens -= 1
+
+            if self._tokens >= 0:
+                return 0.0
+
+            return -self._tokens / self.rate
+
+    def acquire(self):
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+        return delay
+
+
+class RateLimiter(object):
+    """Client-side rate limiter shared by all resource managers.
+
+    Requests wait (never fail) until both the global bucket and the bucket
+    of the matching endpoint family allow them.
+
+    :param rate: global requests per second, None means unlimited.
+    :param burst: global bucket capacity.
+    :param families: dict or list of (pattern, rate) pairs. Pattern is a
+        shell-style mask matched against URL path, e.g.
+        '/catalog/*' or '/workspace/*/application/*'. The first matching
+        pattern is used. Rate may also be a (rate, burst) tuple.
+    """
+
+    def __init__(self, rate=None, burst=None, families=None):
+        self.bucket = TokenBucket(rate, burst) if rate else None
+        self.families = []
+        self.counters = metrics.Counters('requests', 'throttled')
+        self._wait_lock = threading.Lock()
+        self._waited = 0.0
+
+        if isinstance(families, dict):
+            families = families.items()
+
+        for pattern, family_rate in families or []:
+            if isinstance(family_rate, (list, tuple)):
+                bucket = TokenBucket(*family_rate)
+            else:
+                bucket = TokenBucket(family_rate)
+            self.families.append((pattern, bucket))
+
+    def _family_bucket(self, url):
+        path = url.split('?', 1)[0]
+        for pattern, bucket in self.families:
+            if fnmatch.fnmatchcase(path, pattern):
+                return bucket
+
+        return None
+
+    def reserve(self, url):
+        """Reserves a request slot for the URL without blocking.
+
+        :return: seconds the caller has to wait before sending.
+        """
+        self.counters.incr('requests')
+
+        delay = 0.0
+        for bucket in (self.bucket, self._family_bucket(url)):
+            if bucket is not None:
+                delay = max(delay, bucket.reserve())
+
+        if delay > 0:
+            self.counters.incr('throttled')
+            with self._wait_lock:
+                self._waited += delay
+
+        return delay
+
+    def acquire(self, url):
+        """Blocks until a request to the given URL is allowed.
+
+        :return: seconds spent waiting.
+        """
+        delay = self.reserve(url)
+        if delay > 0:
+            time.sleep(delay)
+
+        return delay
+
+    def stats(self):
+        result = self.counters.as_dict()
+        with self._wait_lock:
+            result['waited'] = self._waited
+
+        return result
@@ -0,0 +1,95 @@
+import collections
+import threading
+import time
+
+from klabclient.api import httpcache
+from klabclient.api import metrics
+
+
+class ResourceCache(object):
+    """LRU cache of successful GET responses used by resource managers.
+
+    Unlike HTTPCache, entries are served for ``ttl`` seconds without
+    asking the server, whatever the response headers say. Every write
+    through the client drops entries of overlapping URLs (see
+    httpcache.overlaps), e.g. an app update evicts the app and the
+    workspace application list, and keeps a response of a GET started
+    before the write from being stored.
+
+    :param max_entries: max number of cached URLs.
+    :param ttl: seconds an entry is served for.
+    """
+
+    def __init__(self, max_entries=1024, ttl=10.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.counters = metrics.Counters(
+            'hits', 'misses', 'evictions', 'invalidations'
+        )
+        self._entries = collections.OrderedDict()
+        self._invalidations = httpcache.InvalidationLog()
+        self._lock = threading.Lock()
+
+    def generation(self):
+        """Returns the token to pass to put() for a new request."""
+        with self._lock:
+            return self._invalidations.generation()
+
+    def get(self, url):
+        """Returns a cached response for the URL or None."""
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None and not entry.is_fresh():
+                del self._entries[url]
+                entry = None
+
+            if entry is None:
+                self.counters.incr('misses')
+                return None
+
+            self._entries.pop(url)
+            self._entries[url] = entry
+
+        self.counters.incr('hits')
+
+        return entry.to_response()
+
+    def put(self, url, resp, generation=None):
+        """Stores the response of a GET.
+
+        :param generation: generation() taken before sending the request.
+        """
+        entry = httpcache.CacheEntry(resp, time.time() + self.ttl)
+
+        with self._lock:
+            if self._invalidations.modified_since(url, generation):
+                return
+
+            self._entries.pop(url, None)
+            self._entries[url] = entry
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.counters.incr('evictions')
+
+    def invalidate(self, url):
+        with self._lock:
+            self._invalidations.record(url)
+            for key in list(self._entries):
+                if httpcache.overlaps(key, url):
+                    del self._entries[key]
+                    self.counters.incr('invalidations')
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        result = self.counters.as_dict()
+        total = result['hits'] + result['misses']
+
+        result['entries'] = len(self._entries)
+        result['max_entries'] = self.max_entries
+        result['hit_ratio'] = float(result['hits']) / total if total else 0.0
+
+        return result
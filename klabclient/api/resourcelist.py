@@ -0,0 +1,222 @@
+import collections
+
+from oslo_utils import importutils
+import six
+
+
+numpy = importutils.try_import('numpy')
+
+_NUMERIC = frozenset(six.integer_types + (float,))
+
+
+def _make_column(values):
+    """Returns NumPy array of numeric or boolean values, list otherwise."""
+    if numpy is None or not values:
+        return values
+
+    types = set(type(v) for v in values)
+    if types <= _NUMERIC or types == {bool}:
+        try:
+            array = numpy.asarray(values)
+        except (OverflowError, ValueError):
+            return values
+        # E.g. integers over 64 bits.
+        if array.dtype != object:
+            return array
+
+    return values
+
+
+def _is_array(column):
+    return numpy is not None and isinstance(column, numpy.ndarray)
+
+
+def _take(column, indices):
+    if _is_array(column):
+        return column[numpy.asarray(indices, dtype=numpy.intp)]
+
+    return [column[i] for i in indices]
+
+
+def _sort_key(value):
+    # None goes last instead of failing comparison.
+    return (value is None, value)
+
+
+class ResourceList(object):
+    """Columnar listing of resources.
+
+    Keeps the JSON records of a listing and builds a column per field on
+    first use: a NumPy array for numeric and boolean fields if numpy is
+    installed, a list otherwise. Filtering, sorting, grouping and
+    projection work on columns and return ResourceLists sharing the
+    records. Resources are built only when rows are accessed.
+
+        tasks = client.app_tasks.list('ws', 'app', columnar=True)
+        failed = tasks.filter(status='Failed').sort('start_time')
+        failed.columns('name', 'build')
+        failed[0].logs(pod)                     # AppTask
+        for name, builds in tasks.group_by('name').items():
+            print(name, len(builds))
+
+    :param manager: manager of the row resources.
+    :param records: list of dicts.
+    :param resource_class: class of the rows, the manager's by default.
+    :param row_attrs: attributes set on every row resource.
+    """
+
+    def __init__(self, manager, records, resource_class=None,
+                 row_attrs=None):
+        self.manager = manager
+        self.records = list(records)
+        self.resource_class = resource_class or manager.resource_class
+        self.row_attrs = row_attrs or {}
+        self._columns = {}
+
+    def __len__(self):
+        return len(self.records)
+
+    def __iter__(self):
+        for n in range(len(self.records)):
+            yield self.row(n)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.take(range(*index.indices(len(self))))
+
+        return self.row(index)
+
+    def __repr__(self):
+        return '<ResourceList %s x %d>' % (
+            self.resource_class.resource_name, len(self)
+        )
+
+    def row(self, index):
+        """Returns the resource of a row."""
+        resource = self.resource_class(self.manager, self.records[index])
+        for name, value in self.row_attrs.items():
+            setattr(resource, name, value)
+
+        return resource
+
+    def rows(self):
+        """Returns list of resources, same as the non-columnar listing."""
+        return list(self)
+
+    def column(self, name):
+        """Returns values of a field, None where it's missing."""
+        column = self._columns.get(name)
+        if column is None:
+            column = _make_column([r.get(name) for r in self.records])
+            self._columns[name] = column
+
+        return column
+
+    def columns(self, *names):
+        """Returns OrderedDict of the field columns (projection)."""
+        return collections.OrderedDict(
+            (name, self.column(name)) for name in names
+        )
+
+    def tuples(self, *names):
+        """Returns list of row tuples of the fields, e.g. for a Lister."""
+        columns = [self.column(name) for name in names]
+        return [
+            tuple(c[n] for c in columns) for n in range(len(self))
+        ]
+
+    def take(self, indices):
+        """Returns ResourceList of the rows at indices."""
+        if _is_array(indices):
+            indices = indices.tolist()
+        else:
+            indices = list(indices)
+
+        result = ResourceList(
+            self.manager,
+            [self.records[i] for i in indices],
+            self.resource_class,
+            self.row_attrs
+        )
+        result._columns = dict(
+            (name, _take(column, indices))
+            for name, column in self._columns.items()
+        )
+
+        return result
+
+    def filter(self, mask=None, **kwargs):
+        """Returns rows selected by mask and equal to all given values.
+
+        :param mask: sequence of booleans, one per row, e.g. a NumPy
+            comparison ``lst.column('Stars') > 10``.
+        :param kwargs: field values, compared column-wise.
+        """
+        masks = [] if mask is None else [mask]
+        for name, value in kwargs.items():
+            column = self.column(name)
+            if _is_array(column):
+                matched = column == value
+                if not _is_array(matched):
+                    # Incomparable types, e.g. a string and numbers.
+                    matched = numpy.full(len(column), bool(matched))
+                masks.append(matched)
+            else:
+                masks.append([v == value for v in column])
+
+        for m in masks:
+            if len(m) != len(self):
+                raise ValueError(
+                    'Mask length %d does not match %d rows'
+                    % (len(m), len(self))
+                )
+
+        if not masks:
+            return self.take(range(len(self)))
+
+        if numpy is not None and any(_is_array(m) for m in masks):
+            selected = numpy.logical_and.reduce(
+                [numpy.asarray(m, dtype=bool) for m in masks]
+            )
+            return self.take(numpy.flatnonzero(selected))
+
+        return self.take(
+            n for n, flags in enumerate(zip(*masks)) if all(flags)
+        )
+
+    def sort(self, *names, **kwargs):
+        """Returns rows sorted by the fields, stable.
+
+        :param reverse: sort in descending order.
+        """
+        reverse = kwargs.get('reverse', False)
+        columns = [self.column(name) for name in names]
+
+        if (columns and not reverse
+                and all(_is_array(c) for c in columns)):
+            # lexsort takes the primary key last.
+            return self.take(numpy.lexsort(columns[::-1]))
+
+        indices = sorted(
+            range(len(self)),
+            key=lambda n: tuple(_sort_key(c[n]) for c in columns),
+            reverse=reverse
+        )
+        return self.take(indices)
+
+    def group_by(self, name):
+        """Returns OrderedDict of field value to ResourceList of its rows.
+
+        Groups are in order of first occurrence.
+        """
+        column = self.column(name)
+        if _is_array(column):
+            column = column.tolist()
+
+        groups = collections.OrderedDict()
+        for n, value in enumerate(column):
+            groups.setdefault(value, []).append(n)
+
+        return collections.OrderedDict(
+            (value, self.take(indices)) for value, indices in groups.items()
+        )
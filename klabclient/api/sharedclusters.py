@@ -5,6 +5,7 @@ from klabclient import exceptions
 
 class SharedCluster(base.Resource):
     resource_name = 'SharedCluster'
+    __slots__ = ()
 
     # "ID": "221",
     # "DisplayName": "testshare",
@@ -68,9 +69,11 @@ class SharedClusterManager(base.ResourceManager):
     def delete_available(self, workspace, id):
         self._ensure_not_empty(workspace=workspace, id=id)
 
-        self._delete('/sharedclusters/available/%s/%s' % (workspace, id))
+        return self._delete(
+            '/sharedclusters/available/%s/%s' % (workspace, id)
+        )
 
     def delete_own(self, id):
         self._ensure_not_empty(id=id)
 
-        self._delete('/sharedclusters/own/%s' % id)
+        return self._delete('/sharedclusters/own/%s' % id)
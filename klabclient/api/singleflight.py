@@ -0,0 +1,100 @@
+import copy
+import threading
+
+import six
+
+from klabclient.api import deadline
+from klabclient.api import metrics
+
+
+class _Call(object):
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+        # The leader's deadline.
+        self.deadline = deadline.current()
+
+
+def copy_error(error):
+    """Returns a copy of the leader's exception to raise in a follower.
+
+    Raising the same instance in every follower would chain all their
+    tracebacks onto it. Exceptions which can't be copied are returned
+    as is.
+    """
+    try:
+        return copy.copy(error)
+    except Exception:
+        return error
+
+
+def leader_timed_out(leader_deadline):
+    """Tells whether a failed call ran out of the leader's time only.
+
+    The error is then not the follower's, which should call again
+    unless its own deadline has passed as well.
+    """
+    if leader_deadline is None or not leader_deadline.expired():
+        return False
+
+    own = deadline.current()
+    return own is None or not own.expired()
+
+
+class SingleFlight(object):
+    """Collapses concurrent calls with the same key into one.
+
+    The first caller (leader) runs the function, callers arriving while
+    it is in flight wait for and share its result. Followers raise a
+    copy of the leader's exception, caused by the original. A follower
+    stops waiting at its own deadline (see klabclient.api.deadline),
+    the leader's call goes on. If the call fails because the leader's
+    deadline has passed, followers with time left call again.
+    """
+
+    def __init__(self):
+        self.counters = metrics.Counters('calls', 'collapsed')
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func):
+        """Runs func once per in-flight key.
+
+        :return: tuple (result, shared), shared is True for followers.
+        """
+        self.counters.incr('calls')
+
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+                leader = call is None
+                if leader:
+                    call = self._calls[key] = _Call()
+
+            if leader:
+                break
+
+            self.counters.incr('collapsed')
+            while not call.event.wait(deadline.remaining()):
+                deadline.current().check()
+
+            if call.error is None:
+                return call.result, True
+            if not leader_timed_out(call.deadline):
+                six.raise_from(copy_error(call.error), call.error)
+
+        try:
+            call.result = func()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+
+        return call.result, False
+
+    def stats(self):
+        return self.counters.as_dict()
@@ -4,6 +4,7 @@ from klabclient.api import base
 
 class Storage(base.Resource):
     resource_name = 'Storage'
+    __slots__ = ()
 
 
 class StorageManager(base.ResourceManager):
@@ -0,0 +1,100 @@
+import abc
+import json
+
+import requests
+from requests import structures
+import six
+
+
+@six.add_metaclass(abc.ABCMeta)
+class Transport(object):
+    """Interface expected from HTTPClient.crud_provider.
+
+    It is the subset of requests.Session API used by the client, so a
+    requests.Session (or the requests module) is a valid transport too.
+    Methods accept requests keyword arguments (headers, data, files,
+    timeout, verify, cert, stream) and return requests.Response.
+    """
+
+    @abc.abstractmethod
+    def request(self, method, url, **kwargs):
+        raise NotImplementedError
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request('PUT', url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request('DELETE', url, **kwargs)
+
+    def close(self):
+        pass
+
+
+def make_response(request, status_code=200, body=None, headers=None):
+    """Builds requests.Response for the prepared request.
+
+    Body may be bytes, text or any JSON serializable object.
+    """
+    headers = dict(headers or {})
+
+    if body is None:
+        content = b''
+    elif isinstance(body, six.binary_type):
+        content = body
+    elif isinstance(body, six.text_type):
+        content = body.encode('utf-8')
+    else:
+        content = json.dumps(body).encode('utf-8')
+        headers.setdefault('Content-Type', 'application/json')
+
+    resp = requests.Response()
+    resp.status_code = status_code
+    resp._content = content
+    resp._content_consumed = True
+    resp.headers = structures.CaseInsensitiveDict(headers)
+    resp.encoding = 'utf-8'
+    resp.url = request.url
+    resp.request = request
+
+    return resp
+
+
+class InProcessTransport(Transport):
+    """Transport dispatching requests to a Python callable.
+
+    No sockets are involved, which allows measuring the client's own
+    overhead or simulating an API in tests and load simulations.
+
+    :param handler: callable taking requests.PreparedRequest and returning
+        either requests.Response, a (status_code, body[, headers]) tuple
+        or a JSON serializable body for a 200 response.
+    """
+
+    def __init__(self, handler):
+        self.handler = handler
+
+    def request(self, method, url, **kwargs):
+        request = requests.Request(
+            method=method.upper(),
+            url=url,
+            headers=kwargs.get('headers'),
+            data=kwargs.get('data'),
+            files=kwargs.get('files'),
+            json=kwargs.get('json'),
+        ).prepare()
+
+        result = self.handler(request)
+
+        if isinstance(result, requests.Response):
+            return result
+
+        if isinstance(result, tuple):
+            return make_response(request, *result)
+
+        return make_response(request, body=result)
@@ -0,0 +1,157 @@
+"""Copy-on-write views of resource data.
+
+A view reads straight from the data it wraps. Nested dicts and lists are
+returned as views too. The first modification of a view copies only the
+container being modified (and its parents, to link the copy in), the
+wrapped data itself is never changed:
+
+    view = app.view()
+    view['Configuration']['spec']['tasks'] = []  # copies 3 dicts
+    app.Configuration['spec']['tasks']           # unchanged
+"""
+
+import copy
+
+try:
+    from collections import abc as collections_abc
+except ImportError:  # Python 2
+    import collections as collections_abc
+
+
+def view(obj):
+    """Wraps dict or list in a view, other values are returned as is."""
+    if isinstance(obj, dict):
+        return DictView(obj)
+    if isinstance(obj, list):
+        return ListView(obj)
+
+    return obj
+
+
+class _View(object):
+    __slots__ = ('_source', '_copy', '_children', '_parent', '_key')
+
+    def __init__(self, source, parent=None, key=None):
+        self._source = source
+        self._copy = None
+        self._children = None
+        self._parent = parent
+        self._key = key
+
+    @property
+    def copied(self):
+        """Whether the view holds its own copy of the data."""
+        return self._copy is not None
+
+    def _target(self):
+        return self._source if self._copy is None else self._copy
+
+    def _wrap(self, key, value):
+        if not isinstance(value, (dict, list)):
+            return value
+
+        if self._children is None:
+            self._children = {}
+
+        child = self._children.get(key)
+        if child is None or child._target() is not value:
+            cls = DictView if isinstance(value, dict) else ListView
+            child = cls(value, self, key)
+            self._children[key] = child
+
+        return child
+
+    def _materialize(self):
+        if self._copy is not None:
+            return self._copy
+
+        parent = self._parent
+        if parent is not None:
+            try:
+                linked = parent._target()[self._key] is self._source
+            except (KeyError, IndexError):
+                linked = False
+
+            if linked:
+                parent._materialize()[self._key] = self._copy = (
+                    copy.copy(self._source)
+                )
+                return self._copy
+
+        self._copy = copy.copy(self._source)
+        return self._copy
+
+    def to_plain(self):
+        """Returns a deep copy of the data as plain dicts and lists."""
+        return copy.deepcopy(self._target())
+
+    def __deepcopy__(self, memo):
+        return self.to_plain()
+
+    def __copy__(self):
+        return view(self._target())
+
+    def __repr__(self):
+        return '%s(%r)' % (self.__class__.__name__, self._target())
+
+
+class DictView(_View, collections_abc.MutableMapping):
+    """Copy-on-write view of a dict."""
+
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        return self._wrap(key, self._target()[key])
+
+    def __setitem__(self, key, value):
+        self._materialize()[key] = value
+
+    def __delitem__(self, key):
+        del self._materialize()[key]
+
+    def __iter__(self):
+        return iter(self._target())
+
+    def __len__(self):
+        return len(self._target())
+
+    def __contains__(self, key):
+        return key in self._target()
+
+
+class ListView(_View, collections_abc.MutableSequence):
+    """Copy-on-write view of a list."""
+
+    __slots__ = ()
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        return self._wrap(index, self._target()[index])
+
+    def __setitem__(self, index, value):
+        self._materialize()[index] = value
+
+    def __delitem__(self, index):
+        self._children = None
+        del self._materialize()[index]
+
+    def insert(self, index, value):
+        self._children = None
+        self._materialize().insert(index, value)
+
+    def __len__(self):
+        return len(self._target())
+
+    def __eq__(self, other):
+        if isinstance(other, (list, ListView)):
+            return list(self) == list(other)
+
+        return NotImplemented
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = None
@@ -4,6 +4,7 @@ from klabclient.api import base
 
 class Workspace(base.Resource):
     resource_name = 'Workspace'
+    __slots__ = ()
 
 
 class WorkspaceManager(base.ResourceManager):
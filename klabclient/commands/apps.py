@@ -254,6 +254,11 @@ class Catalog(charts.Catalog):
         client = self.app.client
         return client.apps.catalog
 
+    @property
+    def _iter_catalog_function(self):
+        client = self.app.client
+        return client.apps.iter_catalog
+
     def _get_format_function(self):
         return format_catalog_app
 
@@ -552,8 +557,7 @@ class ConfigTask(command.Command):
         app = klab_client.apps.get(args.workspace, args.app)
 
         t = app.get_config_task(args.name)
-        t_dict = t.to_dict()
-        self.app.stdout.write(t_dict['config'])
+        self.app.stdout.write(t.config_raw)
         self.app.stdout.write('\n')
 
 
@@ -736,7 +740,7 @@ class ConfigTaskSet(command.Command):
 
         updated_app = app.set_config_task(config)
         task_config = updated_app.get_config_task(config['name'])
-        self.app.stdout.write(task_config.to_dict()['config'])
+        self.app.stdout.write(task_config.config_raw)
 
 
 class SetConfig(command.Command):
@@ -1,11 +1,17 @@
 
 import abc
+import itertools
 import os
 import textwrap
 
 from cliff import lister
 import six
 
+try:
+    from collections import abc as collections_abc
+except ImportError:  # Python 2
+    import collections as collections_abc
+
 from klabclient import exceptions
 
 
@@ -33,6 +39,14 @@ class KuberlabLister(lister.Lister):
         f = self._get_format_function()
 
         ret = self._get_resources(args)
+        if isinstance(ret, collections_abc.Iterator):
+            # Stream rows of generators as they arrive.
+            first = next(ret, None)
+            if first is None:
+                return f()
+            rows = (f(r)[1] for r in itertools.chain([first], ret))
+            return f(first)[0], rows
+
         if not isinstance(ret, list):
             ret = [ret]
 
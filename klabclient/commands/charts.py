@@ -12,6 +12,8 @@ from klabclient import utils
 
 urllib = moves.urllib.request
 
+DEFAULT_CATALOG_LIMIT = 10
+
 
 def format_list(chart=None):
     return format(chart, lister=True)
@@ -136,16 +138,40 @@ class Catalog(base.KuberlabLister):
         parser.add_argument(
             '--limit',
             metavar='<int>',
-            default=10,
-            help='Limit response.'
+            type=int,
+            help='Limit response (default %d). Page size with --all.'
+                 % DEFAULT_CATALOG_LIMIT
+        )
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='List all pages, next pages are requested in background'
+                 ' while the current one is printed.'
+        )
+        parser.add_argument(
+            '--prefetch',
+            metavar='<int>',
+            type=int,
+            default=1,
+            help='Number of pages requested ahead with --all.'
         )
         return parser
 
+    @property
+    def _iter_catalog_function(self):
+        klab_client = self.app.client
+        return klab_client.charts.iter_catalog
+
     def _get_resources(self, args):
+        if args.all:
+            return self._iter_catalog_function(
+                args.search, args.limit, args.prefetch
+            )
+
         return self._catalog_function(
             args.search,
             args.page,
-            args.limit
+            args.limit or DEFAULT_CATALOG_LIMIT
         )
 
 
@@ -162,11 +188,16 @@ class List(Catalog):
     def _get_resources(self, args):
         klab_client = self.app.client
 
+        if args.all:
+            return klab_client.charts.iter_list(
+                args.workspace, args.search, args.limit, args.prefetch
+            )
+
         return klab_client.charts.list(
             args.workspace,
             args.search,
             args.page,
-            args.limit
+            args.limit or DEFAULT_CATALOG_LIMIT
         )
 
 
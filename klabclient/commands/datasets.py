@@ -9,3 +9,8 @@ class Catalog(models.Catalog):
     def _catalog_function(self):
         client = self.app.client
         return client.datasets.catalog
+
+    @property
+    def _iter_catalog_function(self):
+        client = self.app.client
+        return client.datasets.iter_catalog
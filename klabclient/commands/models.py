@@ -62,6 +62,11 @@ class Catalog(charts.Catalog):
         client = self.app.client
         return client.models.catalog
 
+    @property
+    def _iter_catalog_function(self):
+        client = self.app.client
+        return client.models.iter_catalog
+
     def _get_format_function(self):
         return format_list
 
@@ -33,3 +33,18 @@ class IllegalArgumentException(KuberlabClientException):
     def __init__(self, message=None):
         if message:
             self.message = message
+
+
+class CircuitOpenException(KuberlabClientException):
+    message = "Circuit breaker is open"
+    code = "CIRCUIT_OPEN"
+
+    def __init__(self, message=None, retry_after=None):
+        if message:
+            self.message = message
+        self.retry_after = retry_after
+
+
+class DeadlineExceeded(TimeoutError):
+    message = "Operation deadline exceeded"
+    code = "DEADLINE_EXCEEDED"
@@ -4,6 +4,7 @@ Command-line interface to the Kuberlab APIs
 """
 
 import argparse
+import hashlib
 import logging
 import os
 from os import path
@@ -16,6 +17,9 @@ import yaml
 
 import klabclient
 from klabclient.api import client
+from klabclient.api import deadline
+from klabclient.api import diskcache
+from klabclient.api import httpclient
 from klabclient.commands import app_tasks
 from klabclient.commands import apps
 from klabclient.commands import charts
@@ -238,6 +242,53 @@ class KuberlabShell(app.App):
                  '(Env: KUBERLAB_CLIENT_INSECURE)'
         )
 
+        parser.add_argument(
+            '--rate-limit',
+            action='store',
+            dest='rate_limit',
+            type=float,
+            default=env('KUBERLAB_RATE_LIMIT') or None,
+            help='Max API requests per second, requests over the limit'
+                 ' wait for their turn. (Env: KUBERLAB_RATE_LIMIT)'
+        )
+
+        parser.add_argument(
+            '--timeout',
+            action='store',
+            dest='timeout',
+            type=float,
+            default=env('KUBERLAB_TIMEOUT') or None,
+            help='Overall time budget of a command in seconds, shared by'
+                 ' all API requests it makes. (Env: KUBERLAB_TIMEOUT)'
+        )
+
+        parser.add_argument(
+            '--prewarm',
+            action='store_true',
+            dest='prewarm',
+            default=env('KUBERLAB_PREWARM', default=False),
+            help='Opens the API connection in background while the command'
+                 ' is being prepared. (Env: KUBERLAB_PREWARM)'
+        )
+
+        parser.add_argument(
+            '--no-cache',
+            action='store_true',
+            dest='no_cache',
+            default=env('KUBERLAB_NO_CACHE', default=False),
+            help='Disables the on-disk cache of workspaces, clusters,'
+                 ' storage, destinations and chart versions.'
+                 ' (Env: KUBERLAB_NO_CACHE)'
+        )
+
+        parser.add_argument(
+            '--refresh',
+            action='store_true',
+            dest='refresh',
+            default=False,
+            help='Ignores cached data, fetches and caches it anew.'
+        )
+
         parser.add_argument(
             '--token',
             action='store',
@@ -260,19 +311,64 @@ class KuberlabShell(app.App):
         params = self._try_parse_config(self.options.config)
 
         # CLI parameters and ENV vars take precedence.
+        base_url = self.options.kuberlab_url or params.get('base_url')
+        username = self.options.username or params.get('username')
+        token = self.options.token or params.get('token')
         session = client.create_session(
-            self.options.kuberlab_url or params.get('base_url'),
-            username=self.options.username or params.get('username'),
+            base_url,
+            username=username,
             password=self.options.password or params.get('password'),
             insecure=self.options.insecure,
-            token=self.options.token or params.get('token'),
+            token=token,
+            pool_maxsize=params.get('pool_maxsize'),
         )
         self.client = client.Client(
             session,
-            kuberlab_url=self.options.kuberlab_url or params.get('base_url'),
+            kuberlab_url=base_url,
             insecure=self.options.insecure,
+            rate_limit=self.options.rate_limit or params.get('rate_limit'),
+            rate_limits=params.get('rate_limits'),
+            connect_timeout=params.get(
+                'connect_timeout', httpclient.DEFAULT_CONNECT_TIMEOUT
+            ),
+            read_timeout=params.get(
+                'read_timeout', httpclient.DEFAULT_READ_TIMEOUT
+            ),
+            stream_read_timeout=params.get(
+                'stream_read_timeout', httpclient.DEFAULT_STREAM_READ_TIMEOUT
+            ),
+            compress_threshold=params.get('compress_threshold'),
+            prewarm=self.options.prewarm or params.get('prewarm'),
+            resource_cache=self._create_cache(
+                params, base_url, token or username
+            ),
+        )
+        self.timeout = self.options.timeout or params.get('timeout')
+
+    def _create_cache(self, params, base_url, identity):
+        if self.options.no_cache or params.get('cache') is False:
+            return None
+
+        ttls = list((params.get('cache_ttls') or {}).items())
+        # Entries of different endpoints and users must not mix.
+        namespace = '%s %s' % (
+            base_url or client._DEFAULT_KUBERLAB_URL,
+            hashlib.sha256(
+                (identity or '').encode('utf-8')
+            ).hexdigest()[:16]
         )
 
+        return diskcache.DiskCache(
+            path=params.get('cache_path') or diskcache.DEFAULT_PATH,
+            namespace=namespace,
+            ttls=ttls + list(diskcache.DEFAULT_TTLS),
+            refresh=self.options.refresh,
+        )
+
+    def run_subcommand(self, argv):
+        with deadline.Deadline(getattr(self, 'timeout', None)):
+            return super(KuberlabShell, self).run_subcommand(argv)
+
     def _try_parse_config(self, path):
         try:
             with open(path, 'r') as f:
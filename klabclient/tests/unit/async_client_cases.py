@@ -0,0 +1,392 @@
+import asyncio
+import json
+
+import mock
+from oslotest import base
+
+from klabclient.api import async_client
+from klabclient.api import async_httpclient
+from klabclient.api import base as api_base
+from klabclient.api import deadline
+from klabclient.api import workspaces
+from klabclient import exceptions
+
+
+TEST_URL = 'http://dealer.example.com:8082/api/v0.2'
+
+WORKSPACE = {
+    'Type': 'private',
+    'Name': 'my',
+    'DisplayName': 'my',
+}
+
+
+def _response(status_code, data, method='get'):
+    return async_httpclient.AsyncResponse(
+        status_code, {}, json.dumps(data).encode('utf-8'), TEST_URL,
+        async_httpclient.AsyncRequest(method, None)
+    )
+
+
+class _StreamResponse(object):
+    """Streamed response yielding the body in small chunks."""
+
+    def __init__(self, status_code, body):
+        self.status_code = status_code
+        self.headers = {}
+        self.url = TEST_URL
+        self.request = async_httpclient.AsyncRequest('get', None)
+        self.body = body
+        self.closed = False
+
+    async def read(self):
+        self.content = self.body
+        return self.content
+
+    async def iter_chunked(self, size):
+        for i in range(0, len(self.body), 3):
+            yield self.body[i:i + 3]
+
+    async def iter_lines(self):
+        for line in self.body.splitlines(True):
+            yield line
+
+    def close(self):
+        self.closed = True
+
+
+class AsyncClientTest(base.BaseTestCase):
+
+    def setUp(self):
+        super(AsyncClientTest, self).setUp()
+        self.client = self._make_client()
+        self.send = mock.MagicMock()
+        self.streams = mock.MagicMock()
+        self._patch_send()
+
+    def _make_client(self, **kwargs):
+        return async_client.AsyncClient(
+            kuberlab_url=TEST_URL, token='token', **kwargs
+        )
+
+    def _patch_send(self):
+        calls = self.send
+        streams = self.streams
+
+        async def _send(method, url, headers=None, data=None, stream=False,
+                        read_timeout=None):
+            # Lets concurrent requests interleave.
+            await asyncio.sleep(0)
+            if stream:
+                return streams(method, url, headers, data)
+            return calls(method, url, headers, data)
+
+        patcher = mock.patch.object(self.client.http_client, '_send', _send)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def run_async(self, coro):
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(coro)
+        finally:
+            loop.close()
+
+    def test_auth_header(self):
+        self.assertEqual(
+            'Bearer token', self.client.http_client.headers['Authorization']
+        )
+
+    def test_list(self):
+        self.send.return_value = _response(200, [WORKSPACE])
+
+        result = self.run_async(self.client.workspaces.list())
+
+        self.assertEqual(1, len(result))
+        self.assertIsInstance(result[0], workspaces.Workspace)
+        self.assertEqual('my', result[0].Name)
+        self.send.assert_called_once_with('get', '/workspace', {}, None)
+
+    def test_concurrent_gets(self):
+        self.send.side_effect = lambda m, url, h, d: _response(
+            200, dict(WORKSPACE, Name=url.split('/')[-1])
+        )
+
+        async def gather():
+            return await asyncio.gather(
+                *[self.client.workspaces.get('w%d' % i) for i in range(50)]
+            )
+
+        result = self.run_async(gather())
+
+        self.assertEqual(['w%d' % i for i in range(50)],
+                         [w.Name for w in result])
+
+    def test_task_list_sets_workspace(self):
+        self.send.return_value = _response(200, [{'name': 't', 'build': 1}])
+
+        tasks = self.run_async(self.client.app_tasks.list('ws', 'app'))
+
+        self.assertEqual('ws', tasks[0].workspace)
+
+    def test_create_and_delete(self):
+        self.send.return_value = _response(200, WORKSPACE)
+
+        self.run_async(self.client.organizations.create('org'))
+        method, url, headers, data = self.send.call_args[0]
+        self.assertEqual('post', method)
+        self.assertEqual('application/json', headers['content-type'])
+        self.assertEqual('org', json.loads(data)['Name'])
+
+        self.run_async(self.client.organizations.delete('org'))
+        self.assertEqual(('delete', '/org/org'), self.send.call_args[0][:2])
+
+    def test_error(self):
+        self.send.return_value = _response(404, {'Error': 'not found'})
+
+        e = self.assertRaises(
+            api_base.APIException,
+            self.run_async, self.client.apps.get('ws', 'app')
+        )
+        self.assertEqual(404, e.error_code)
+
+    def test_coalesced_gets(self):
+        self.send.return_value = _response(200, WORKSPACE)
+
+        async def gather():
+            return await asyncio.gather(
+                *[self.client.workspaces.get('my') for _ in range(5)]
+            )
+
+        result = self.run_async(gather())
+
+        self.assertEqual(['my'] * 5, [w.Name for w in result])
+        self.assertEqual(1, self.send.call_count)
+        self.assertEqual(
+            {'calls': 5, 'collapsed': 4},
+            self.client.http_client.coalesce_stats()
+        )
+
+    def test_coalesced_error_copied(self):
+        flight = async_httpclient.AsyncSingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0)
+            raise ValueError('boom')
+
+        async def gather():
+            return await asyncio.gather(
+                flight.do('key', fail), flight.do('key', fail),
+                return_exceptions=True
+            )
+
+        leader_error, follower_error = self.run_async(gather())
+
+        self.assertIsInstance(follower_error, ValueError)
+        self.assertIsNot(leader_error, follower_error)
+        self.assertIs(leader_error, follower_error.__cause__)
+
+    def test_coalesced_follower_deadline(self):
+        flight = async_httpclient.AsyncSingleFlight()
+
+        async def slow():
+            await asyncio.sleep(0.2)
+            return 'result'
+
+        async def follower():
+            with deadline.Deadline(0.01):
+                return await flight.do('key', slow)
+
+        async def gather():
+            return await asyncio.gather(
+                flight.do('key', slow), follower(), return_exceptions=True
+            )
+
+        leader_result, follower_error = self.run_async(gather())
+
+        self.assertEqual(('result', False), leader_result)
+        self.assertIsInstance(follower_error, exceptions.DeadlineExceeded)
+
+    def test_coalesced_leader_deadline_not_shared(self):
+        flight = async_httpclient.AsyncSingleFlight()
+
+        async def slow():
+            await asyncio.sleep(0.05)
+            deadline.current().check()
+
+        async def own():
+            return 'result'
+
+        async def leader():
+            with deadline.Deadline(0.01):
+                return await flight.do('key', slow)
+
+        async def gather():
+            return await asyncio.gather(
+                leader(), flight.do('key', own), return_exceptions=True
+            )
+
+        leader_error, follower_result = self.run_async(gather())
+
+        self.assertIsInstance(leader_error, exceptions.DeadlineExceeded)
+        self.assertEqual(('result', False), follower_result)
+
+    def test_get_after_write_not_coalesced(self):
+        http = self.client.http_client
+        state = {'Name': 'old'}
+
+        async def scenario():
+            started = asyncio.Event()
+            release = asyncio.Event()
+
+            async def send(method, url, headers=None, data=None,
+                           stream=False):
+                if method == 'put':
+                    state['Name'] = 'new'
+                    return _response(200, {}, 'put')
+                data = dict(WORKSPACE, **state)
+                if data['Name'] == 'old':
+                    started.set()
+                    await release.wait()
+                return _response(200, data)
+
+            with mock.patch.object(http, '_send', send):
+                first = asyncio.ensure_future(http.get('/workspace/my'))
+                await started.wait()
+                await http.put('/workspace/my', '{}')
+                # Issued after the write, mustn't share the earlier GET.
+                second = asyncio.ensure_future(http.get('/workspace/my'))
+                await asyncio.sleep(0)
+                release.set()
+                return await first, await second
+
+        first, second = self.run_async(scenario())
+
+        self.assertEqual('old', first.json()['Name'])
+        self.assertEqual('new', second.json()['Name'])
+
+    def test_http_cache(self):
+        self.client = self._make_client(http_cache=True)
+        self._patch_send()
+        self.send.return_value = _response(200, WORKSPACE)
+
+        for _ in range(2):
+            w = self.run_async(self.client.workspaces.get('my'))
+            self.assertEqual('my', w.Name)
+
+        self.assertEqual(1, self.send.call_count)
+        self.assertEqual(1, self.client.http_client.cache_stats()['hits'])
+
+    def test_write_invalidates_after_response(self):
+        self.client = self._make_client(http_cache=True)
+        self._patch_send()
+        cache = self.client.http_client.http_cache
+
+        def send(method, url, headers, data):
+            if method == 'post':
+                # A GET completing while the write is in flight.
+                cache.update('/workspace/my', _response(200, WORKSPACE))
+                return _response(200, {})
+            return _response(200, dict(WORKSPACE, Name='new'))
+
+        self.send.side_effect = send
+
+        self.run_async(self.client.http_client.post('/workspace/my', '{}'))
+        w = self.run_async(self.client.workspaces.get('my'))
+
+        self.assertEqual('new', w.Name)
+
+    def test_get_racing_write_not_cached(self):
+        self.client = self._make_client(resource_cache=True)
+        self._patch_send()
+        cache = self.client.http_client.resource_cache
+
+        def send(method, url, headers, data):
+            if self.send.call_count == 1:
+                # A write completing while the GET is in flight.
+                cache.invalidate('/workspace/my')
+            return _response(200, WORKSPACE)
+
+        self.send.side_effect = send
+
+        for _ in range(2):
+            self.run_async(self.client.workspaces.get('my'))
+
+        self.assertEqual(2, self.send.call_count)
+
+    @mock.patch('asyncio.sleep')
+    def test_iter_list_retried(self, sleep):
+        async def _sleep(delay):
+            pass
+
+        sleep.side_effect = _sleep
+        stream = _StreamResponse(200, json.dumps(
+            [{'name': 't%d' % i} for i in range(3)]
+        ).encode('utf-8'))
+        failed = _StreamResponse(503, b'')
+        self.streams.side_effect = [failed, stream]
+
+        async def collect():
+            return [
+                t async for t in
+                self.client.app_tasks.iter_list('ws', 'app')
+            ]
+
+        tasks = self.run_async(collect())
+
+        self.assertEqual(['t0', 't1', 't2'], [t.name for t in tasks])
+        self.assertEqual('ws', tasks[0].workspace)
+        self.assertTrue(failed.closed)
+        self.assertTrue(stream.closed)
+        self.assertEqual(1, self.client.http_client.retry_stats()['retries'])
+
+    def test_packages_install(self):
+        self.streams.return_value = _StreamResponse(
+            200, b'Collecting a\r\nInstalled a\r\n'
+        )
+
+        async def collect():
+            return [
+                line async for line in self.client.apps.packages_install(
+                    'ws', 'app', 'pip', ['a']
+                )
+            ]
+
+        self.assertEqual([b'Collecting a', b'Installed a'],
+                         self.run_async(collect()))
+        method, url, headers, data = self.streams.call_args[0]
+        self.assertEqual(('post', '/workspace/ws/application/app/packages'),
+                         (method, url))
+        self.assertEqual('application/json', headers['content-type'])
+
+    def test_stream_error(self):
+        self.streams.return_value = _StreamResponse(
+            404, b'{"Error": "not found"}'
+        )
+
+        async def collect():
+            return [t async for t in self.client.apps.iter_list('ws')]
+
+        e = self.assertRaises(
+            api_base.APIException, self.run_async, collect()
+        )
+        self.assertEqual((404, 'not found'), (e.error_code, e.error_message))
+        self.assertTrue(self.streams.return_value.closed)
+
+    @mock.patch('asyncio.sleep')
+    def test_retry(self, sleep):
+        async def _sleep(delay):
+            pass
+
+        sleep.side_effect = _sleep
+        self.send.side_effect = [
+            _response(503, {}), _response(200, {'output': 'log'})
+        ]
+
+        log = self.run_async(
+            self.client.app_tasks.get_pod_logs('ws', 'app', 't', '1', 'p')
+        )
+
+        self.assertEqual('log', log)
+        self.assertEqual(2, self.send.call_count)
+        self.assertEqual(1, self.client.http_client.retry_stats()['retries'])
@@ -0,0 +1,8 @@
+import sys
+
+# The async client needs Python 3.6+, its tests can't even be compiled
+# on older versions, so they live in a module imported only when supported.
+if sys.version_info >= (3, 6):
+    from klabclient.tests.unit.async_client_cases import (  # noqa
+        AsyncClientTest
+    )
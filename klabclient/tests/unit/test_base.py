@@ -0,0 +1,288 @@
+# -*- coding: utf-8 -*-
+import copy
+import json
+import pickle
+
+import mock
+from oslotest import base as oslo_base
+import yaml
+
+from klabclient.api import app_tasks
+from klabclient.api import apps
+from klabclient.api import base
+from klabclient import exceptions
+from klabclient import utils
+
+
+class _Resource(base.Resource):
+    resource_name = 'Test'
+    __slots__ = ()
+    defaults = {'status': 'new'}
+
+
+class ResourceTest(oslo_base.BaseTestCase):
+
+    def test_fields_resolved_from_data(self):
+        data = {'Name': 'app'}
+        r = _Resource(None, data)
+
+        self.assertEqual('app', r.Name)
+        self.assertEqual('new', r.status)
+        self.assertFalse(hasattr(r, 'missing'))
+        # The data isn't copied.
+        self.assertIs(data, r.__dict__)
+        # Defaults don't modify the data.
+        self.assertEqual({'Name': 'app'}, data)
+
+    def test_data_changes_visible(self):
+        data = {'Name': 'app'}
+        r = _Resource(None, data)
+
+        data['Name'] = 'renamed'
+
+        self.assertEqual('renamed', r.Name)
+
+    def test_assigned_attributes_kept_aside(self):
+        data = {'Name': 'app'}
+        r = _Resource(None, data)
+
+        r.Name = 'other'
+        r.workspace = 'ws'
+
+        self.assertEqual('other', r.Name)
+        self.assertEqual('ws', r.workspace)
+        self.assertEqual({'Name': 'app'}, data)
+        self.assertEqual({'Name': 'app', 'status': 'new'}, r.to_dict())
+
+        del r.Name
+        self.assertEqual('app', r.Name)
+        del r.workspace
+        self.assertFalse(hasattr(r, 'workspace'))
+
+    def test_to_dict_includes_defaults(self):
+        r = _Resource(None, {'Name': 'app', 'Tags': ['a']})
+
+        d = r.to_dict()
+        d['Tags'].append('b')
+
+        self.assertEqual({'Name': 'app', 'Tags': ['a', 'b'],
+                          'status': 'new'}, d)
+        self.assertEqual(['a'], r.Tags)
+
+    def test_copy_and_pickle(self):
+        r = _Resource(None, {'Name': 'app'})
+        r.workspace = 'ws'
+
+        for c in (copy.copy(r), copy.deepcopy(r),
+                  pickle.loads(pickle.dumps(r))):
+            self.assertEqual('app', c.Name)
+            self.assertEqual('ws', c.workspace)
+
+    def test_app_task_attributes(self):
+        task = app_tasks.AppTask(None, {'name': 't', 'config': 'a: 1\n'})
+
+        self.assertEqual({'a': 1}, task.config)
+        self.assertEqual('a: 1\n', task.config_raw)
+        self.assertEqual('undefined', task.status)
+        self.assertFalse(hasattr(task, 'build'))
+
+        task.build = '1'
+        self.assertEqual('1', task.build)
+        self.assertEqual('a: 1\n', task.to_dict()['config'])
+
+    def test_app_task_config_parsed_lazily_once(self):
+        task = app_tasks.AppTask(
+            None, {'name': 't', 'config': 'a: 1\n', 'app_config': 'b: 2\n'}
+        )
+
+        with mock.patch.object(utils, 'yaml_load',
+                               side_effect=utils.yaml_load) as load:
+            self.assertEqual('t', task.name)
+            self.assertEqual(0, load.call_count)
+
+            self.assertEqual({'b': 2}, task.app_config)
+            self.assertEqual({'b': 2}, task.app_config)
+            self.assertEqual(1, load.call_count)
+
+        task.config = {'c': 3}
+        self.assertEqual({'c': 3}, task.config)
+        self.assertEqual('a: 1\n', task.config_raw)
+
+    def test_app_task_without_config(self):
+        task = app_tasks.AppTask(None, {'name': 't'})
+
+        self.assertFalse(hasattr(task, 'config'))
+        self.assertFalse(hasattr(task, 'app_config_raw'))
+
+    def test_libyaml_loader(self):
+        if hasattr(yaml, 'CSafeLoader'):
+            self.assertIs(yaml.CSafeLoader, utils.YAML_SAFE_LOADER)
+
+    def test_app_config(self):
+        app = apps.App(None, {'Name': 'a', 'Configuration': {'spec': {}}})
+
+        self.assertEqual({'spec': {}}, app.config)
+        self.assertEqual('a', app.full_config['Name'])
+
+    def test_api_resources_share_data(self):
+        data = {'name': 't', 'app': 'a', 'status': 'Running'}
+        task = app_tasks.AppTask(None, data)
+
+        self.assertIs(data, task.__dict__)
+        self.assertEqual(('t', 'a', 'Running'),
+                         (task.name, task.app, task.status))
+        self.assertFalse(hasattr(task, 'build'))
+
+
+def _make_app(tasks):
+    return apps.App(mock.Mock(), {
+        'Name': 'app',
+        'WorkspaceName': 'ws',
+        'Configuration': {'spec': {'tasks': tasks}},
+    })
+
+
+class AppConfigTasksTest(oslo_base.BaseTestCase):
+
+    def test_config_tasks(self):
+        app = _make_app([{'name': 'a', 'x': 1}, {'name': 'b'}])
+
+        self.assertEqual(['a', 'b'], list(app.config_tasks))
+        self.assertIn('b', app.config_tasks)
+        self.assertNotIn('c', app.config_tasks)
+
+        task = app.get_config_task('a')
+        self.assertEqual('a', task.name)
+        self.assertEqual('app', task.app)
+        self.assertEqual('ws', task.workspace)
+        self.assertEqual({'name': 'a', 'x': 1}, task.config)
+        self.assertEqual(app.full_config, task.app_config)
+        self.assertIsNot(app.full_config, task.app_config)
+        self.assertEqual(
+            app.full_config, yaml.safe_load(task.to_dict()['app_config'])
+        )
+        self.assertEqual(['a', 'b'],
+                         [t.name for t in app.get_config_tasks()])
+
+        self.assertRaises(exceptions.KuberlabClientException,
+                          app.get_config_task, 'c')
+
+    def test_app_config_serialized_once(self):
+        app = _make_app([{'name': 't%d' % i} for i in range(5)])
+
+        with mock.patch.object(utils, 'yaml_dump',
+                               side_effect=utils.yaml_dump) as dump:
+            tasks = app.get_config_tasks()
+            self.assertEqual(5, dump.call_count)
+
+            raw = set(t.app_config_raw for t in tasks)
+            self.assertEqual(1, len(raw))
+            self.assertEqual(6, dump.call_count)
+
+    def test_view_without_app_config(self):
+        app = _make_app([{'name': 't', 'x': 1}])
+        task = app.get_config_task('t')
+
+        with mock.patch.object(app, 'config_yaml') as config_yaml:
+            self.assertEqual('name: t\nx: 1\n', task.view()['config'])
+            self.assertNotIn('app_config', task.view())
+            self.assertIn('name=t', str(task))
+
+        self.assertFalse(config_yaml.called)
+
+    def test_set_config_task(self):
+        app = _make_app([{'name': 'a'}, {'name': 'b'}])
+
+        app.set_config_task({'name': 'b', 'x': 1})
+        self.assertEqual({'name': 'b', 'x': 1},
+                         app.get_config_task('b').config)
+        self.assertIn('x: 1', app.config_yaml())
+
+        app.set_config_task({'name': 'c'})
+        self.assertEqual(['a', 'b', 'c'], list(app.config_tasks))
+        self.assertEqual(2, app.manager.update.call_count)
+
+    def test_direct_config_changes(self):
+        app = _make_app([{'name': 't'}])
+        self.assertEqual(['t'], list(app.config_tasks))
+        self.assertNotIn('x: 1', app.get_config_task('t').app_config_raw)
+
+        app.config['spec']['tasks'].append({'name': 'u', 'x': 1})
+
+        self.assertEqual(['t', 'u'],
+                         [t.name for t in app.get_config_tasks()])
+        self.assertEqual('u', app.get_config_task('u').name)
+        self.assertEqual(['t', 'u'], list(app.config_tasks))
+        self.assertIn('x: 1', app.get_config_task('t').app_config_raw)
+
+        app.config['spec']['tasks'][0] = {'name': 'renamed'}
+
+        self.assertEqual(['renamed', 'u'], list(app.config_tasks))
+        self.assertNotIn('t', app.config_tasks)
+        self.assertRaises(exceptions.KuberlabClientException,
+                          app.get_config_task, 't')
+
+        app.config['spec']['tasks'] = []
+        self.assertEqual([], app.get_config_tasks())
+
+    def test_no_config(self):
+        app = apps.App(mock.Mock(), {'Name': 'app'})
+
+        self.assertEqual([], app.get_config_tasks())
+
+
+PAYLOAD = {
+    'Name': u'приложение',
+    'Path': '/api/v0.2',
+    'Float': 0.1 + 0.2,
+    'Big': 2 ** 70,
+    'List': [None, True, False, -1, 1e300, {'nested': ''}],
+}
+
+
+class JSONCodecTest(oslo_base.BaseTestCase):
+
+    def setUp(self):
+        super(JSONCodecTest, self).setUp()
+        self.addCleanup(base.set_json_codec, base.get_json_codec())
+
+    def test_codecs_match_stdlib(self):
+        encoded = json.dumps(PAYLOAD).encode('utf-8')
+
+        for name, codec in base.JSON_CODECS.items():
+            self.assertEqual(PAYLOAD, codec.loads(encoded), name)
+            self.assertEqual(PAYLOAD, json.loads(codec.dumps(PAYLOAD)), name)
+
+    def test_stdlib_fallback(self):
+        for codec in base.JSON_CODECS.values():
+            self.assertEqual('{"1": 1}', codec.dumps({1: 1}))
+            self.assertTrue(codec.loads(b'[NaN]')[0] != 0)
+            self.assertRaises(ValueError, codec.loads, b'{')
+
+    def test_non_finite_floats(self):
+        payload = [float('inf'), float('-inf')]
+
+        for name, codec in base.JSON_CODECS.items():
+            decoded = json.loads(codec.dumps(payload))
+            # orjson writes null, others fall back to the stdlib.
+            expected = [None, None] if name == 'orjson' else payload
+            self.assertEqual(expected, decoded, name)
+
+    @mock.patch.dict('os.environ', {'KUBERLAB_JSON_CODEC': 'missing'})
+    def test_unavailable_env_codec(self):
+        with mock.patch.object(base.LOG, 'warning') as warning:
+            codec = base._default_json_codec()
+
+        self.assertIs(next(iter(base.JSON_CODECS.values())), codec)
+        self.assertTrue(warning.called)
+
+    @mock.patch.dict('os.environ', {'KUBERLAB_JSON_CODEC': 'json'})
+    def test_env_codec(self):
+        self.assertEqual('json', base._default_json_codec().name)
+
+    def test_set_codec(self):
+        base.set_json_codec('json')
+        self.assertEqual('json', base.get_json_codec().name)
+        self.assertEqual('[1]', base.json_dumps([1]))
+
+        self.assertRaises(ValueError, base.set_json_codec, 'missing')
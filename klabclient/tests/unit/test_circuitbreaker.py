@@ -0,0 +1,127 @@
+import mock
+from oslotest import base
+import requests
+
+from klabclient.api import circuitbreaker
+from klabclient.api import httpclient
+from klabclient import exceptions
+from klabclient.tests.unit import base as test_base
+
+
+class CircuitBreakerTest(base.BaseTestCase):
+
+    def test_url_template(self):
+        self.assertEqual(
+            '/workspace/{}/application/{}/tasks/{}/build/{}/pods/{}/log',
+            circuitbreaker.url_template(
+                '/workspace/ws/application/app/tasks/t/build/1/pods/p/log'
+            )
+        )
+        self.assertEqual(
+            '/catalog/chart-app',
+            circuitbreaker.url_template('/catalog/chart-app?limit=10')
+        )
+
+    @mock.patch('time.time')
+    def test_state_transitions(self, time_mock):
+        time_mock.return_value = 100.0
+        breaker = circuitbreaker.CircuitBreaker(
+            failure_threshold=2, recovery_timeout=10
+        )
+
+        breaker.record_failure()
+        self.assertEqual(circuitbreaker.CLOSED, breaker.state)
+        breaker.record_failure()
+        self.assertEqual(circuitbreaker.OPEN, breaker.state)
+        self.assertFalse(breaker.allow_request())
+        self.assertEqual(10.0, breaker.retry_after())
+
+        time_mock.return_value = 110.0
+        self.assertEqual(circuitbreaker.HALF_OPEN, breaker.state)
+        self.assertTrue(breaker.allow_request())
+        # Only one trial request at a time.
+        self.assertFalse(breaker.allow_request())
+
+        breaker.record_failure()
+        self.assertEqual(circuitbreaker.OPEN, breaker.state)
+
+        time_mock.return_value = 120.0
+        self.assertTrue(breaker.allow_request())
+        breaker.record_success()
+        self.assertEqual(circuitbreaker.CLOSED, breaker.state)
+
+
+class HTTPClientCircuitBreakerTest(test_base.BaseClientTest):
+
+    def setUp(self):
+        super(HTTPClientCircuitBreakerTest, self).setUp()
+        self.client = httpclient.HTTPClient(
+            self.TEST_URL,
+            retry_policies={},
+            circuit_breaker=circuitbreaker.CircuitBreakerRegistry(
+                failure_threshold=2
+            )
+        )
+
+    def test_fail_fast_per_endpoint(self):
+        logs = '/workspace/ws/application/app/tasks/t/build/1/pods/p/log'
+        m = self.requests_mock.get(self.TEST_URL + logs, status_code=502)
+        self.requests_mock.get(self.TEST_URL + '/workspace', json=[])
+
+        self.client.get(logs)
+        self.client.get(logs)
+
+        self.assertEqual(
+            circuitbreaker.OPEN, self.client.circuit_state(logs)
+        )
+        e = self.assertRaises(
+            exceptions.CircuitOpenException,
+            self.client.get,
+            logs.replace('/p/', '/other/')
+        )
+        self.assertGreater(e.retry_after, 0)
+        self.assertEqual(2, m.call_count)
+
+        # Other endpoints keep working.
+        self.assertEqual(200, self.client.get('/workspace').status_code)
+
+    def _open(self, url):
+        self.requests_mock.get(self.TEST_URL + url, status_code=502)
+        self.client.get(url)
+        self.client.get(url)
+        # Recovery timeout elapsed, the breaker is half-open.
+        self.client.circuit_breakers.get(url).opened_at -= 60
+
+    def test_trial_released_on_caller_error(self):
+        url = '/workspace/ws/clusters'
+        self._open(url)
+
+        with mock.patch.object(
+                self.client, 'get_timeout',
+                side_effect=exceptions.DeadlineExceeded('deadline')):
+            self.assertRaises(
+                exceptions.DeadlineExceeded, self.client.get, url
+            )
+
+        self.assertEqual(
+            circuitbreaker.HALF_OPEN, self.client.circuit_state(url)
+        )
+        self.requests_mock.get(self.TEST_URL + url, json=[])
+        self.assertEqual(200, self.client.get(url).status_code)
+        self.assertEqual(
+            circuitbreaker.CLOSED, self.client.circuit_state(url)
+        )
+
+    def test_broken_trial_response_is_failure(self):
+        url = '/workspace/ws/clusters'
+        self._open(url)
+        self.requests_mock.get(
+            self.TEST_URL + url, exc=requests.exceptions.ChunkedEncodingError
+        )
+
+        self.assertRaises(
+            requests.exceptions.ChunkedEncodingError, self.client.get, url
+        )
+        self.assertEqual(
+            circuitbreaker.OPEN, self.client.circuit_state(url)
+        )
@@ -0,0 +1,115 @@
+import os
+
+import fixtures
+import mock
+import requests
+
+from klabclient.api import apps
+from klabclient.api import deadline
+from klabclient.api import httpclient
+from klabclient.api import models
+from klabclient import exceptions
+from klabclient.tests.unit import base
+
+
+class DeadlineTest(base.BaseClientTest):
+
+    def setUp(self):
+        super(DeadlineTest, self).setUp()
+        self.client = httpclient.HTTPClient(
+            self.TEST_URL, connect_timeout=5, read_timeout=30,
+            stream_read_timeout=300
+        )
+
+    def test_default_timeouts(self):
+        m = self.requests_mock.get(self.TEST_URL + '/workspace', json=[])
+
+        self.client.get('/workspace')
+
+        self.assertEqual((5, 30), m.last_request.timeout)
+
+    @mock.patch('time.time')
+    def test_nested_deadlines(self, time_mock):
+        time_mock.return_value = 100.0
+
+        with deadline.Deadline(20) as outer:
+            self.assertIs(outer, deadline.current())
+
+            with deadline.Deadline(60) as inner:
+                self.assertEqual(20, inner.remaining())
+
+            time_mock.return_value = 112.0
+            self.assertEqual((5, 8.0), self.client.get_timeout())
+
+        self.assertIsNone(deadline.current())
+
+    @mock.patch('time.time')
+    def test_deadline_exceeded(self, time_mock):
+        m = self.requests_mock.get(self.TEST_URL + '/workspace', json=[])
+        time_mock.return_value = 100.0
+
+        with deadline.Deadline(10):
+            self.client.get('/workspace')
+            time_mock.return_value = 110.0
+
+            self.assertRaises(
+                exceptions.DeadlineExceeded, self.client.get, '/workspace'
+            )
+
+        self.assertEqual(1, m.call_count)
+
+    @mock.patch('time.sleep')
+    def test_no_retry_past_deadline(self, sleep):
+        m = self.requests_mock.get(
+            self.TEST_URL + '/workspace', exc=requests.ConnectTimeout
+        )
+        self.client.retry_policies['get'] = httpclient.RetryPolicy(
+            backoff_factor=100, jitter=False
+        )
+
+        with deadline.Deadline(10):
+            self.assertRaises(
+                requests.ConnectTimeout, self.client.get, '/workspace'
+            )
+
+        self.assertEqual(1, m.call_count)
+        self.assertFalse(sleep.called)
+
+    def test_packages_install_timeout(self):
+        url = self.TEST_URL + '/workspace/ws/application/app/packages'
+        m = self.requests_mock.post(url, text='line 1\nline 2\n')
+        manager = apps.AppManager(self.client)
+
+        with deadline.Deadline(1000):
+            lines = list(
+                manager.packages_install('ws', 'app', 'pip', ['requests'])
+            )
+
+        self.assertEqual([b'line 1', b'line 2'], lines)
+        self.assertEqual((5, 300), m.last_request.timeout)
+        self.assertEqual(
+            'application/json', m.last_request.headers['Content-Type']
+        )
+
+    def test_model_upload_timeout(self):
+        path = os.path.join(
+            self.useFixture(fixtures.TempDir()).path, 'model.tar.gz'
+        )
+        with open(path, 'wb') as f:
+            f.write(b'model')
+        m = self.requests_mock.post(
+            self.TEST_URL + '/workspace/ws/mlmodel/m/versions/1.0/upload',
+            json={'Name': 'm'}
+        )
+        manager = models.ModelManager(self.client)
+
+        with deadline.Deadline(10):
+            model = manager.upload('ws', 'm', '1.0', path)
+
+        self.assertEqual('m', model.Name)
+        self.assertEqual(5, m.last_request.timeout[0])
+        self.assertLessEqual(m.last_request.timeout[1], 10)
+        self.assertIn(
+            'multipart/form-data', m.last_request.headers['Content-Type']
+        )
+        self.assertIn(b'filename="m.tar.gz"', m.last_request.body)
@@ -0,0 +1,128 @@
+import os
+
+import fixtures
+import mock
+from oslotest import base as oslo_base
+import requests
+
+from klabclient.api import diskcache
+from klabclient.api import transport
+
+WORKSPACES = '/workspace'
+CLUSTERS = '/workspace/ws/clusters'
+APP = '/workspace/ws/application/a'
+
+
+def _response(url, body=b'[{"Name": "ws"}]'):
+    request = requests.Request('GET', 'http://h/api' + url).prepare()
+    resp = transport.make_response(request, 200, body)
+    resp.headers['ETag'] = '"v1"'
+    return resp
+
+
+class DiskCacheTest(oslo_base.BaseTestCase):
+
+    def setUp(self):
+        super(DiskCacheTest, self).setUp()
+        self.path = os.path.join(
+            self.useFixture(fixtures.TempDir()).path, 'sub', 'cache.sqlite'
+        )
+
+    def _cache(self, **kwargs):
+        cache = diskcache.DiskCache(self.path, **kwargs)
+        self.addCleanup(cache.close)
+        return cache
+
+    def test_shared_between_instances(self):
+        self._cache(namespace='n').put(WORKSPACES, _response(WORKSPACES))
+
+        resp = self._cache(namespace='n').get(WORKSPACES)
+
+        self.assertEqual([{'Name': 'ws'}], resp.json())
+        self.assertEqual('"v1"', resp.headers['ETag'])
+        self.assertEqual('http://h/api/workspace', resp.url)
+        self.assertTrue(resp.from_cache)
+        self.assertEqual(0o600, os.stat(self.path).st_mode & 0o777)
+
+    def test_private_files(self):
+        os.makedirs(os.path.dirname(self.path))
+        # Left by an older version.
+        with open(self.path + '-wal', 'wb'):
+            pass
+        os.chmod(self.path + '-wal', 0o644)
+        cache = self._cache()
+
+        cache.put(WORKSPACES, _response(WORKSPACES))
+
+        for suffix in ('', '-wal', '-shm'):
+            self.assertEqual(
+                0o600, os.stat(self.path + suffix).st_mode & 0o777, suffix
+            )
+
+    def test_namespaces_separated(self):
+        self._cache(namespace='a').put(WORKSPACES, _response(WORKSPACES))
+
+        self.assertIsNone(self._cache(namespace='b').get(WORKSPACES))
+
+    def test_only_configured_urls(self):
+        cache = self._cache()
+        cache.put(APP, _response(APP))
+
+        self.assertIsNone(cache.get(APP))
+        self.assertEqual(0, cache.stats()['entries'])
+        self.assertEqual(300, cache.ttl(WORKSPACES + '?x=1'))
+
+    @mock.patch('time.time')
+    def test_ttl_per_pattern(self, time_mock):
+        time_mock.return_value = 1000
+        cache = self._cache(ttls=[(CLUSTERS, 10), (WORKSPACES, 100)])
+        cache.put(CLUSTERS, _response(CLUSTERS))
+        cache.put(WORKSPACES, _response(WORKSPACES))
+
+        time_mock.return_value = 1050
+
+        self.assertIsNone(cache.get(CLUSTERS))
+        self.assertIsNotNone(cache.get(WORKSPACES))
+
+    def test_write_invalidates_other_instances(self):
+        cache = self._cache()
+        cache.put(CLUSTERS, _response(CLUSTERS))
+        cache.put(WORKSPACES, _response(WORKSPACES))
+
+        self._cache().invalidate('/workspace/ws/clusters/c1')
+
+        self.assertIsNone(cache.get(CLUSTERS))
+        # Parent collection of the modified URL.
+        self.assertIsNone(cache.get(WORKSPACES))
+
+    def test_put_after_overlapping_invalidation(self):
+        cache = self._cache()
+        generation = cache.generation()
+
+        cache.invalidate('/workspace/ws/clusters/c1')
+        cache.put(CLUSTERS, _response(CLUSTERS), generation)
+        cache.put(CLUSTERS, _response(CLUSTERS), cache.generation())
+        cache.put(WORKSPACES, _response(WORKSPACES), generation)
+
+        self.assertIsNotNone(cache.get(CLUSTERS))
+        self.assertIsNone(cache.get(WORKSPACES))
+
+    def test_refresh(self):
+        self._cache().put(WORKSPACES, _response(WORKSPACES, b'[]'))
+        refreshing = self._cache(refresh=True)
+
+        self.assertIsNone(refreshing.get(WORKSPACES))
+        refreshing.put(WORKSPACES, _response(WORKSPACES))
+
+        self.assertEqual(
+            [{'Name': 'ws'}], self._cache().get(WORKSPACES).json()
+        )
+
+    def test_errors_ignored(self):
+        os.makedirs(self.path)
+        cache = self._cache()
+
+        cache.put(WORKSPACES, _response(WORKSPACES))
+
+        self.assertIsNone(cache.get(WORKSPACES))
+        self.assertGreater(cache.stats()['errors'], 0)
@@ -0,0 +1,56 @@
+import unittest
+
+from oslotest import base
+import requests
+
+from klabclient.api import http2
+from klabclient.api import httpclient
+
+
+def _handler(request):
+    if request.url.path == '/api/fail':
+        raise http2.httpx.ConnectError('refused', request=request)
+
+    return http2.httpx.Response(
+        200,
+        json={'path': request.url.path, 'body': request.content.decode()},
+        headers={'ETag': '"v1"'},
+    )
+
+
+@unittest.skipIf(http2.httpx is None, 'httpx is not installed')
+class HTTP2TransportTest(base.BaseTestCase):
+
+    def setUp(self):
+        super(HTTP2TransportTest, self).setUp()
+        self.client = httpclient.HTTPClient(
+            'https://example.com/api', http2=True, retry_policies={}
+        )
+        self.client.crud_provider.client = http2.httpx.Client(
+            transport=http2.httpx.MockTransport(_handler)
+        )
+
+    def test_transport_selected(self):
+        self.assertIsInstance(
+            self.client.crud_provider, http2.HTTP2Transport
+        )
+
+    def test_get(self):
+        resp = self.client.get('/workspace')
+
+        self.assertEqual(200, resp.status_code)
+        self.assertEqual('/api/workspace', resp.json()['path'])
+        self.assertEqual('"v1"', resp.headers['etag'])
+
+    def test_put_body(self):
+        resp = self.client.put('/workspace/ws', '{"a": 1}')
+
+        self.assertEqual('{"a": 1}', resp.json()['body'])
+
+    def test_transport_error_mapped(self):
+        self.assertRaises(
+            requests.ConnectionError, self.client.get, '/fail'
+        )
+
+    def test_insecure(self):
+        self.assertFalse(http2.ssl_context(insecure=True))
@@ -0,0 +1,161 @@
+import mock
+
+from klabclient.api import httpcache
+from klabclient.api import httpclient
+from klabclient.tests.unit import base
+
+
+URL = '/workspace/ws/application/app'
+
+
+class HTTPCacheTest(base.BaseClientTest):
+
+    def setUp(self):
+        super(HTTPCacheTest, self).setUp()
+        self.client = httpclient.HTTPClient(self.TEST_URL, http_cache=True)
+
+    def test_etag_revalidation(self):
+        m = self.requests_mock.get(
+            self.TEST_URL + URL,
+            [{'json': {'Name': 'app'}, 'headers': {'ETag': '"v1"'}},
+             {'status_code': 304, 'headers': {'ETag': '"v1"'}}]
+        )
+
+        first = self.client.get(URL)
+        second = self.client.get(URL)
+
+        self.assertEqual(first.json(), second.json())
+        self.assertEqual(200, second.status_code)
+        self.assertEqual('"v1"', m.last_request.headers['If-None-Match'])
+        stats = self.client.cache_stats()
+        self.assertEqual(1, stats['revalidated'])
+        self.assertEqual(1, stats['misses'])
+        self.assertEqual(len(first.content), stats['bytes_saved'])
+        self.assertEqual(0.5, stats['hit_ratio'])
+
+    def test_last_modified_revalidation(self):
+        date = 'Wed, 21 Oct 2015 07:28:00 GMT'
+        m = self.requests_mock.get(
+            self.TEST_URL + URL,
+            [{'text': 'yaml', 'headers': {'Last-Modified': date}},
+             {'status_code': 304}]
+        )
+
+        self.client.get(URL)
+        self.assertEqual('yaml', self.client.get(URL).text)
+        self.assertEqual(date, m.last_request.headers['If-Modified-Since'])
+
+    @mock.patch('time.time')
+    def test_ttl_without_validators(self, time_mock):
+        time_mock.return_value = 100.0
+        m = self.requests_mock.get(self.TEST_URL + URL, json={'a': 1})
+
+        self.client.get(URL)
+        self.client.get(URL)
+        self.assertEqual(1, m.call_count)
+
+        time_mock.return_value = 106.0
+        self.client.get(URL)
+        self.assertEqual(2, m.call_count)
+        self.assertEqual(1, self.client.cache_stats()['hits'])
+
+    def test_write_invalidates(self):
+        m = self.requests_mock.get(self.TEST_URL + URL, json={'a': 1})
+        self.requests_mock.put(self.TEST_URL + URL, json={'a': 2})
+
+        self.client.get(URL)
+        self.client.put(URL, '{}')
+        self.client.get(URL)
+
+        self.assertEqual(2, m.call_count)
+
+    def test_write_invalidates_after_response(self):
+        m = self.requests_mock.get(
+            self.TEST_URL + URL, [{'json': {'a': 1}}, {'json': {'a': 2}}]
+        )
+
+        def racing_get(request, context):
+            # A GET completing while the write is in flight caches the
+            # state before the write.
+            self.client.get(URL)
+            return {}
+
+        self.requests_mock.put(self.TEST_URL + URL, json=racing_get)
+
+        self.client.put(URL, '{}')
+
+        self.assertEqual({'a': 2}, self.client.get(URL).json())
+        self.assertEqual(2, m.call_count)
+
+    def test_get_racing_write_not_stored(self):
+        def racing_write(request, context):
+            self.client.put(URL, '{}')
+            return {'a': 1}
+
+        m = self.requests_mock.get(
+            self.TEST_URL + URL, [{'json': racing_write}, {'json': {'a': 2}}]
+        )
+        self.requests_mock.put(self.TEST_URL + URL, json={})
+
+        self.client.get(URL)
+
+        self.assertEqual({'a': 2}, self.client.get(URL).json())
+        self.assertEqual(2, m.call_count)
+
+    def test_invalidation_log(self):
+        log = httpcache.InvalidationLog(size=2)
+        generation = log.generation()
+
+        self.assertFalse(log.modified_since(URL, generation))
+        log.record(URL + '2')
+        self.assertFalse(log.modified_since(URL, generation))
+        log.record(URL + '/status')
+        self.assertTrue(log.modified_since(URL, generation))
+        self.assertFalse(log.modified_since(URL, log.generation()))
+
+        generation = log.generation()
+        log.record('/a')
+        log.record('/b')
+        self.assertFalse(log.modified_since(URL, generation))
+        log.record('/c')
+        # Older than all remembered invalidations.
+        self.assertTrue(log.modified_since(URL, generation))
+
+    def test_overlaps(self):
+        app = URL
+        for url, modified in (
+                (app, app),
+                (app + '/status', app),
+                ('/workspace/ws/application', app),
+                (app + '/tasks', app + '/build/task'),
+                (app + '/tasks/task/build/1', app + '/build/task'),
+                (app + '/status', app + '/disable?force=false'),
+                (app + '/status', app + '/enable'),
+                (app, app + '/enable'),
+                (app + '/tasks', app + '/tasks/task/build/1')):
+            self.assertTrue(httpcache.overlaps(url, modified),
+                            '%s %s' % (url, modified))
+
+        for url, modified in (
+                (app + '2', app),
+                (app + '/status', app + '/packages'),
+                (app + '2/status', app + '/enable'),
+                ('/workspace/ws/storage', app + '/build/task'),
+                ('/workspace/ws/storage', '/build')):
+            self.assertFalse(httpcache.overlaps(url, modified),
+                             '%s %s' % (url, modified))
+
+    def test_invalidate_overlapping(self):
+        cache = httpcache.HTTPCache()
+        for url in ('/workspace', '/workspace/ws/application',
+                    URL, URL + '/status', URL + '2'):
+            cache._entries[url] = mock.Mock()
+
+        cache.invalidate(URL)
+
+        self.assertEqual([URL + '2'], list(cache._entries))
+
+    def test_disabled_by_default(self):
+        client = httpclient.HTTPClient(self.TEST_URL)
+
+        self.assertIsNone(client.cache_stats())
@@ -1,12 +1,20 @@
 
 import copy
+import gzip
+import io
+import threading
 
 import mock
+from oslotest import base as oslo_base
+import requests
+from six.moves import BaseHTTPServer
+from six.moves import socketserver
 from six.moves.urllib import parse as urlparse
 
 from oslo_utils import uuidutils
 
 from klabclient.api import httpclient
+from klabclient.api import transport
 from klabclient.tests.unit import base
 
 API_BASE_URL = 'http://cloud-dealer:8082/api/v0.2'
@@ -152,3 +160,295 @@ class HTTPClientTest(base.BaseClientTest):
         )
 
         self.assertTrue(m.called_once)
+
+
+class _HTTPServer(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+
+
+class _KeepAliveHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        body = b'{}'
+        encoding = None
+        if self.path == '/gzip':
+            body = httpclient.gzip_body(b'{"k": "' + b'v' * 10000 + b'"}')
+            encoding = 'gzip'
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if encoding:
+            self.send_header('Content-Encoding', encoding)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class PooledHTTPClientTest(oslo_base.BaseTestCase):
+
+    def setUp(self):
+        super(PooledHTTPClientTest, self).setUp()
+        self.server = _HTTPServer(
+            ('127.0.0.1', 0), _KeepAliveHandler
+        )
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        self.base_url = 'http://127.0.0.1:%s' % self.server.server_port
+
+    def test_default_transport_is_pooled_session(self):
+        client = httpclient.HTTPClient(self.base_url)
+
+        self.assertIsInstance(client.crud_provider, requests.Session)
+        self.assertIsInstance(
+            client.crud_provider.get_adapter(self.base_url),
+            httpclient.PooledHTTPAdapter
+        )
+
+    def test_requests_module_replaced_with_pooled_session(self):
+        client = httpclient.HTTPClient(self.base_url, session=requests)
+
+        self.assertIsNone(client.session)
+        self.assertIsInstance(client.crud_provider, requests.Session)
+
+    def test_user_session_kept(self):
+        session = requests.Session()
+        client = httpclient.HTTPClient(self.base_url, session=session)
+
+        self.assertIs(session, client.crud_provider)
+        self.assertEqual(
+            {'opened': 0, 'reused': 0, 'dropped': 0},
+            client.pool_stats()
+        )
+
+    def test_keep_alive_reuses_connection(self):
+        client = httpclient.HTTPClient(self.base_url, pool_maxsize=2)
+
+        for _ in range(3):
+            self.assertEqual(200, client.get('/workspace').status_code)
+
+        stats = client.pool_stats()
+        self.assertEqual(1, stats['opened'])
+        self.assertEqual(2, stats['reused'])
+        self.assertEqual(0, stats['dropped'])
+
+    def test_prewarm_connection_reused_by_first_request(self):
+        client = httpclient.HTTPClient(self.base_url, prewarm=True)
+
+        self.assertEqual(200, client.get('/workspace').status_code)
+
+        stats = client.pool_stats()
+        self.assertEqual(1, stats['opened'])
+        self.assertEqual(1, stats['reused'])
+        self.assertIsNone(client._prewarmer)
+
+    def test_prewarm_error_ignored(self):
+        def handler(request):
+            if request.method == 'HEAD':
+                raise requests.ConnectionError('unreachable')
+            return {}
+
+        client = httpclient.HTTPClient(
+            self.base_url,
+            prewarm=True,
+            transport=transport.InProcessTransport(handler)
+        )
+
+        self.assertEqual({}, client.get('/workspace').json())
+
+    def test_compressed_response_counters(self):
+        client = httpclient.HTTPClient(self.base_url)
+
+        resp = client.get('/gzip')
+
+        self.assertEqual(10000, len(resp.json()['k']))
+        stats = client.transfer_stats()
+        self.assertEqual(10009, stats['response_bytes'])
+        self.assertLess(stats['response_wire_bytes'], 1000)
+
+
+class RetryHTTPClientTest(base.BaseClientTest):
+
+    def setUp(self):
+        super(RetryHTTPClientTest, self).setUp()
+        self.client = httpclient.HTTPClient(API_BASE_URL)
+
+        patcher = mock.patch('time.sleep')
+        self.sleep = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_get_retried_on_503(self):
+        m = self.requests_mock.get(
+            EXPECTED_URL,
+            [{'status_code': 503}, {'status_code': 502}, {'json': {}}]
+        )
+
+        resp = self.client.get(API_URL)
+
+        self.assertEqual(200, resp.status_code)
+        self.assertEqual(3, m.call_count)
+        self.assertEqual(2, self.client.retry_stats()['retries'])
+
+    def test_get_retried_on_connection_error(self):
+        m = self.requests_mock.get(
+            EXPECTED_URL,
+            [{'exc': requests.ConnectionError}, {'json': {}}]
+        )
+
+        resp = self.client.get(API_URL)
+
+        self.assertEqual(200, resp.status_code)
+        self.assertEqual(2, m.call_count)
+
+    def test_retries_exhausted(self):
+        m = self.requests_mock.get(EXPECTED_URL, status_code=503)
+
+        resp = self.client.get(API_URL)
+
+        self.assertEqual(503, resp.status_code)
+        self.assertEqual(4, m.call_count)
+        self.assertEqual(1, self.client.retry_stats()['exhausted'])
+
+    def test_post_not_retried_without_idempotency_key(self):
+        m = self.requests_mock.post(EXPECTED_URL, status_code=503)
+
+        self.client.post(API_URL, EXPECTED_BODY)
+
+        self.assertEqual(1, m.call_count)
+
+    def test_post_retried_with_idempotency_key(self):
+        m = self.requests_mock.post(
+            EXPECTED_URL, [{'status_code': 503}, {'json': {}}]
+        )
+
+        resp = self.client.post(
+            API_URL, EXPECTED_BODY, headers={'Idempotency-Key': 'abc'}
+        )
+
+        self.assertEqual(200, resp.status_code)
+        self.assertEqual(2, m.call_count)
+
+    def test_retry_after_respected(self):
+        self.requests_mock.get(
+            EXPECTED_URL,
+            [{'status_code': 503, 'headers': {'Retry-After': '7'}},
+             {'json': {}}]
+        )
+
+        self.client.get(API_URL)
+
+        self.sleep.assert_called_once_with(7.0)
+
+    def test_retry_budget(self):
+        self.client.retry_budget = httpclient.RetryBudget(
+            ratio=0, min_retries=1
+        )
+        m = self.requests_mock.get(EXPECTED_URL, status_code=503)
+
+        self.client.get(API_URL)
+
+        self.assertEqual(2, m.call_count)
+        self.assertEqual(1, self.client.retry_stats()['budget_exhausted'])
+
+    def test_backoff_is_exponential_and_capped(self):
+        policy = httpclient.RetryPolicy(
+            backoff_factor=1, max_backoff=5, jitter=False
+        )
+
+        self.assertEqual(
+            [1, 2, 4, 5], [policy.get_backoff(i) for i in range(4)]
+        )
+
+
+class WireLoggingTest(base.BaseClientTest):
+
+    def setUp(self):
+        super(WireLoggingTest, self).setUp()
+        self.client = httpclient.HTTPClient(
+            API_BASE_URL, wire_log_max_body=10
+        )
+        self.logger = mock.Mock()
+        self.client.wire_logger.logger = self.logger
+
+    def test_disabled_logging_skips_work(self):
+        self.logger.isEnabledFor.return_value = False
+        self.requests_mock.get(EXPECTED_URL, text='text')
+
+        with mock.patch.object(self.client.wire_logger, 'log') as log:
+            self.client.get(API_URL)
+
+        self.assertFalse(log.called)
+        self.assertFalse(self.logger.log.called)
+
+    def test_body_truncated(self):
+        self.logger.isEnabledFor.return_value = True
+        self.requests_mock.get(EXPECTED_URL, text='x' * 100)
+
+        self.client.get(API_URL)
+
+        calls = self.logger.log.call_args_list
+        self.assertEqual(2, len(calls))
+        info = calls[0][1]['extra']['http']
+        self.assertEqual(200, info['status'])
+        self.assertEqual(100, info['size'])
+        self.assertEqual(
+            'x' * 10 + '... (100 bytes total)', calls[1][0][2]
+        )
+
+    @mock.patch('random.random', mock.MagicMock(return_value=0.5))
+    def test_sampling(self):
+        self.logger.isEnabledFor.return_value = True
+        self.client.wire_logger.sample_rate = 0.1
+        self.requests_mock.get(EXPECTED_URL, text='text')
+
+        self.client.get(API_URL)
+
+        self.assertFalse(self.logger.log.called)
+
+
+class CompressionTest(base.BaseClientTest):
+
+    def test_accept_encoding(self):
+        client = httpclient.HTTPClient(API_BASE_URL)
+        m = self.requests_mock.get(EXPECTED_URL, text='text')
+
+        client.get(API_URL)
+
+        self.assertIn('gzip', m.last_request.headers['Accept-Encoding'])
+
+    def test_large_body_compressed(self):
+        client = httpclient.HTTPClient(API_BASE_URL, compress_threshold=100)
+        m = self.requests_mock.put(EXPECTED_URL, json={})
+        body = '{"config": "%s"}' % ('a' * 1000)
+
+        client.put(API_URL, body)
+
+        self.assertEqual('gzip', m.last_request.headers['Content-Encoding'])
+        self.assertEqual(
+            body.encode('utf-8'),
+            gzip.GzipFile(fileobj=io.BytesIO(m.last_request.body)).read()
+        )
+        stats = client.transfer_stats()
+        self.assertEqual(len(body), stats['request_bytes'])
+        self.assertEqual(len(m.last_request.body),
+                         stats['request_wire_bytes'])
+
+    def test_small_body_not_compressed(self):
+        client = httpclient.HTTPClient(API_BASE_URL, compress_threshold=100)
+        m = self.requests_mock.put(EXPECTED_URL, json={})
+
+        client.put(API_URL, '{}')
+
+        self.assertNotIn('Content-Encoding', m.last_request.headers)
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+import json
+
+import mock
+from oslotest import base as oslo_base
+
+from klabclient.api import app_tasks
+from klabclient.api import base as api_base
+from klabclient.api import jsonstream
+from klabclient.tests.unit import base
+
+
+ITEMS = [
+    {'name': u'zadača', 'n': 12345, 'tags': ['a', ']', ',']},
+    123456,
+    -1.5e10,
+    'string with "quotes"',
+    {'path': 'C:\\dir\\', 'nested': [[{'x': '{[\\"'}], {}]},
+    [],
+    None,
+    True,
+]
+
+
+def _chunks(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class IterArrayTest(oslo_base.BaseTestCase):
+
+    def test_any_chunk_boundaries(self):
+        data = json.dumps(ITEMS, indent=1, ensure_ascii=False).encode('utf-8')
+
+        for size in range(1, 20):
+            self.assertEqual(
+                ITEMS, list(jsonstream.iter_array(_chunks(data, size)))
+            )
+
+    def test_numbers_split_at_any_offset(self):
+        numbers = [1.5, -2.25e-7, 1e+21, 12345, -0.5, 0, True, None]
+        data = json.dumps(numbers).encode('utf-8')
+        data = data.replace(b'e-07', b'E-7').replace(b'e+21', b'e21')
+
+        for n in range(1, len(data)):
+            self.assertEqual(
+                numbers,
+                list(jsonstream.iter_array([data[:n], data[n:]])),
+                data[:n]
+            )
+
+    def test_large_item_parsed_once(self):
+        item = {'data': ['x' * 100 + '"\\' for _ in range(1000)]}
+        data = json.dumps([item, 1]).encode('utf-8')
+        decoder = mock.Mock(wraps=jsonstream._decoder)
+
+        with mock.patch.object(jsonstream, '_decoder', decoder):
+            items = list(jsonstream.iter_array(_chunks(data, 1024)))
+
+        self.assertEqual([item, 1], items)
+        # One attempt in the first chunk, one parse once complete.
+        self.assertEqual(3, decoder.raw_decode.call_count)
+
+    def test_empty(self):
+        self.assertEqual([], list(jsonstream.iter_array([b' [ ] '])))
+
+    def test_items_before_end_of_input(self):
+        def chunks():
+            yield b'[{"a": 1}, {"b"'
+            raise AssertionError('Read ahead of the first item')
+
+        items = jsonstream.iter_array(chunks())
+
+        self.assertEqual({'a': 1}, next(items))
+
+    def test_invalid(self):
+        for data in (b'{}', b'[1 2]', b'[1,', b'[{"a": 1}', b'[1,]',
+                     b'[{"a": x}]', b'["a\\', b'[1.2.3]', b'[}]'):
+            self.assertRaises(
+                ValueError, list, jsonstream.iter_array([data])
+            )
+
+
+class IterListTest(base.BaseClientTest):
+
+    def test_iter_list(self):
+        url = '/workspace/ws/application/app/tasks'
+        self.requests_mock.get(
+            self.TEST_URL + url,
+            json=[{'name': 't%d' % i, 'build': str(i)} for i in range(3)]
+        )
+
+        tasks = list(self._client.app_tasks.iter_list('ws', 'app'))
+
+        self.assertEqual(3, len(tasks))
+        self.assertIsInstance(tasks[0], app_tasks.AppTask)
+        self.assertEqual('t2', tasks[2].name)
+        self.assertEqual('ws', tasks[2].workspace)
+
+    def test_iter_list_error(self):
+        self.requests_mock.get(
+            self.TEST_URL + '/workspace/ws/application',
+            status_code=404,
+            json={'Error': 'Not found'}
+        )
+
+        e = self.assertRaises(
+            api_base.APIException, list, self._client.apps.iter_list('ws')
+        )
+        self.assertEqual(404, e.error_code)
@@ -0,0 +1,91 @@
+import threading
+
+from oslotest import base as oslo_base
+
+from klabclient.api import charts
+from klabclient.api import deadline
+from klabclient.api import pagination
+from klabclient.tests.unit import base
+
+
+class _Pages(object):
+    def __init__(self, total):
+        self.total = total
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, page, limit):
+        with self.lock:
+            self.calls.append(page)
+        start = (page - 1) * limit
+        return list(range(start, min(start + limit, self.total)))
+
+
+class IterPagesTest(oslo_base.BaseTestCase):
+
+    def test_all_items_in_order(self):
+        for prefetch in (0, 1, 3):
+            fetch = _Pages(23)
+
+            items = list(pagination.iter_pages(fetch, 5, prefetch))
+
+            self.assertEqual(list(range(23)), items)
+            self.assertEqual([1, 2, 3, 4, 5], sorted(fetch.calls)[:5])
+            # No more than `prefetch` pages past the last one.
+            self.assertLessEqual(len(fetch.calls), 5 + prefetch)
+
+    def test_next_page_fetched_while_consuming(self):
+        fetch = _Pages(100)
+        items = pagination.iter_pages(fetch, 10, prefetch=2)
+
+        next(items)
+
+        self.assertEqual([1, 2, 3], sorted(fetch.calls))
+
+    def test_exact_multiple_of_limit(self):
+        fetch = _Pages(10)
+
+        self.assertEqual(
+            list(range(10)), list(pagination.iter_pages(fetch, 5, 0))
+        )
+        self.assertEqual([1, 2, 3], fetch.calls)
+
+    def test_page_parameter_ignored(self):
+        items = pagination.iter_pages(lambda page, limit: [1, 2], 2, 1)
+
+        self.assertEqual([1, 2], list(items))
+
+    def test_error_raised_to_consumer(self):
+        def fetch(page, limit):
+            if page == 2:
+                raise ValueError('page 2')
+            return [page] * limit
+
+        items = pagination.iter_pages(fetch, 2, prefetch=1)
+
+        self.assertEqual([1, 1], [next(items), next(items)])
+        self.assertRaises(ValueError, next, items)
+
+    def test_deadline_applies_to_prefetch(self):
+        with deadline.Deadline(10) as d:
+            result = pagination.Prefetch(deadline.current).result()
+
+        self.assertIs(d, result)
+
+
+class IterCatalogTest(base.BaseClientTest):
+
+    def test_iter_catalog(self):
+        url = self.TEST_URL + '/catalog/chart-app'
+        self.requests_mock.get(url + '?limit=2&page=1',
+                               json=[{'Name': 'a'}, {'Name': 'b'}],
+                               complete_qs=True)
+        self.requests_mock.get(url + '?limit=2&page=2',
+                               json=[{'Name': 'c'}], complete_qs=True)
+        self.requests_mock.get(url + '?limit=2&page=3',
+                               json=[], complete_qs=True)
+
+        result = list(self._client.charts.iter_catalog(limit=2))
+
+        self.assertEqual(['a', 'b', 'c'], [c.Name for c in result])
+        self.assertIsInstance(result[0], charts.CatalogChart)
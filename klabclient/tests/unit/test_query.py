@@ -0,0 +1,110 @@
+from oslotest import base as oslo_base
+
+from klabclient.api import apps
+from klabclient.api import query
+from klabclient.tests.unit import base
+
+
+def _apps(n):
+    return [
+        apps.App(None, {'Name': 'app-%d' % i, 'ClusterName': 'c%d' % (i % 2),
+                        'Labels': ['x']})
+        for i in range(n)
+    ]
+
+
+class QueryTest(oslo_base.BaseTestCase):
+
+    def setUp(self):
+        super(QueryTest, self).setUp()
+        self.query = query.Query(_apps(20))
+
+    def test_equality(self):
+        self.assertEqual('app-3', self.query.get(Name='app-3').Name)
+        self.assertIsNone(self.query.get(Name='missing'))
+        self.assertEqual(10, len(self.query.filter(ClusterName='c1')))
+        self.assertEqual(
+            ['app-5'],
+            [a.Name for a in self.query.filter(ClusterName='c1',
+                                               Name='app-5')]
+        )
+        self.assertEqual([], self.query.filter(ClusterName='c0',
+                                               Name='app-5'))
+
+    def test_index_reused(self):
+        self.query.get(Name='app-1')
+        index = self.query._indexes['Name']
+
+        self.query.get(Name='app-2')
+
+        self.assertIs(index, self.query._indexes['Name'])
+
+    def test_unhashable_and_missing_attributes(self):
+        self.assertEqual(20, len(self.query.filter(Labels=['x'])))
+        self.assertEqual([], self.query.filter(Missing='x'))
+        self.assertEqual([], self.query.filter(Name=['unhashable']))
+
+    def test_prefix(self):
+        self.assertEqual(
+            ['app-1', 'app-10', 'app-11'],
+            [a.Name for a in self.query.prefix('Name', 'app-1')][:3]
+        )
+        self.assertEqual(11, len(self.query.prefix('Name', 'app-1')))
+        self.assertEqual([], self.query.prefix('Name', 'z'))
+
+
+class ManagerQueryTest(base.BaseClientTest):
+
+    def setUp(self):
+        super(ManagerQueryTest, self).setUp()
+        self.list_mock = self.requests_mock.get(
+            self.TEST_URL + '/workspace/ws/application',
+            json=[{'Name': 'a', 'WorkspaceName': 'ws'},
+                  {'Name': 'b', 'WorkspaceName': 'ws'}]
+        )
+
+    def test_find_not_cached_by_default(self):
+        client_apps = self._client.apps
+
+        self.assertEqual('a', client_apps.find('ws', Name='a')[0].Name)
+        self.assertEqual('b', client_apps.find('ws', Name='b')[0].Name)
+
+        self.assertEqual(2, self.list_mock.call_count)
+        self.assertEqual({}, client_apps._queries)
+
+    def test_find_scoped_and_cached(self):
+        client_apps = self._client.apps
+        client_apps.query_ttl = 60
+
+        self.assertEqual('a', client_apps.find('ws', Name='a')[0].Name)
+        self.assertEqual('b', client_apps.find('ws', Name='b')[0].Name)
+        self.assertEqual([], client_apps.find('ws', Name='c'))
+
+        self.assertEqual(1, self.list_mock.call_count)
+
+        client_apps.query('ws', refresh=True)
+        self.assertEqual(2, self.list_mock.call_count)
+
+    def test_mutation_invalidates(self):
+        self.requests_mock.put(
+            self.TEST_URL + '/workspace/ws/application/a',
+            json={'Name': 'a', 'WorkspaceName': 'ws'}
+        )
+        client_apps = self._client.apps
+        client_apps.query_ttl = 60
+
+        client_apps.find('ws', Name='a')
+        client_apps.update('ws', 'a', {'Name': 'a'})
+        client_apps.find('ws', Name='a')
+
+        self.assertEqual(2, self.list_mock.call_count)
+
+    def test_ttl(self):
+        client_apps = self._client.apps
+        client_apps.query_ttl = 60
+
+        client_apps.find('ws', Name='a')
+        client_apps._queries[('ws',)].created_at -= 61
+        client_apps.find('ws', Name='a')
+
+        self.assertEqual(2, self.list_mock.call_count)
@@ -0,0 +1,62 @@
+import mock
+from oslotest import base
+
+from klabclient.api import httpclient
+from klabclient.api import ratelimit
+
+
+class TokenBucketTest(base.BaseTestCase):
+
+    @mock.patch('time.time', mock.MagicMock(return_value=100.0))
+    def test_reserve_queues_over_burst(self):
+        bucket = ratelimit.TokenBucket(rate=2, burst=2)
+
+        delays = [bucket.reserve() for _ in range(4)]
+
+        self.assertEqual([0.0, 0.0, 0.5, 1.0], delays)
+
+    def test_refill(self):
+        with mock.patch('time.time', return_value=100.0):
+            bucket = ratelimit.TokenBucket(rate=1, burst=1)
+            self.assertEqual(0.0, bucket.reserve())
+
+        with mock.patch('time.time', return_value=101.0):
+            self.assertEqual(0.0, bucket.reserve())
+
+    def test_invalid_rate(self):
+        self.assertRaises(ValueError, ratelimit.TokenBucket, 0)
+
+
+class RateLimiterTest(base.BaseTestCase):
+
+    @mock.patch('time.sleep')
+    @mock.patch('time.time', mock.MagicMock(return_value=100.0))
+    def test_families(self, sleep):
+        limiter = ratelimit.RateLimiter(
+            families=[('/catalog/*', 1), ('/workspace/*/application/*', 10)]
+        )
+
+        limiter.acquire('/catalog/chart-app?limit=10')
+        limiter.acquire('/workspace/ws/application/app')
+        self.assertFalse(sleep.called)
+
+        limiter.acquire('/catalog/chart-app')
+        sleep.assert_called_once_with(1.0)
+
+        stats = limiter.stats()
+        self.assertEqual(3, stats['requests'])
+        self.assertEqual(1, stats['throttled'])
+
+    def test_http_client_limiter(self):
+        client = httpclient.HTTPClient(
+            'http://localhost', rate_limit=5, rate_limits={'/catalog/*': 1}
+        )
+
+        self.assertEqual(5, client.rate_limiter.bucket.rate)
+        self.assertEqual(1, len(client.rate_limiter.families))
+
+    def test_http_client_no_limiter(self):
+        client = httpclient.HTTPClient('http://localhost')
+
+        self.assertIsNone(client.rate_limiter)
+        self.assertIsNone(client.rate_limit_stats())
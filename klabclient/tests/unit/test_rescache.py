@@ -0,0 +1,177 @@
+import mock
+from oslotest import base as oslo_base
+import requests
+
+from klabclient.api import base as api_base
+from klabclient.api import client
+from klabclient.api import rescache
+from klabclient.api import transport
+from klabclient.tests.unit import base
+
+
+def _response(url, body=b'{}'):
+    request = requests.Request('GET', url).prepare()
+    return transport.make_response(request, 200, body)
+
+
+class ResourceCacheTest(oslo_base.BaseTestCase):
+
+    def test_hit_and_miss(self):
+        cache = rescache.ResourceCache()
+
+        self.assertIsNone(cache.get('/a'))
+        cache.put('/a', _response('http://h/a', b'{"k": 1}'))
+
+        resp = cache.get('/a')
+
+        self.assertEqual({'k': 1}, resp.json())
+        self.assertTrue(resp.from_cache)
+        stats = cache.stats()
+        self.assertEqual(1, stats['hits'])
+        self.assertEqual(1, stats['misses'])
+        self.assertEqual(0.5, stats['hit_ratio'])
+
+    def test_lru_eviction(self):
+        cache = rescache.ResourceCache(max_entries=2)
+        for url in ('/a', '/b'):
+            cache.put(url, _response('http://h' + url))
+
+        cache.get('/a')
+        cache.put('/c', _response('http://h/c'))
+
+        self.assertIsNone(cache.get('/b'))
+        self.assertIsNotNone(cache.get('/a'))
+        self.assertEqual(1, cache.stats()['evictions'])
+        self.assertEqual(2, cache.stats()['entries'])
+
+    @mock.patch('time.time')
+    def test_ttl(self, time_mock):
+        time_mock.return_value = 100
+        cache = rescache.ResourceCache(ttl=5)
+        cache.put('/a', _response('http://h/a'))
+
+        time_mock.return_value = 104
+        self.assertIsNotNone(cache.get('/a'))
+
+        time_mock.return_value = 106
+        self.assertIsNone(cache.get('/a'))
+        self.assertEqual(0, cache.stats()['entries'])
+
+    def test_invalidate_overlapping(self):
+        cache = rescache.ResourceCache()
+        urls = [
+            '/workspace/ws/application',
+            '/workspace/ws/application/a',
+            '/workspace/ws/application/a/tasks?all=true',
+            '/workspace/ws/application/b',
+            '/workspace/ws/storage',
+        ]
+        for url in urls:
+            cache.put(url, _response('http://h' + url))
+
+        cache.invalidate('/workspace/ws/application/a')
+
+        self.assertEqual(
+            ['/workspace/ws/application/b', '/workspace/ws/storage'],
+            [u for u in urls if cache.get(u) is not None]
+        )
+        self.assertEqual(3, cache.stats()['invalidations'])
+
+    def test_invalidate_action(self):
+        cache = rescache.ResourceCache()
+        urls = [
+            '/workspace/ws/application/a/tasks',
+            '/workspace/ws/application/a/status',
+            '/workspace/ws/application/b/status',
+        ]
+        for url in urls:
+            cache.put(url, _response('http://h' + url))
+
+        cache.invalidate('/workspace/ws/application/a/build/task')
+
+        self.assertEqual(
+            ['/workspace/ws/application/b/status'],
+            [u for u in urls if cache.get(u) is not None]
+        )
+
+    def test_put_after_overlapping_invalidation(self):
+        cache = rescache.ResourceCache()
+        generation = cache.generation()
+
+        cache.invalidate('/workspace/ws/application/a')
+        for url in ('/workspace/ws/application', '/workspace/ws/storage'):
+            cache.put(url, _response('http://h' + url), generation)
+
+        self.assertIsNone(cache.get('/workspace/ws/application'))
+        self.assertIsNotNone(cache.get('/workspace/ws/storage'))
+
+
+class ManagerResourceCacheTest(base.BaseClientTest):
+
+    def setUp(self):
+        super(ManagerResourceCacheTest, self).setUp()
+        self.client = client.Client(
+            kuberlab_url=self.TEST_URL, resource_cache=True
+        )
+        self.app_url = self.TEST_URL + '/workspace/ws/application/a'
+        self.get_mock = self.requests_mock.get(
+            self.app_url, json={'Name': 'a'}
+        )
+        self.list_mock = self.requests_mock.get(
+            self.TEST_URL + '/workspace/ws/application', json=[{'Name': 'a'}]
+        )
+
+    def test_repeated_gets_served_from_cache(self):
+        for _ in range(3):
+            self.assertEqual('a', self.client.apps.get('ws', 'a').Name)
+            self.assertEqual(1, len(self.client.apps.list('ws')))
+
+        self.assertEqual(1, self.get_mock.call_count)
+        self.assertEqual(1, self.list_mock.call_count)
+        self.assertEqual(
+            4, self.client.http_client.resource_cache_stats()['hits']
+        )
+
+    def test_update_evicts_app_and_list(self):
+        self.requests_mock.put(self.app_url, json={'Name': 'a'})
+        self.client.apps.get('ws', 'a')
+        self.client.apps.list('ws')
+
+        self.client.apps.update('ws', 'a', {'Name': 'a'})
+        self.client.apps.get('ws', 'a')
+        self.client.apps.list('ws')
+
+        self.assertEqual(2, self.get_mock.call_count)
+        self.assertEqual(2, self.list_mock.call_count)
+
+    def test_get_racing_write_not_cached(self):
+        self.requests_mock.put(self.app_url, json={'Name': 'a'})
+
+        def racing_write(request, context):
+            # The app is updated while its GET is in flight.
+            self.client.apps.update('ws', 'a', {'Name': 'a'})
+            return {'Name': 'a'}
+
+        self.get_mock = self.requests_mock.get(
+            self.app_url, [{'json': racing_write}, {'json': {'Name': 'a'}}]
+        )
+
+        self.client.apps.get('ws', 'a')
+        self.client.apps.get('ws', 'a')
+
+        self.assertEqual(2, self.get_mock.call_count)
+
+    def test_errors_not_cached(self):
+        self.requests_mock.get(self.app_url, status_code=404)
+
+        for _ in range(2):
+            self.assertRaises(
+                api_base.APIException, self.client.apps.get, 'ws', 'a'
+            )
+
+        self.assertEqual(2, self.client.http_client.resource_cache_stats()[
+            'misses'
+        ])
+
+    def test_disabled_by_default(self):
+        self.assertIsNone(self._client.http_client.resource_cache_stats())
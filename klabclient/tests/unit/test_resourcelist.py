@@ -0,0 +1,155 @@
+import unittest
+
+import mock
+from oslotest import base as oslo_base
+
+from klabclient.api import app_tasks
+from klabclient.api import resourcelist
+from klabclient.tests.unit import base
+
+
+def _records(n):
+    return [
+        {'name': 'task-%d' % (i % 3), 'build': str(i), 'Stars': i % 4,
+         'status': 'Failed' if i % 5 == 0 else 'Succeeded'}
+        for i in range(n)
+    ]
+
+
+class _Manager(object):
+    resource_class = app_tasks.AppTask
+
+
+class ResourceListTest(oslo_base.BaseTestCase):
+
+    def setUp(self):
+        super(ResourceListTest, self).setUp()
+        self.list = resourcelist.ResourceList(
+            _Manager(), _records(10), row_attrs={'workspace': 'ws'}
+        )
+
+    def test_columns(self):
+        self.assertEqual(10, len(self.list))
+        self.assertEqual([str(i) for i in range(10)],
+                         list(self.list.column('build')))
+        self.assertEqual([None] * 10, list(self.list.column('missing')))
+        self.assertEqual(['name', 'build'],
+                         list(self.list.columns('name', 'build')))
+        self.assertEqual(('task-1', '1'),
+                         self.list.tuples('name', 'build')[1])
+
+    def test_rows_on_demand(self):
+        created = []
+
+        class Task(app_tasks.AppTask):
+            __slots__ = ()
+
+            def __init__(self, manager, data):
+                created.append(data)
+                super(Task, self).__init__(manager, data)
+
+        self.list.resource_class = Task
+        failed = self.list.filter(status='Failed').sort('build')
+        self.assertEqual([], created)
+
+        task = failed[1]
+        self.assertEqual(1, len(created))
+        self.assertEqual(('5', 'ws'), (task.build, task.workspace))
+        self.assertEqual(['0', '5'], [t.build for t in failed.rows()])
+
+    def test_filter(self):
+        self.assertEqual(
+            ['3', '6', '9'],
+            list(self.list.filter(name='task-0', status='Succeeded')
+                 .column('build'))
+        )
+        mask = [int(b) > 7 for b in self.list.column('build')]
+        self.assertEqual(['8', '9'],
+                         list(self.list.filter(mask).column('build')))
+        self.assertEqual(0, len(self.list.filter(name='missing')))
+        self.assertRaises(ValueError, self.list.filter, [True])
+
+    def test_sort(self):
+        by_stars = self.list.sort('Stars', 'name')
+        self.assertEqual([0, 0, 0, 1, 1, 1, 2, 2, 3, 3],
+                         list(by_stars.column('Stars')))
+        self.assertEqual(['0', '4', '8'],
+                         list(by_stars.column('build'))[:3])
+        self.assertEqual(
+            ['3', '7'],
+            list(self.list.sort('Stars', reverse=True).column('build'))[:2]
+        )
+
+    def test_group_by(self):
+        groups = self.list.group_by('name')
+
+        self.assertEqual(['task-0', 'task-1', 'task-2'], list(groups))
+        self.assertEqual(['0', '3', '6', '9'],
+                         list(groups['task-0'].column('build')))
+        self.assertEqual('ws', groups['task-2'][0].workspace)
+
+    def test_slice(self):
+        self.list.column('Stars')
+
+        part = self.list[2:4]
+
+        self.assertEqual(['2', '3'], list(part.column('build')))
+        self.assertEqual([2, 3], list(part.column('Stars')))
+
+    @unittest.skipIf(resourcelist.numpy is None, 'numpy is not installed')
+    def test_numpy_columns(self):
+        numpy = resourcelist.numpy
+        stars = self.list.column('Stars')
+
+        self.assertIsInstance(stars, numpy.ndarray)
+        self.assertIsInstance(self.list.column('build'), list)
+        self.assertEqual(
+            ['2', '3', '6', '7'],
+            list(self.list.filter(stars >= 2).sort('build').column('build'))
+        )
+        self.assertEqual(0, len(self.list.filter(Stars='x')))
+
+    def test_no_numpy(self):
+        with mock.patch.object(resourcelist, 'numpy', None):
+            lst = resourcelist.ResourceList(_Manager(), _records(4))
+
+            self.assertEqual([0, 1, 2, 3], lst.column('Stars'))
+            self.assertEqual(['0', '1'],
+                             lst.filter([True, True, False, False])
+                             .column('build'))
+
+
+class ManagerResourceListTest(base.BaseClientTest):
+
+    def test_task_list(self):
+        self.requests_mock.get(
+            self.TEST_URL + '/workspace/ws/application/app/tasks',
+            json=_records(6)
+        )
+
+        tasks = self._client.app_tasks.list('ws', 'app', columnar=True)
+
+        self.assertIsInstance(tasks, resourcelist.ResourceList)
+        self.assertEqual(['task-0', 'task-1', 'task-2'],
+                         list(tasks.group_by('name')))
+        self.assertEqual('ws', tasks[0].workspace)
+
+        tasks = self._client.app_tasks.list('ws', 'app')
+        self.assertEqual(['ws'] * 6, [t.workspace for t in tasks])
+
+    def test_catalog_columns(self):
+        url = self.TEST_URL + '/catalog/chart-app'
+        self.requests_mock.get(
+            url + '?limit=2&page=1',
+            json=[{'Name': 'a', 'Stars': 1}, {'Name': 'b', 'Stars': 5}]
+        )
+        self.requests_mock.get(
+            url + '?limit=2&page=2', json=[{'Name': 'c', 'Stars': 3}]
+        )
+
+        charts = self._client.charts.catalog_columns(limit=2, prefetch=0)
+
+        self.assertEqual(['b', 'c', 'a'],
+                         list(charts.sort('Stars', reverse=True)
+                              .column('Name')))
+        self.assertEqual('c', charts[2].Name)
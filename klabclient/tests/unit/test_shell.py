@@ -1,6 +1,14 @@
 
+import os
+import shutil
+import tempfile
+
 import mock
+import requests
+from requests_mock.contrib import fixture as rm_fixture
 
+from klabclient.api import client
+from klabclient.api import diskcache
 import klabclient.tests.unit.base_shell_test as base
 
 
@@ -27,3 +35,42 @@ class TestShell(base.BaseShellTests):
 
         self.assertEqual('http://localhost:8082/api/v0.2',
                          params[1]['kuberlab_url'])
+
+    @mock.patch('klabclient.api.client.Client')
+    @mock.patch('klabclient.api.client.create_session')
+    def test_disk_cache(self, session_mock, client_mock):
+        self.shell('--config wrong --refresh workspace-list')
+
+        cache = client_mock.call_args[1]['resource_cache']
+        self.assertIsInstance(cache, diskcache.DiskCache)
+        self.assertTrue(cache.refresh)
+
+    @mock.patch('klabclient.api.client.Client')
+    @mock.patch('klabclient.api.client.create_session')
+    def test_no_cache(self, session_mock, client_mock):
+        self.shell('--config wrong --no-cache workspace-list')
+
+        self.assertIsNone(client_mock.call_args[1]['resource_cache'])
+
+    @mock.patch('klabclient.api.client.create_session')
+    def test_real_client_with_disk_cache(self, session_mock):
+        # Shared options holding locks must reach the real Client as is.
+        session_mock.return_value = requests.Session()
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        path_patch = mock.patch.object(
+            diskcache, 'DEFAULT_PATH', os.path.join(tmp, 'cache.sqlite')
+        )
+        path_patch.start()
+        self.addCleanup(path_patch.stop)
+        api = self.useFixture(rm_fixture.Fixture())
+        api.get(
+            client._DEFAULT_KUBERLAB_URL + '/workspace',
+            json=[{'Name': 'ws-name', 'DisplayName': 'WS', 'Type': 'org',
+                   'Picture': '', 'Can': []}]
+        )
+
+        stdout, stderr = self.shell('--config wrong workspace-list')
+
+        self.assertIn('ws-name', stdout)
+        self.assertNotIn('pickle', stderr)
@@ -0,0 +1,214 @@
+import threading
+import time
+
+from oslotest import base
+
+from klabclient.api import deadline
+from klabclient.api import httpclient
+from klabclient.api import singleflight
+from klabclient.api import transport
+from klabclient import exceptions
+from klabclient.tests.unit import base as test_base
+
+
+class SingleFlightTest(base.BaseTestCase):
+
+    def test_error_shared(self):
+        flight = singleflight.SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        errors = []
+
+        def fail():
+            started.set()
+            release.wait()
+            raise ValueError('boom')
+
+        def follower():
+            started.wait()
+            try:
+                flight.do('key', fail)
+            except ValueError as e:
+                errors.append(e)
+
+        t = threading.Thread(target=follower)
+        t.start()
+
+        def leader():
+            try:
+                flight.do('key', fail)
+            except ValueError as e:
+                errors.append(e)
+
+        leader_thread = threading.Thread(target=leader)
+        leader_thread.start()
+        started.wait()
+        while flight.stats()['collapsed'] < 1:
+            pass
+        release.set()
+        t.join()
+        leader_thread.join()
+
+        self.assertEqual(2, len(errors))
+        # The follower's own copy, caused by the leader's exception.
+        follower_error, leader_error = sorted(
+            errors, key=lambda e: e.__cause__ is None
+        )
+        self.assertIsNot(leader_error, follower_error)
+        self.assertEqual(('boom',), follower_error.args)
+        self.assertIs(leader_error, follower_error.__cause__)
+
+    def test_follower_deadline(self):
+        flight = singleflight.SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        results = []
+
+        def slow():
+            started.set()
+            release.wait(5)
+            return 'result'
+
+        leader = threading.Thread(
+            target=lambda: results.append(flight.do('key', slow))
+        )
+        leader.start()
+        started.wait()
+
+        with deadline.Deadline(0.01):
+            self.assertRaises(
+                exceptions.DeadlineExceeded, flight.do, 'key', slow
+            )
+
+        release.set()
+        leader.join()
+
+        self.assertEqual([('result', False)], results)
+
+    def test_leader_deadline_not_shared(self):
+        flight = singleflight.SingleFlight()
+        started = threading.Event()
+        errors = []
+
+        def slow():
+            started.set()
+            while flight.stats()['collapsed'] < 1:
+                pass
+            time.sleep(deadline.remaining())
+            deadline.current().check()
+
+        def leader():
+            with deadline.Deadline(0.05):
+                try:
+                    flight.do('key', slow)
+                except exceptions.DeadlineExceeded as e:
+                    errors.append(e)
+
+        t = threading.Thread(target=leader)
+        t.start()
+        started.wait()
+
+        # The follower has no deadline and calls again.
+        result = flight.do('key', lambda: 'result')
+        t.join()
+
+        self.assertEqual(('result', False), result)
+        self.assertEqual(1, len(errors))
+
+    def test_copy_error(self):
+        class Uncopyable(Exception):
+            def __init__(self, code, message):
+                super(Uncopyable, self).__init__(message)
+
+        error = Uncopyable(1, 'message')
+        self.assertIs(error, singleflight.copy_error(error))
+
+        error = ValueError('boom')
+        self.assertIsNot(error, singleflight.copy_error(error))
+
+
+class CoalescedGetTest(test_base.BaseClientTest):
+
+    def test_identical_gets_collapsed(self):
+        client = httpclient.HTTPClient(self.TEST_URL)
+        release = threading.Event()
+        threads_count = 5
+
+        def callback(request, context):
+            release.wait(5)
+            return {'Name': 'app', 'Tasks': []}
+
+        m = self.requests_mock.get(self.TEST_URL + '/workspace/ws',
+                                   json=callback)
+        results = []
+
+        def worker():
+            results.append(client.get('/workspace/ws'))
+
+        threads = [threading.Thread(target=worker)
+                   for _ in range(threads_count)]
+        for t in threads:
+            t.start()
+        while client.coalesce_stats()['collapsed'] < threads_count - 1:
+            pass
+        release.set()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(1, m.call_count)
+        self.assertEqual(threads_count - 1,
+                         client.coalesce_stats()['collapsed'])
+        self.assertEqual(threads_count, len(set(id(r) for r in results)))
+
+        parsed = [r.json() for r in results]
+        parsed[0]['Tasks'].append('x')
+        self.assertEqual([], parsed[1]['Tasks'])
+
+    def test_disabled(self):
+        client = httpclient.HTTPClient(
+            self.TEST_URL, coalesce_requests=False
+        )
+        m = self.requests_mock.get(self.TEST_URL + '/workspace', json=[])
+
+        client.get('/workspace')
+
+        self.assertTrue(m.called)
+        self.assertIsNone(client.single_flight)
+
+    def test_get_after_write_not_joined(self):
+        started = threading.Event()
+        release = threading.Event()
+        state = {'Name': 'old'}
+
+        def handler(request):
+            if request.method == 'PUT':
+                state['Name'] = 'new'
+                return {}
+
+            data = dict(state)
+            if data['Name'] == 'old':
+                started.set()
+                release.wait(5)
+            return data
+
+        # requests_mock serializes requests, this one runs them in parallel.
+        client = httpclient.HTTPClient(
+            self.TEST_URL, transport=transport.InProcessTransport(handler)
+        )
+        results = []
+
+        t = threading.Thread(
+            target=lambda: results.append(client.get('/workspace/ws'))
+        )
+        t.start()
+        started.wait()
+
+        client.put('/workspace/ws', '{}')
+        # Issued after the write, mustn't share the earlier GET.
+        resp = client.get('/workspace/ws')
+        release.set()
+        t.join()
+
+        self.assertEqual('new', resp.json()['Name'])
+        self.assertEqual('old', results[0].json()['Name'])
+        self.assertEqual(0, client.coalesce_stats()['collapsed'])
@@ -0,0 +1,63 @@
+from oslotest import base
+
+from klabclient.api import apps
+from klabclient.api import base as api_base
+from klabclient.api import client
+from klabclient.api import transport
+
+
+TEST_URL = 'http://inprocess/api/v0.2'
+
+
+class InProcessTransportTest(base.BaseTestCase):
+
+    def setUp(self):
+        super(InProcessTransportTest, self).setUp()
+        self.requests = []
+        self.client = client.Client(
+            kuberlab_url=TEST_URL,
+            transport=transport.InProcessTransport(self.handler)
+        )
+
+    def handler(self, request):
+        self.requests.append(request)
+        path = request.path_url[len('/api/v0.2'):]
+
+        if path == '/workspace/ws/application':
+            return [{'Name': 'app', 'WorkspaceName': 'ws'}]
+        if path == '/workspace/ws/application/missing':
+            return 404, {'Error': 'not found'}
+        if request.method == 'PUT':
+            return 200, request.body
+
+        return 200, 'text', {'Content-Type': 'text/plain'}
+
+    def test_list(self):
+        result = self.client.apps.list('ws')
+
+        self.assertIsInstance(
+            self.client.http_client.crud_provider,
+            transport.InProcessTransport
+        )
+        self.assertIsInstance(result[0], apps.App)
+        self.assertEqual('app', result[0].Name)
+        self.assertEqual('GET', self.requests[0].method)
+
+    def test_error(self):
+        e = self.assertRaises(
+            api_base.APIException, self.client.apps.get, 'ws', 'missing'
+        )
+
+        self.assertEqual(404, e.error_code)
+        self.assertEqual('not found', e.error_message)
+
+    def test_put_body(self):
+        app = self.client.apps.update('ws', 'app', {'Name': 'app'})
+
+        self.assertEqual('app', app.Name)
+        self.assertEqual(
+            'application/json', self.requests[0].headers['content-type']
+        )
+
+    def test_text(self):
+        self.assertEqual('text', self.client.apps.get_yaml('ws', 'chart'))
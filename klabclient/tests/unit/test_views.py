@@ -0,0 +1,99 @@
+import copy
+
+from oslotest import base as oslo_base
+
+from klabclient.api import base
+from klabclient.api import views
+
+
+def _data():
+    return {
+        'Name': 'app',
+        'Configuration': {
+            'spec': {'tasks': [{'name': 'a'}, {'name': 'b'}]},
+            'labels': {'k': 'v'},
+        },
+    }
+
+
+class ViewsTest(oslo_base.BaseTestCase):
+
+    def test_read_without_copy(self):
+        data = _data()
+        v = views.view(data)
+
+        self.assertEqual('app', v['Name'])
+        self.assertEqual(2, len(v['Configuration']['spec']['tasks']))
+        self.assertEqual('a', v['Configuration']['spec']['tasks'][0]['name'])
+        self.assertEqual(data, v)
+        self.assertIsInstance(v['Configuration'], views.DictView)
+        self.assertIsInstance(v['Configuration']['spec']['tasks'],
+                              views.ListView)
+        self.assertFalse(v.copied)
+        self.assertFalse(v['Configuration'].copied)
+
+    def test_nested_write_copies_path_only(self):
+        data = _data()
+        source = copy.deepcopy(data)
+        v = views.view(data)
+
+        v['Configuration']['spec']['tasks'][1]['name'] = 'c'
+
+        self.assertEqual(source, data)
+        self.assertEqual('c', v['Configuration']['spec']['tasks'][1]['name'])
+        self.assertTrue(v.copied)
+        # Untouched branches are still shared.
+        self.assertFalse(v['Configuration']['labels'].copied)
+        self.assertIs(
+            data['Configuration']['spec']['tasks'][0],
+            v['Configuration']['spec']['tasks'][0]._source
+        )
+
+    def test_list_mutations(self):
+        data = _data()
+        tasks = views.view(data)['Configuration']['spec']['tasks']
+
+        tasks.append({'name': 'c'})
+        del tasks[0]
+
+        self.assertEqual([{'name': 'b'}, {'name': 'c'}], tasks)
+        source_tasks = data['Configuration']['spec']['tasks']
+        self.assertEqual(2, len(source_tasks))
+        self.assertEqual('a', source_tasks[0]['name'])
+
+    def test_detached_child(self):
+        data = _data()
+        v = views.view(data)
+        labels = v['Configuration']['labels']
+
+        v['Configuration']['labels'] = {}
+        labels['k'] = 'x'
+
+        self.assertEqual({}, v['Configuration']['labels'])
+        self.assertEqual({'k': 'x'}, labels)
+        self.assertEqual({'k': 'v'}, data['Configuration']['labels'])
+
+    def test_to_plain(self):
+        data = _data()
+        v = views.view(data)
+        v['Name'] = 'other'
+
+        plain = v.to_plain()
+
+        self.assertIs(dict, type(plain))
+        self.assertEqual('other', plain['Name'])
+        self.assertIsNot(data['Configuration'], plain['Configuration'])
+
+    def test_resource_view(self):
+        class R(base.Resource):
+            __slots__ = ()
+            defaults = {'status': 'new'}
+
+        data = _data()
+        r = R(None, data)
+        v = r.view()
+
+        v['Configuration']['labels']['k'] = 'x'
+
+        self.assertEqual('new', v['status'])
+        self.assertEqual({'k': 'v'}, r.Configuration['labels'])
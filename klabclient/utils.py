@@ -30,6 +30,21 @@ def do_action_on_many(action, resources, success_msg, error_msg):
         raise exceptions.KuberlabClientException(error_msg)
 
 
+# libyaml based loader/dumper are several times faster when available.
+YAML_SAFE_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+YAML_SAFE_DUMPER = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+
+def yaml_load(stream):
+    """yaml.safe_load() using the libyaml loader if available."""
+    return yaml.load(stream, Loader=YAML_SAFE_LOADER)
+
+
+def yaml_dump(data, **kwargs):
+    """yaml.safe_dump() using the libyaml dumper if available."""
+    return yaml.dump(data, Dumper=YAML_SAFE_DUMPER, **kwargs)
+
+
 def load_content(content):
     if content is None or content == '':
         return dict()